@@ -11,6 +11,7 @@ from tapper.controller.sleep_processor import (
     SleepCommandProcessor as _SleepCommandProcessor,
 )
 from tapper.controller.window.window_api import WindowController as _WindowController
+from tapper.feedback import latency as _latency
 from tapper.feedback import logger as _logger
 from tapper.model import tap_tree as _tap_tree
 from tapper.signal.base_listener import SignalListener as _SignalListener
@@ -52,6 +53,11 @@ send = _send_processor.send
 sleep = _sleep_processor.sleep
 """Use this instead of time.sleep to be able to pause and kill running actions."""
 
+sleep_async = _sleep_processor.sleep_async
+"""Awaitable sleep for `async def` actions, use instead of asyncio.sleep. See `sleep`.
+Blocking calls like `send` hold up other coroutine actions,
+`await asyncio.to_thread(tapper.send, ...)` avoids that."""
+
 if _kbc := _datastructs.get_first_in(_KeyboardController, config.controllers):
     """Keyboard controller. Mainly useful for getting the state of keys, send is recommended for typing."""
     kb: _KeyboardController = _kbc
@@ -68,6 +74,25 @@ log = _logger.log
 """This logger will log into both console and logfile, by default."""
 
 
+def reload() -> float:
+    """
+    Applies changes made to root and control_group after start, without restarting.
+    Only changed Taps and Groups are processed again.
+    Listeners and running actions are not interrupted.
+
+    :return: Time it took, in seconds.
+    """
+    return _initializer.reload(root, control_group)
+
+
+def latency_snapshot() -> dict[str, _latency.StageStats]:
+    """p50/p99/max durations of signal processing stages, over recent signals.
+    Empty unless config.latency_recorder is set."""
+    if config.latency_recorder is None:
+        return {}
+    return config.latency_recorder.snapshot()
+
+
 def init() -> None:
     """Initializes all underlying tools."""
     global _listeners
@@ -0,0 +1,87 @@
+import asyncio
+import inspect
+import threading
+from typing import Any
+from typing import Final
+
+from tapper.action.runner import ActionRunner
+from tapper.action.runner import ExecutorStats
+from tapper.model import types_
+
+STOP_TIMEOUT = 1.0
+"""Longest stop waits for cancelled coroutine actions to end."""
+
+
+class AsyncActionRunner(ActionRunner):
+    """Runs coroutine actions as tasks of one asyncio event loop, which has its own thread.
+    Other actions are passed to thread_runner.
+
+    Coroutine actions share one limit, max_tasks, whatever the executor.
+    Anything they do without `await` holds up all of them.
+    """
+
+    thread_runner: Final[ActionRunner]
+    """Runs actions that are not coroutine functions, and all control actions."""
+
+    max_tasks: Final[int]
+    """Coroutine actions over this number running are ignored."""
+
+    loop: Final[asyncio.AbstractEventLoop]
+
+    stats: Final[ExecutorStats]
+    """Of coroutine actions. Only changed in the loop thread."""
+
+    _tasks: set["asyncio.Task[Any]"]
+    """Running tasks. Also keeps references to them, so they are not collected."""
+
+    _thread: Final[threading.Thread]
+
+    def __init__(self, thread_runner: ActionRunner, max_tasks: int) -> None:
+        if max_tasks < 1:
+            raise ValueError("AsyncActionRunner max_tasks must be at least 1.")
+        self.thread_runner = thread_runner
+        self.max_tasks = max_tasks
+        self.stats = ExecutorStats()
+        self._tasks = set()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="tapper-async-actions", daemon=True
+        )
+        self._thread.start()
+
+    def run(
+        self, fn: types_.Action, executor_ordinal: int = 0, source: Any = None
+    ) -> None:
+        if inspect.iscoroutinefunction(fn):
+            self.loop.call_soon_threadsafe(self._start, fn)
+        else:
+            self.thread_runner.run(fn, executor_ordinal, source)
+
+    def run_control(self, fn: types_.Action) -> None:
+        self.thread_runner.run_control(fn)
+
+    def _start(self, fn: types_.Action) -> None:
+        if len(self._tasks) >= self.max_tasks:
+            self.stats.rejected += 1
+            return
+        self.stats.accepted += 1
+        task = self.loop.create_task(fn())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stop(self) -> None:
+        """Cancels running coroutine actions, waits for them to end, and stops the loop."""
+        if not self._thread.is_alive():
+            return
+
+        async def cancel_all() -> None:
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks, timeout=STOP_TIMEOUT)
+            self.loop.stop()
+
+        asyncio.run_coroutine_threadsafe(cancel_all(), self.loop)
+        self._thread.join()
+        self.loop.close()
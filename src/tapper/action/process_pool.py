@@ -0,0 +1,242 @@
+"""
+Process executors run actions in worker processes, for CPU-heavy work like img.find.
+
+Workers are started when the executor is created. They are not forked from
+the main process, which has threads by then: they import the main script again,
+so it must keep tapper.start() under `if __name__ == "__main__":`.
+
+In a worker, tapper.send, tapper.sleep, tapper.kb, tapper.mouse and tapper.window
+are proxies: calling them calls the same in the main process, over a pipe,
+and returns the result. So kill and pause reach actions in workers when they sleep.
+"""
+import multiprocessing
+import pickle
+import threading
+import time
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from multiprocessing.connection import Connection
+from multiprocessing.connection import wait
+from multiprocessing.sharedctypes import Synchronized
+from typing import Any
+from typing import Callable
+
+from tapper.controller import flow_control
+from tapper.feedback.logger import log
+
+PARENT_TARGETS = ("send", "sleep", "kb", "mouse", "window")
+"""Attributes of tapper that workers call in the main process."""
+
+_connection: Connection | None = None
+"""In a worker, its end of the pipe to the main process."""
+_claimed: Synchronized | None = None  # type: ignore
+"""In a worker, number of workers of its pool that are started."""
+
+WARM_UP_TIMEOUT = 60.0
+
+
+class ParentProxy:
+    """Stands for an attribute of tapper in a worker. Calls go to the main process."""
+
+    path: str
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __getattr__(self, name: str) -> "ParentProxy":
+        return ParentProxy(f"{self.path}.{name}")
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return call_parent(self.path, *args, **kwargs)
+
+
+def call_parent(path: str, *args: Any, **kwargs: Any) -> Any:
+    """Calls a function in the main process, from a worker.
+
+    :param path: attribute of tapper, like "send" or "mouse.move".
+    :return: What the function returned. If it raised, so will this.
+    """
+    if _connection is None:
+        raise RuntimeError("call_parent is only available in process executor workers.")
+    _connection.send((path, args, kwargs, flow_control.action_config()))
+    ok, result = _connection.recv()
+    if not ok:
+        raise result
+    return result
+
+
+def resolve_tapper(path: str) -> Callable[..., Any]:
+    """Finds what a worker calls, in the main process."""
+    import tapper
+
+    root, *names = path.split(".")
+    if root not in PARENT_TARGETS or any(name.startswith("_") for name in names):
+        raise ValueError(f"Workers can't call tapper.{path}.")
+    target = getattr(tapper, root)
+    for name in names:
+        target = getattr(target, name)
+    return target  # type: ignore
+
+
+class ParentCallServer:
+    """Serves calls of workers in the main process. Each call is handled in its own thread,
+    so a long call of one worker, like send, doesn't hold up others."""
+
+    resolve: Callable[[str], Callable[..., Any]]
+    connections: list[Connection]
+    """Main process ends of the pipes."""
+
+    _thread: threading.Thread
+    _handlers: ThreadPoolExecutor
+    """A worker makes one call at a time, so one thread per worker is enough."""
+
+    def __init__(
+        self,
+        connections: list[Connection],
+        resolve: Callable[[str], Callable[..., Any]],
+    ) -> None:
+        self.connections = connections
+        self.resolve = resolve
+        self._handlers = ThreadPoolExecutor(
+            max_workers=max(1, len(connections)),
+            thread_name_prefix="tapper-process-call",
+        )
+        self._thread = threading.Thread(
+            target=self.serve, name="tapper-process-calls", daemon=True
+        )
+        self._thread.start()
+
+    def serve(self) -> None:
+        while self.connections:
+            for connection in wait(self.connections):
+                assert isinstance(connection, Connection)
+                try:
+                    request = connection.recv()
+                except (EOFError, OSError):  # worker is gone
+                    self.connections.remove(connection)
+                    continue
+                self._handlers.submit(self.respond, connection, request)
+        self._handlers.shutdown(wait=False)
+
+    def respond(self, connection: Connection, request: Any) -> None:
+        self.reply(connection, self.handle(*request))
+
+    def handle(
+        self, path: str, args: Any, kwargs: Any, action_config: Any
+    ) -> tuple[bool, Any]:
+        flow_control.config_thread_local_storage.action_config = action_config
+        try:
+            return True, self.resolve(path)(*args, **kwargs)
+        except Exception as e:
+            return False, e
+
+    @staticmethod
+    def reply(connection: Connection, result: tuple[bool, Any]) -> None:
+        try:
+            connection.send(result)
+        except Exception as e:  # result or exception can't be pickled
+            log.warning(f"Can't return {result[1]!r} to a worker: {e!r}")
+            connection.send((False, RuntimeError(repr(result[1]))))
+
+
+def init_worker(connections: list[Connection], claimed: Synchronized) -> None:  # type: ignore
+    """Runs first in each worker: takes a pipe, and puts proxies in place of tapper's controllers."""
+    global _connection, _claimed
+    with claimed.get_lock():
+        _connection = connections[claimed.value]
+        claimed.value += 1
+    _claimed = claimed
+
+    import tapper
+
+    for name in PARENT_TARGETS:
+        if hasattr(tapper, name):
+            setattr(tapper, name, ParentProxy(name))
+
+
+def warm_up(workers: int) -> None:
+    """Submitted to each worker at start, so they are ready before the first action.
+    Waits for all workers to start: while no worker is idle, each submit starts a new one."""
+    deadline = time.perf_counter() + WARM_UP_TIMEOUT
+    while _claimed is not None and _claimed.value < workers:
+        if time.perf_counter() > deadline:
+            return
+        time.sleep(0.01)
+
+
+def start_pool(
+    workers: int, resolve: Callable[[str], Callable[..., Any]] = resolve_tapper
+) -> tuple[ProcessPoolExecutor, ParentCallServer]:
+    """Starts worker processes, and the server for their calls to the main process."""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+    pipes = [context.Pipe() for _ in range(workers)]
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=init_worker,
+        initargs=([child for _, child in pipes], context.Value("i", 0)),
+    )
+    for _ in range(workers):
+        pool.submit(warm_up, workers)
+    # each submit started a worker, which has its copy of the pipes now
+    for _, child in pipes:
+        child.close()
+    return pool, ParentCallServer([parent for parent, _ in pipes], resolve)
+
+
+class ProcessExecutor(Executor):
+    """Pool of worker processes, and the server for their calls to the main process.
+    If a worker dies, the pool is broken: it is replaced by a new one on the next submit."""
+
+    workers: int
+    resolve: Callable[[str], Callable[..., Any]]
+    pool: ProcessPoolExecutor
+    server: ParentCallServer
+
+    def __init__(
+        self,
+        workers: int,
+        resolve: Callable[[str], Callable[..., Any]] = resolve_tapper,
+    ) -> None:
+        self.workers = workers
+        self.resolve = resolve
+        self.pool, self.server = start_pool(workers, resolve)
+
+    def submit(
+        self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Future[Any]:
+        try:
+            return self.pool.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            log.warning("A worker process died, starting new workers.")
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool, self.server = start_pool(self.workers, self.resolve)
+            return self.pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self.pool.shutdown(wait, cancel_futures=cancel_futures)
+
+
+def to_picklable(action: Any) -> Any:
+    """Action that can be sent to a worker.
+    A send command is sent by the main process.
+
+    :raises ValueError: if the action can't be pickled.
+    """
+    if isinstance(action, str):
+        return partial(call_parent, "send", action)
+    try:
+        pickle.dumps(action)
+    except Exception as e:
+        raise ValueError(
+            f"Action {action!r} runs in a process executor, so it must be picklable: "
+            f"a module-level function, or partial of one. {e!r}"
+        ) from e
+    return action
@@ -1,10 +1,19 @@
+import asyncio
+import inspect
+import threading
 from abc import ABC
 from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Executor
 from concurrent.futures import Future
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from functools import partial
 from typing import Any
 from typing import Final
 
+from tapper.feedback.logger import log
 from tapper.model import types_
 
 
@@ -12,12 +21,14 @@ class ActionRunner(ABC):
     """Runs the actions that were triggered.
 
     Has a number of executors, each has a number of threads.
-    Action queueing is not allowed: if all of executor's threads are currently executing actions,
-        request to run another action in that executor will be ignored.
+    By default, action queueing is not allowed: if all of executor's threads are currently executing actions,
+        request to run another action in that executor will be ignored. See QueuePolicy for alternatives.
     """
 
     @abstractmethod
-    def run(self, fn: types_.Action, executor_ordinal: int = 0) -> None:
+    def run(
+        self, fn: types_.Action, executor_ordinal: int = 0, source: Any = None
+    ) -> None:
         """Runs an action.
 
         :param fn: action to run.
@@ -25,6 +36,8 @@ class ActionRunner(ABC):
             The result is ignored.
         :param executor_ordinal: Which executor to run in. If not specified, will run in
             the first one (index 0).
+        :param source: What triggered the action, like a Tap. Actions from the same source
+            are coalesced by QueuePolicy.LATEST.
         """
 
     @abstractmethod
@@ -35,46 +48,195 @@ class ActionRunner(ABC):
         """
 
 
-def prune_done_runnables(runnables: list[Future[Any]]) -> list[Future[Any]]:
-    return [r for r in runnables if not r.done()]
+class QueuePolicy(str, Enum):
+    """What an executor does with an action, when all its threads are busy."""
+
+    DROP = "drop"
+    """Ignore the new action."""
+    FIFO = "fifo"
+    """Queue it, up to max_queue. When the queue is full, ignore the new action."""
+    LATEST = "latest"
+    """Queue it, replacing the pending action of the same source, if any.
+    When the queue is full, ignore actions of new sources."""
+    DROP_OLDEST = "drop_oldest"
+    """Queue it, up to max_queue. When the queue is full, discard the oldest pending action."""
+
+
+class ExecutorKind(str, Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+    """Worker processes, for CPU-heavy actions like img.find. threads is the number of workers.
+    Actions must be picklable: module-level functions, or partial of them.
+    This is checked when Taps are transformed. Send commands are sent by the main process.
+    See tapper.action.process_pool."""
+
+
+@dataclass
+class ExecutorConfig:
+    """Can be used in config.action_runner_executors_threads instead of a number of threads."""
+
+    threads: int = 1
+    policy: QueuePolicy = QueuePolicy.DROP
+    max_queue: int = 16
+    """Pending actions limit. Not used by DROP."""
+    kind: ExecutorKind = ExecutorKind.THREAD
+
+
+@dataclass
+class ExecutorStats:
+    accepted: int = 0
+    """Actions started or queued."""
+    rejected: int = 0
+    """New actions ignored."""
+    evicted: int = 0
+    """Queued actions discarded in favour of a newer one."""
+    queue_depth: int = 0
+    """Actions waiting now."""
+    max_queue_depth: int = 0
+
+
+def in_own_loop(fn: types_.Action) -> types_.Action:
+    """Coroutine functions are run in a new event loop, in the thread that calls the result."""
+    if inspect.iscoroutinefunction(fn):
+        return partial(asyncio.run, fn())
+    return fn
+
+
+def make_executor(config: ExecutorConfig) -> Executor:
+    if config.kind == ExecutorKind.PROCESS:
+        from tapper.action import process_pool
+
+        return process_pool.ProcessExecutor(config.threads)
+    return ThreadPoolExecutor(max_workers=config.threads)
 
 
 class ActionRunnerImpl(ActionRunner):
-    executors: Final[list[ThreadPoolExecutor]]
+    executors: Final[list[Executor]]
     """Regular tasks are executed in these."""
 
     ex_threads: Final[list[int]]
     """Number of threads per executor. Defines how much concurrency there is."""
 
+    ex_configs: Final[list[ExecutorConfig]]
+
+    stats: Final[list[ExecutorStats]]
+    """Per executor."""
+
     control_executor: Final[ThreadPoolExecutor]
     """Executes control group actions."""
 
-    _runnables: list[list[Future[Any]]]
-    """Currently running or done tasks, per executor."""
+    _in_flight: list[int]
+    """Submitted actions that are not done yet, per executor. Decremented by done callbacks."""
+
+    _pending: list[OrderedDict[Any, types_.Action]]
+    """Queued actions per executor. Keyed by id of source for LATEST, by a unique object otherwise."""
+
+    _lock: threading.RLock
+    """Guards in-flight counters, pending and stats. Reentrant, as a done callback may run inside submit."""
 
     _control_runnable: Future[Any]
     """Currently running or done task for control executor."""
 
-    def __init__(self, executors_threads: list[int]) -> None:
+    def __init__(self, executors_threads: list[int | ExecutorConfig]) -> None:
         """
         :param executors_threads: see ActionRunner doc for general explanation.
-            If this is None, 1 executor with 1 thread is generated.
+            Each element is a number of threads, or ExecutorConfig.
         """
-        self.ex_threads = executors_threads
-        self.executors = [
-            ThreadPoolExecutor(max_workers=threads) for threads in executors_threads
+        self.ex_configs = [
+            c if isinstance(c, ExecutorConfig) else ExecutorConfig(c)
+            for c in executors_threads
         ]
-        self._runnables = [[] for _ in executors_threads]
+        self.ex_threads = [c.threads for c in self.ex_configs]
+        self.executors = [make_executor(c) for c in self.ex_configs]
+        self.stats = [ExecutorStats() for _ in self.ex_configs]
+        self._in_flight = [0 for _ in self.ex_configs]
+        self._pending = [OrderedDict() for _ in self.ex_configs]
+        self._lock = threading.RLock()
 
         self.control_executor = ThreadPoolExecutor(max_workers=1)
 
-    def run(self, fn: types_.Action, executor_ordinal: int = 0) -> None:
+    def run(
+        self, fn: types_.Action, executor_ordinal: int = 0, source: Any = None
+    ) -> None:
         exc = executor_ordinal
-        self._runnables[exc] = prune_done_runnables(self._runnables[exc])
-        if len(self._runnables[exc]) < self.ex_threads[exc]:
-            runnable = self.executors[exc].submit(fn)
-            self._runnables[exc].append(runnable)
+        stats = self.stats[exc]
+        if (
+            self._in_flight[exc] >= self.ex_threads[exc]
+            and self.ex_configs[exc].policy == QueuePolicy.DROP
+        ):
+            # Busy executor without a queue, the common case for a held key. No lock here:
+            # a counter that's stale by a finishing action rejects the same as a moment earlier.
+            stats.rejected += 1
+            return
+        with self._lock:
+            if not self._pending[exc] and self._in_flight[exc] < self.ex_threads[exc]:
+                stats.accepted += 1
+                self._submit(fn, exc)
+                return
+            self._enqueue(fn, exc, source)
+            stats.max_queue_depth = max(stats.max_queue_depth, len(self._pending[exc]))
+            self._start_pending(exc)
+
+    def _enqueue(self, fn: types_.Action, exc: int, source: Any) -> None:
+        config = self.ex_configs[exc]
+        pending = self._pending[exc]
+        stats = self.stats[exc]
+        if config.policy == QueuePolicy.DROP:
+            stats.rejected += 1
+        elif config.policy == QueuePolicy.LATEST:
+            key = id(source) if source is not None else object()
+            if key in pending:
+                pending[key] = fn
+                stats.evicted += 1
+                stats.accepted += 1
+            elif len(pending) < config.max_queue:
+                pending[key] = fn
+                stats.accepted += 1
+            else:
+                stats.rejected += 1
+        elif len(pending) < config.max_queue:
+            pending[object()] = fn
+            stats.accepted += 1
+        elif config.policy == QueuePolicy.DROP_OLDEST:
+            pending.popitem(last=False)
+            pending[object()] = fn
+            stats.evicted += 1
+            stats.accepted += 1
+        else:
+            stats.rejected += 1
+
+    def _submit(self, fn: types_.Action, exc: int) -> None:
+        """Expects lock."""
+        try:
+            runnable = self.executors[exc].submit(in_own_loop(fn))
+        except RuntimeError as e:  # shut down, or a worker process died
+            log.warning(f"Action could not run in executor {exc}: {e!r}")
+            return
+        self._in_flight[exc] += 1
+        runnable.add_done_callback(partial(self._on_done, exc))
+
+    def _on_done(self, exc: int, runnable: Future[Any]) -> None:
+        if (
+            self.ex_configs[exc].kind == ExecutorKind.PROCESS
+            and not runnable.cancelled()
+            and runnable.exception()
+        ):
+            # actions log their own exceptions, these are failures to get it to a worker
+            log.warning(
+                f"Action could not run in executor {exc}: {runnable.exception()!r}"
+            )
+        with self._lock:
+            self._in_flight[exc] -= 1
+            self._start_pending(exc)
+
+    def _start_pending(self, exc: int) -> None:
+        """Starts queued actions, if there are free threads. Expects lock."""
+        pending = self._pending[exc]
+        while pending and self._in_flight[exc] < self.ex_threads[exc]:
+            _, fn = pending.popitem(last=False)
+            self._submit(fn, exc)
+        self.stats[exc].queue_depth = len(pending)
 
     def run_control(self, fn: types_.Action) -> None:
         if not hasattr(self, "_control_runnable") or self._control_runnable.done():
-            self._control_runnable = self.control_executor.submit(fn)
+            self._control_runnable = self.control_executor.submit(in_own_loop(fn))
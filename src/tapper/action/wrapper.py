@@ -1,9 +1,12 @@
+import inspect
 import logging
 from dataclasses import dataclass
 from uuid import UUID
 
 from tapper.controller import flow_control
+from tapper.controller.flow_control import config_context
 from tapper.controller.flow_control import config_thread_local_storage
+from tapper.feedback.logger import log
 from tapper.feedback.logger import LogExceptions
 from tapper.model import types_
 from tapper.model.tap_tree_shadow import STap
@@ -26,15 +29,37 @@ class ActionConfig:
         )
 
 
+@dataclass
+class WrappedAction:
+    """Action that sets config before running.
+    Can be pickled if its action can, to run in a process executor."""
+
+    action: types_.Action
+    config: ActionConfig
+
+    def __call__(self) -> None:
+        config_thread_local_storage.action_config = self.config
+        LogExceptions(log_level=logging.WARNING)(self.action)()
+
+
 def wrapped_action(tap: STap) -> types_.Action:
     """
     :param tap: source.
     :return: Action that sets config before running.
+        If tap's action is a coroutine function, so is this.
     """
     config = ActionConfig.from_tap(tap)
+    if inspect.iscoroutinefunction(tap.action):
+        return wrapped_coroutine(tap.action, config)
+    return WrappedAction(tap.action, config)
+
 
-    def wrapped() -> None:
-        config_thread_local_storage.action_config = config
-        LogExceptions(log_level=logging.WARNING)(tap.action)()
+def wrapped_coroutine(action: types_.Action, config: ActionConfig) -> types_.Action:
+    async def wrapped() -> None:
+        config_context.set(config)
+        try:
+            await action()
+        except Exception as e:
+            log.warning(f"Exception while performing action: {repr(e)}", exc_info=True)
 
     return wrapped
@@ -1,7 +1,14 @@
+import atexit
+import time
+from functools import partial
+
 from tapper import config
 from tapper import parser
+from tapper.action.async_runner import AsyncActionRunner
 from tapper.action.runner import ActionRunner
 from tapper.action.runner import ActionRunnerImpl
+from tapper.action.runner import ExecutorConfig
+from tapper.action.runner import ExecutorKind
 from tapper.boot import tray_icon
 from tapper.boot.tree_transformer import TreeTransformer
 from tapper.controller import flow_control
@@ -10,6 +17,7 @@ from tapper.controller.mouse.mouse_api import MouseController
 from tapper.controller.send_processor import SendCommandProcessor
 from tapper.controller.sleep_processor import SleepCommandProcessor
 from tapper.controller.window.window_api import WindowController
+from tapper.feedback import latency
 from tapper.feedback import logger
 from tapper.feedback.logger import log
 from tapper.helper import controls
@@ -26,21 +34,40 @@ from tapper.parser.send_parser import SendParser
 from tapper.parser.trigger_parser import TriggerParser
 from tapper.signal.base_listener import SignalListener
 from tapper.signal.signal_processor import SignalProcessor
+from tapper.signal.trace import TraceWriter
 from tapper.signal.wrapper import ListenerWrapper
 from tapper.state import keeper
 from tapper.util import datastructs
+from tapper.util.clock import Clock
 
 
 def default_trigger_parser(os: str | None = None) -> TriggerParser:
     return TriggerParser([keyboard.get_keys(os), mouse.get_keys()])
 
 
+def process_executors(executors_threads: list[int | ExecutorConfig]) -> set[int]:
+    return {
+        i
+        for i, c in enumerate(executors_threads)
+        if isinstance(c, ExecutorConfig) and c.kind == ExecutorKind.PROCESS
+    }
+
+
 def default_action_runner() -> ActionRunner:
-    return ActionRunnerImpl(config.action_runner_executors_threads)
+    runner = ActionRunnerImpl(config.action_runner_executors_threads)
+    if config.action_runner_async_tasks is not None:
+        async_runner = AsyncActionRunner(runner, config.action_runner_async_tasks)
+        atexit.register(async_runner.stop)
+        return async_runner
+    return runner
 
 
 # crutch, use DI instead.
 keeper_pressed = None
+running_transformer: TreeTransformer | None = None
+running_processor: SignalProcessor | None = None
+clock: Clock = Clock()
+"""config.clock, from init. For helpers."""
 
 
 def default_keeper_pressed(os: str | None = None) -> keeper.Pressed:
@@ -98,11 +125,15 @@ def init(
         )
     log.info("Initializing tapper")
 
-    global keeper_pressed
+    global keeper_pressed, running_transformer, running_processor, clock
     os = config.os
+    clock = config.clock
 
     transformer = TreeTransformer(
-        send_processor.send, default_trigger_parser(os), config.kw_trigger_conditions
+        send_processor.send,
+        default_trigger_parser(os),
+        config.kw_trigger_conditions,
+        process_executors(config.action_runner_executors_threads),
     )
     verify_settings_exist(iroot)
     root = transformer.transform(iroot)
@@ -113,12 +144,30 @@ def init(
     runner = default_action_runner()
     emul_keeper = keeper.Emul()
     state_keeper = default_keeper_pressed()
+    state_keeper.get_time_fn = clock.now
     keeper_pressed = state_keeper
 
     signal_processor = SignalProcessor(root, control, state_keeper, runner)
+    signal_processor.condition_ordering = config.condition_ordering
+    signal_processor.get_time_fn = clock.now
+    signal_processor.compile()
+    running_transformer, running_processor = transformer, signal_processor
+    if recorder := config.latency_recorder:
+        recorder.instrument_method(runner, "run", latency.RUN)
+        recorder.instrument_method(signal_processor, "match_index", latency.MATCH)
+        recorder.instrument_method(signal_processor, "on_signal", latency.ON_SIGNAL)
+        recorder.instrument_method(signal_processor, "on_repeat", latency.REPEAT)
     listener_wrapper = ListenerWrapper(
-        signal_processor.on_signal, emul_keeper, state_keeper
+        signal_processor.on_signal,
+        emul_keeper,
+        state_keeper,
+        signal_processor.on_repeat,
     )
+    if recorder:
+        recorder.instrument_method(listener_wrapper, "_on_signal_wrap", latency.HOOK)
+    if config.signal_trace_path:
+        listener_wrapper.trace = TraceWriter(config.signal_trace_path)
+        atexit.register(listener_wrapper.trace.close)
     if os == constants.OS.linux:
         listener_wrapper.emul_keeper = None
     listeners = [
@@ -133,25 +182,65 @@ def init(
         mc._os = os
         mc._emul_keeper = emul_keeper
         mc._state_keeper = state_keeper
+        mc._clock = clock
     if wc := datastructs.get_first_in(WindowController, controllers):
         wc._os = os
         wc._only_visible_windows = config.only_visible_windows
+        wc._foreground_cache_interval = config.foreground_window_cache
     [c._init() for c in controllers]
 
     sleep_processor.check_interval = config.sleep_check_interval
     sleep_processor.kill_check_fn = flow_control.should_be_killed
     sleep_processor.pause_check_fn = flow_control.should_be_paused
+    sleep_processor.actual_sleep_fn = clock.sleep
+    sleep_processor.get_time_fn = clock.now
+    sleep_processor.wait_change_fn = partial(
+        flow_control.wait_change_blocking, clock=clock
+    )
+    sleep_processor.wait_change_async_fn = partial(
+        flow_control.wait_change, clock=clock
+    )
+    sleep_processor.precision = config.sleep_precision
 
     send_processor.os = os
     send_processor.parser = default_send_parser(os)
     send_processor.kb_controller = kbc  # type: ignore
     send_processor.mouse_controller = mc  # type: ignore
     send_processor.sleep_fn = sleep_processor.sleep
+    send_processor.sleep_until_fn = sleep_processor.sleep_until
+    send_processor.get_time_fn = sleep_processor.get_time_fn
+    send_processor.compile()
 
     log.info("Tapper init complete")
     return listeners
 
 
+def reload(iroot: Group, icontrol: Group) -> float:
+    """Transform again the parts of the trees that changed since init or last reload,
+    and swap them into the running SignalProcessor.
+    Listeners, controllers and executors keep running.
+
+    :return: Time it took, in seconds.
+    """
+    if running_transformer is None or running_processor is None:
+        raise RuntimeError("Tapper is not initialized, nothing to reload.")
+    start = time.perf_counter()
+    transformer = running_transformer
+    transformer.new_generation()
+    verify_settings_exist(iroot)
+    root = transformer.transform(iroot)
+    set_default_controls_if_empty(icontrol)
+    control_config_fill(icontrol)
+    control = transformer.transform(icontrol)
+    running_processor.swap(root, control)
+    elapsed = time.perf_counter() - start
+    log.info(
+        f"Reloaded in {elapsed * 1000:.1f}ms: "
+        f"{transformer.transformed} transformed, {transformer.reused} reused"
+    )
+    return elapsed
+
+
 def set_default_controls_if_empty(icontrol: Group) -> None:
     """Sets default controls if none."""
     if not icontrol._children:
@@ -190,5 +279,11 @@ def start(listeners: list[SignalListener]) -> None:
         controller._start()
     for listener in listeners:
         listener.start()
+    if config.latency_recorder:
+        config.latency_recorder.start()
+        atexit.register(config.latency_recorder.stop)
+    if config.condition_ordering:
+        config.condition_ordering.start()
+        atexit.register(config.condition_ordering.stop)
     if config.tray_icon and config.os != "darwin":  # No tray for MacOS
         tray_icon.create()
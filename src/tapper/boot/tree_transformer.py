@@ -2,35 +2,102 @@
 Transform Tree - user-configured hierarchical API structure,
 into Shadow Tree - identically structured tree with useful for runtime fields.
 """
+from dataclasses import dataclass
 from functools import partial
 from typing import Any
+from typing import Collection
 
 from tapper import config
+from tapper.action import process_pool
 from tapper.model import keyboard
 from tapper.model import mouse
 from tapper.model.tap_tree import Group
 from tapper.model.tap_tree import Tap
 from tapper.model.tap_tree_shadow import SGroup
 from tapper.model.tap_tree_shadow import STap
+from tapper.model.tap_tree_shadow import STapGeneric
 from tapper.model.types_ import Action
 from tapper.model.types_ import KwTriggerConditions
 from tapper.model.types_ import SendFn
 from tapper.model.types_ import TriggerConditionFn
 from tapper.model.types_ import TriggerStr
+from tapper.parser import common
 from tapper.parser.trigger_parser import TriggerParser
 
 all_symbols = [*keyboard.get_keys(config.os).keys(), *mouse.get_keys().keys()]
 
 
-def find_property(prop_name: str, group: Group) -> Any:
+_REQUIRED = object()
+
+
+def find_property(prop_name: str, group: Group | None, default: Any = _REQUIRED) -> Any:
+    """:param default: returned if no group up to root has the property.
+    If not supplied, root must have it."""
+    if group is None and default is not _REQUIRED:
+        return default
     if (result := getattr(group, prop_name)) is not None:
         return result
-    return find_property(prop_name, group._parent)  # type: ignore
+    return find_property(prop_name, group._parent, default)  # type: ignore
+
+
+def to_seconds(prop_name: str, value: float | str) -> float:
+    seconds = common.parse_sleep_time(value) if isinstance(value, str) else value
+    if seconds is None or seconds < 0:
+        raise ValueError(
+            f'{prop_name} {value!r} should be seconds, or str like "200ms".'
+        )
+    return float(seconds)
+
+
+@dataclass(frozen=True)
+class Timing:
+    """Throttle, debounce and autorepeat options, resolved for a Tap."""
+
+    throttle: float
+    debounce: float
+    ignore_autorepeat: bool
+    trigger_on_repeat: bool
+
+    @classmethod
+    def find(cls, tap: Tap | None, parent: Group) -> "Timing":
+        values = []
+        for name in ["throttle", "debounce", "ignore_autorepeat", "trigger_on_repeat"]:
+            if tap is None or (value := getattr(tap, name)) is None:
+                value = find_property(name, parent, None)
+            values.append(value)
+        throttle, debounce, ignore_autorepeat, trigger_on_repeat = values
+        return Timing(
+            to_seconds("throttle", throttle or 0),
+            to_seconds("debounce", debounce or 0),
+            bool(ignore_autorepeat),
+            bool(trigger_on_repeat),
+        )
+
+    def apply(self, stap: STap) -> None:
+        stap.throttle = self.throttle
+        stap.debounce = self.debounce
+        stap.ignore_autorepeat = self.ignore_autorepeat
+        stap.trigger_on_repeat = self.trigger_on_repeat
+
+
+ConditionTable = dict[tuple[str, type, Any], TriggerConditionFn]
+"""(name, type of value, value) to condition. Allows sharing one condition between Taps and Groups."""
+
+
+def condition_key(name: str, value: Any) -> tuple[str, type, Any]:
+    return name, type(value), value
 
 
 def transform_trigger_conditions(
-    possible_conditions: KwTriggerConditions, trigger_conditions: dict[str, Any]
+    possible_conditions: KwTriggerConditions,
+    trigger_conditions: dict[str, Any],
+    table: ConditionTable | None = None,
 ) -> list[TriggerConditionFn]:
+    """
+    :param table: If supplied, conditions with the same name and value
+        will be the same object, so they can be evaluated once per signal.
+        Unhashable values are not shared.
+    """
     result = []
     for name, user_supplied_value in trigger_conditions.items():
         if name not in possible_conditions:
@@ -38,47 +105,141 @@ def transform_trigger_conditions(
                 f"Condition '{name}' not recognised. Add it to config.kw_trigger_conditions"
             )
         fn = possible_conditions[name]
-        result.append(partial(fn, user_supplied_value))
+        condition = partial(fn, user_supplied_value)
+        condition.__name__ = name  # type: ignore
+        if table is not None:
+            key = condition_key(name, user_supplied_value)
+            try:
+                condition = table.setdefault(key, condition)
+            except TypeError:  # unhashable value, not shared
+                pass
+        result.append(condition)
     return result
 
 
+@dataclass(frozen=True)
+class CachedShadow:
+    """Result of transforming one item, and what it was transformed from."""
+
+    original: Any
+    key: tuple[Any, ...]
+    """Everything the shadow depends on, including inherited properties."""
+    shadow: Any
+    """SGroup, STap, or list of STap for a dict."""
+
+
+def same_key(a: tuple[Any, ...], b: tuple[Any, ...]) -> bool:
+    try:
+        return bool(a == b)
+    except (ValueError, TypeError):  # values that don't compare to bool, like arrays
+        return False
+
+
 class TreeTransformer:
     send: SendFn
     trigger_parser: TriggerParser
     possible_trigger_conditions: KwTriggerConditions
+    condition_table: ConditionTable
+    """Shared by all trees this transforms. Holds conditions of the current generation."""
+    process_executors: Collection[int]
+    """Ordinals of process executors. Actions that run in them must be picklable."""
+    cache: dict[int, CachedShadow]
+    """Shadows of the previous generation, by id of the original. See `new_generation`."""
+    reused: int
+    transformed: int
+    """Items reused from cache, and transformed anew, in this generation."""
+    _fresh: dict[int, CachedShadow]
 
     def __init__(
         self,
         send: SendFn,
         trigger_parser: TriggerParser,
         conditions: KwTriggerConditions,
+        process_executors: Collection[int] = (),
     ) -> None:
         self.send = send  # type: ignore
+        self.process_executors = process_executors
         self.trigger_parser = trigger_parser
         self.possible_trigger_conditions = conditions
+        self.condition_table = {}
+        self.cache = {}
+        self._fresh = {}
+        self.reused = 0
+        self.transformed = 0
 
-    def transform(self, group: Group) -> SGroup:
-        result = SGroup()
-        result.original = group
-        result.send_interval = group.send_interval  # type: ignore  # it's not None here
-        result.send_press_duration = group.send_press_duration  # type: ignore  # it's not None here
-        result.trigger_conditions = transform_trigger_conditions(
-            self.possible_trigger_conditions, group.trigger_conditions
-        )
+    def new_generation(self) -> None:
+        """Call before transforming trees again: items that didn't change
+        since the last generation will be reused instead of transformed."""
+        self.cache, self._fresh = self._fresh, {}
+        self.condition_table = {}
+        for cached in self.cache.values():
+            if isinstance(cached.shadow, STapGeneric):
+                self._keep_conditions(cached.shadow.trigger_conditions)
+        self.reused = 0
+        self.transformed = 0
+
+    def _cached(self, original: Any, key: tuple[Any, ...]) -> Any:
+        cached = self.cache.get(id(original))
+        if cached is None or cached.original is not original:
+            return None
+        if not same_key(cached.key, key):
+            return None
+        self.reused += 1
+        self._fresh[id(original)] = cached
+        return cached.shadow
+
+    def _keep_conditions(self, conditions: list[TriggerConditionFn]) -> None:
+        """Puts conditions still in use back into the table, so they stay shared."""
+        for condition in conditions:
+            name, value = condition.__name__, condition.args[0]  # type: ignore
+            try:
+                self.condition_table.setdefault(condition_key(name, value), condition)
+            except TypeError:  # unhashable value, not shared
+                pass
+
+    def _store(self, original: Any, key: tuple[Any, ...], shadow: Any) -> None:
+        self.transformed += 1
+        self._fresh[id(original)] = CachedShadow(original, key, shadow)
 
+    def transform(self, group: Group) -> SGroup:
+        children: list[STapGeneric] = []
         for child in group._children:
             if isinstance(child, Group):
-                result.add(self.transform(child))
+                children.append(self.transform(child))
             elif isinstance(child, Tap):
-                result.add(self._transform_tap(child))
+                children.append(self._transform_tap(child))
             elif isinstance(child, dict):
-                result.add(*self._transform_dict(child, group))
+                children.extend(self._transform_dict(child, group))
             else:
                 raise TypeError(f"{child}")
+
+        key = (
+            group.send_interval,
+            group.send_press_duration,
+            tuple(group.trigger_conditions.items()),
+            tuple(id(child) for child in children),
+        )
+        if (cached := self._cached(group, key)) is not None:
+            return cached  # type: ignore
+        result = SGroup()
+        result.original = group
+        result.send_interval = group.send_interval  # type: ignore  # it's not None here
+        result.send_press_duration = group.send_press_duration  # type: ignore  # it's not None here
+        result.trigger_conditions = transform_trigger_conditions(
+            self.possible_trigger_conditions,
+            group.trigger_conditions,
+            self.condition_table,
+        )
+        # reused children are in the running tree until swap, which sets their parent
+        result.children = children
+        for shadow in children:
+            if shadow.parent is None:
+                shadow.parent = result
+        result.refresh_main_triggers()
+        self._store(group, key, result)
         return result
 
     def _transform_tap(self, tap: Tap) -> STap:
-        trigger = self.trigger_parser.parse(tap.trigger)
         if (executor := tap.executor) is None:
             executor = find_property("executor", tap._parent)
         if (suppress_trigger := tap.suppress_trigger) is None:
@@ -87,38 +248,74 @@ class TreeTransformer:
             send_interval = find_property("send_interval", tap._parent)
         if (send_press_duration := tap.send_press_duration) is None:
             send_press_duration = find_property("send_press_duration", tap._parent)
-        action = self.to_action(tap.action)
+        timing = Timing.find(tap, tap._parent)
+        key = (
+            tap.trigger,
+            tap.action,
+            executor,
+            suppress_trigger,
+            send_interval,
+            send_press_duration,
+            timing,
+            tuple(tap.trigger_conditions.items()),
+        )
+        if (cached := self._cached(tap, key)) is not None:
+            return cached  # type: ignore
+
+        trigger = self.trigger_parser.parse(tap.trigger)
+        action = self.to_action(tap.action, executor)
         result = STap(trigger, action, executor, suppress_trigger)
         result.original = tap
         result.send_interval = send_interval
         result.send_press_duration = send_press_duration
+        timing.apply(result)
         result.trigger_conditions = transform_trigger_conditions(
-            self.possible_trigger_conditions, tap.trigger_conditions
+            self.possible_trigger_conditions,
+            tap.trigger_conditions,
+            self.condition_table,
         )
-
+        self._store(tap, key, result)
         return result
 
     def _transform_dict(
         self, taps: dict[TriggerStr, Action | str], parent: Group
     ) -> list[STap]:
-        result = []
         executor = find_property("executor", parent)
         suppress_trigger = find_property("suppress_trigger", parent)
         send_interval = find_property("send_interval", parent)
         send_press_duration = find_property("send_press_duration", parent)
+        timing = Timing.find(None, parent)
+        key = (
+            tuple(taps.items()),
+            executor,
+            suppress_trigger,
+            send_interval,
+            send_press_duration,
+            timing,
+        )
+        if (cached := self._cached(taps, key)) is not None:
+            return cached  # type: ignore
+
+        result = []
         for trigger_str, action in taps.items():
             trigger = self.trigger_parser.parse(trigger_str)
-            action = self.to_action(action)
+            action = self.to_action(action, executor)
             stap = STap(trigger, action, executor, suppress_trigger)
             stap.send_interval = send_interval
             stap.send_press_duration = send_press_duration
+            timing.apply(stap)
             stap.trigger_conditions = []
             result.append(stap)
+        self._store(taps, key, result)
         return result
 
-    def to_action(self, action: Action | str) -> Action:
+    def to_action(self, action: Action | str, executor: int | None = None) -> Action:
+        """:raises ValueError: if action runs in a process executor, and can't be pickled."""
         if isinstance(action, str):
             if action in all_symbols and action not in keyboard.chars_en:
                 action = f"$({action})"
-            action = partial(self.send, action)
-        return action
+            if executor not in self.process_executors:
+                return partial(self.send, action)
+        if executor in self.process_executors:
+            return process_pool.to_picklable(action)  # type: ignore
+        return action  # type: ignore
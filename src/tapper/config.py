@@ -1,16 +1,19 @@
 import logging
 import sys
-import time
 
 from tapper import trigger_conditions
+from tapper.action.runner import ExecutorConfig
 from tapper.controller.keyboard.kb_api import KeyboardController
 from tapper.controller.mouse.mouse_api import MouseController
 from tapper.controller.window.window_api import WindowController
+from tapper.feedback.latency import LatencyRecorder
 from tapper.model import keyboard
 from tapper.model import mouse
 from tapper.model.types_ import KwTriggerConditions
+from tapper.signal.condition_order import ConditionOrdering
 from tapper.signal.keyboard.keyboard_listener import KeyboardSignalListener
 from tapper.signal.mouse.mouse_listener import MouseSignalListener
+from tapper.util.clock import Clock
 from tapper.util.datastructs import get_first_in
 
 """
@@ -38,19 +41,59 @@ SECTION 2: Advanced usage.
 ------------------------------------
 """
 
-action_runner_executors_threads: list[int] = [1]
+action_runner_executors_threads: list[int | ExecutorConfig] = [1]
 """Number of action executors(length of the list), and threads for each.
 
 Setting value to N will allow N actions to execute simultaneously for a given executor.
+Use ExecutorConfig to also queue actions when all threads are busy, instead of ignoring them:
+    ExecutorConfig(threads=1, policy=QueuePolicy.FIFO, max_queue=16)
+See tapper.action.runner.QueuePolicy for options.
+For CPU-heavy actions, an executor can be a pool of worker processes:
+    ExecutorConfig(threads=2, kind=ExecutorKind.PROCESS)
+and Tap(executor=...) set to its index. See tapper.action.process_pool.
+"""
+
+action_runner_async_tasks: int | None = None
+"""If set, actions that are `async def` functions run on one asyncio event loop,
+at most this many at once. Try 1000. Waiting in them with `await tapper.sleep_async`
+doesn't hold a thread, so any number of them can wait concurrently.
+Actions that aren't coroutines still run in the executors above.
+If None, each coroutine action runs in an executor thread, with its own event loop.
 """
 
 only_visible_windows = True
 """Limit windows to visible - ones that are open on the taskbar.
 Reduces WindowController lag, and junk windows caught into filters."""
 
+foreground_window_cache: float | None = None
+"""If set, the foreground window is fetched in the background every this many seconds,
+and win, win_title, win_exec trigger conditions check the fetched snapshot
+instead of asking the OS for each signal. Try 0.05.
+A snapshot older than twice this is re-fetched when checked."""
+
+sleep_precision = 0.0
+"""tapper.sleep, and sleeps of send, end with spinning this many seconds
+instead of waiting, for timing closer than the OS sleep. Try 0.002.
+Costs CPU while spinning. Sleeps of send are scheduled to deadlines
+either way, so oversleeping doesn't add up over long commands."""
+
 sleep_check_interval = 0.1
-"""How often tapper.sleep checks for pause/kill command from user.
-see tapper.helper.controls"""
+"""Fallback: how often a paused tapper.sleep checks if pause is still on.
+Kill and pause through tapper.helper.controls wake sleeping actions right away."""
+
+condition_ordering: ConditionOrdering | None = None
+"""Set to ConditionOrdering() to measure trigger conditions, and check
+cheap ones that often fail first. Does not change which Tap triggers.
+Keep a reference to inspect what was learned: `.stats`, `.report()`."""
+
+latency_recorder: LatencyRecorder | None = None
+"""Set to LatencyRecorder() to time each stage of signal processing:
+hook callback, on_signal, match, run. Summary is logged every `log_interval` seconds,
+and tapper.latency_snapshot() gives p50/p99/max per stage."""
+
+signal_trace_path: str | None = None
+"""If set, every signal that tapper receives is appended to this file.
+It can be replayed offline, see tapper.signal.trace and tests/benchmark/replay_trace.py."""
 
 
 """Note: all log configs are set on tapper.start()."""
@@ -119,4 +162,6 @@ SECTION 4: Testing.
 
 os = sys.platform
 
-sleep_fn = time.sleep
+clock: Clock = Clock()
+"""Time of tapper: sleep, send, signal times, helpers.
+SimulatedClock() makes sleeps instant, for fast tests of long macros and repeats."""
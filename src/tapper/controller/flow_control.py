@@ -1,10 +1,19 @@
+import asyncio
 import threading
 import uuid
+from contextvars import ContextVar
+from typing import Any
+
+from tapper.util.clock import Clock
 
 
 config_thread_local_storage = threading.local()
 """Used to store config for running actions."""
 
+config_context: ContextVar[Any] = ContextVar("action_config", default=None)
+"""Config of a running coroutine action. Coroutines share the loop thread,
+so they can't use config_thread_local_storage."""
+
 
 class StopTapperActionException(Exception):
     """Normal way to interrupt tapper's action. Will not cause error logs etc."""
@@ -18,16 +27,93 @@ kill_id = uuid.uuid4()
 """When this is changed, all running actions will be killed
 with StopTapperActionException when they call tapper.sleep."""
 
+changes = 0
+"""Incremented by each kill or pause change. Lets waiters notice one they didn't wait for yet."""
+
+_changed = threading.Condition()
+"""Guards `changes` and `_async_waiters`. Threads waiting in wait_change_blocking
+are notified on each change."""
+
+_async_waiters: set[tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = set()
+"""Coroutines waiting in wait_change. Woken from the thread that kills or pauses."""
+
 
 def should_be_paused() -> bool:
     return paused
 
 
 def should_be_killed() -> bool:
-    config = config_thread_local_storage.action_config
+    config = action_config()
     if config is None:
         raise ValueError(
             "No config for action. "
             "Did you initialize tapper and are you running this inside an action?"
         )
     return config.kill_id != kill_id
+
+
+def action_config() -> Any:
+    """ActionConfig of the running action, coroutine or not."""
+    config = config_context.get()
+    if config is None:
+        config = getattr(config_thread_local_storage, "action_config", None)
+    return config
+
+
+def kill() -> None:
+    """Kills running actions, see kill_id."""
+    global kill_id
+    kill_id = uuid.uuid4()
+    _notify()
+
+
+def set_paused(value: bool) -> None:
+    global paused
+    paused = value
+    _notify()
+
+
+async def wait_change(
+    since: int, timeout: float | None = None, clock: Clock = Clock()
+) -> None:
+    """Waits until kill or pause state changes, or for timeout.
+
+    :param since: value of `changes` before the state was checked.
+        Returns at once if there were changes after that.
+    """
+    loop = asyncio.get_running_loop()
+    waiter = (loop, loop.create_future())
+    with _changed:
+        _async_waiters.add(waiter)
+    try:
+        if changes == since:
+            await clock.wait_async(waiter[1], timeout)
+    finally:
+        with _changed:
+            _async_waiters.discard(waiter)
+
+
+def wait_change_blocking(
+    since: int, timeout: float | None = None, clock: Clock = Clock()
+) -> None:
+    """Same as wait_change, for threads."""
+    with _changed:
+        clock.wait_for(_changed, lambda: changes != since, timeout)
+
+
+def _notify() -> None:
+    global changes
+    with _changed:
+        changes += 1
+        waiters = list(_async_waiters)
+        _changed.notify_all()
+    for loop, future in waiters:
+        try:
+            loop.call_soon_threadsafe(_wake, future)
+        except RuntimeError:  # loop closed
+            pass
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
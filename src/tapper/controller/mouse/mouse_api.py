@@ -1,4 +1,3 @@
-import time
 from abc import ABC
 from abc import abstractmethod
 from typing import Callable
@@ -8,6 +7,7 @@ from tapper.controller.resource_controller import ResourceController
 from tapper.model import constants
 from tapper.model import mouse
 from tapper.state import keeper
+from tapper.util.clock import Clock
 
 mouse_buttons_w_aliases = {
     **mouse.button_aliases,
@@ -96,6 +96,8 @@ class MouseController(ResourceController):
     _commander: MouseCommander
     _emul_keeper: keeper.Emul
     _state_keeper: keeper.Pressed
+    _clock: Clock = Clock()
+    """Provided before init."""
     _memorized_pos: tuple[int, int] | None = None
 
     def _init(self) -> None:
@@ -112,7 +114,7 @@ class MouseController(ResourceController):
 
     def pressed(self, symbol: str) -> bool:
         """Is key held down. Not applicable to wheel."""
-        return mouse_buttons_w_aliases[symbol][0] in self._state_keeper.pressed_keys
+        return self._state_keeper.is_pressed(mouse_buttons_w_aliases[symbol][0])
 
     def toggled(self, symbol: str) -> bool:
         """Is key toggled. Not applicable to wheel."""
@@ -183,9 +185,9 @@ class MouseController(ResourceController):
         """Move mouse cursor if coords supplied, then click left mouse button."""
         if x_or_xy is not None or y is not None:
             self.move(x_or_xy, y, relative)
-        time.sleep(0.01)
+        self._clock.sleep(0.01)
         self.press("left_mouse_button")
-        time.sleep(0)
+        self._clock.sleep(0)
         self.release("left_mouse_button")
 
     def right_click(
@@ -197,9 +199,9 @@ class MouseController(ResourceController):
         """Move mouse cursor if coords supplied, then click right mouse button."""
         if x_or_xy is not None or y is not None:
             self.move(x_or_xy, y, relative)
-        time.sleep(0)
+        self._clock.sleep(0)
         self.press("right_mouse_button")
-        time.sleep(0)
+        self._clock.sleep(0)
         self.release("right_mouse_button")
 
 
@@ -1,6 +1,11 @@
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
 from typing import Callable
+from typing import Iterable
 
-from tapper.controller.flow_control import config_thread_local_storage
+from tapper.controller import flow_control
 from tapper.controller.keyboard.kb_api import KeyboardController
 from tapper.controller.mouse.mouse_api import MouseController
 from tapper.model import constants
@@ -10,9 +15,45 @@ from tapper.model.errors import SendError
 from tapper.model.send import CursorMoveInstruction
 from tapper.model.send import KeyInstruction
 from tapper.model.send import SendInstruction
+from tapper.model.send import SendProgram
 from tapper.model.send import SleepInstruction
 from tapper.model.send import WheelInstruction
 from tapper.parser.send_parser import SendParser
+from tapper.util.cache import LruCache
+
+KeyRoute = tuple[
+    KeyboardController | MouseController,
+    Callable[[str], None],
+    Callable[[str], None],
+    Callable[[str], bool],
+]
+"""Controller of a symbol, and its press, release, and toggled."""
+
+KeyHandler = Callable[[str, float, Callable[[float], None]], None]
+"""Sends a key in one direction. Takes symbol, press_duration and sleep."""
+
+SendStep = tuple[KeyHandler | None, SendInstruction]
+"""Instruction, and for a key, what sends it."""
+
+
+@dataclass
+class Schedule:
+    """Sleeps of one send, to deadlines counted from the start.
+    Time spent pressing keys and oversleeping is taken from the next sleep,
+    so it doesn't add up over long commands."""
+
+    deadline: float
+    sleep_until_fn: Callable[[float], None]
+    get_time_fn: Callable[[], float]
+    max_lag: float = 0.05
+    """Falling behind by more than this, like on pause, restarts the schedule from now,
+    instead of catching up by not sleeping."""
+
+    def sleep(self, seconds: float) -> None:
+        if (now := self.get_time_fn()) - self.deadline > self.max_lag:
+            self.deadline = now
+        self.deadline += seconds
+        self.sleep_until_fn(self.deadline)
 
 
 class SendCommandProcessor:
@@ -23,6 +64,21 @@ class SendCommandProcessor:
     kb_controller: KeyboardController
     mouse_controller: MouseController
     sleep_fn: Callable[[float], None]
+    sleep_until_fn: Callable[[float], None] | None = None
+    """If set, sleeps of each send are scheduled to deadlines, see Schedule.
+    Else, sleep_fn is called with each time to sleep."""
+    get_time_fn: Callable[[], float] = time.perf_counter
+    """Clock of sleep_until_fn."""
+
+    _routes: dict[str, KeyRoute]
+    """Symbol to what sends it. Built by compile."""
+    _handlers: dict[tuple[str, constants.KeyDir], KeyHandler]
+    """Key and direction to what sends it. Filled as keys are sent, cleared by compile."""
+    _steps: LruCache[int, tuple[SendProgram, tuple[SendStep, ...]]]
+    """Parsed commands with their handlers, by id of the parsed command.
+    The entry keeps the parsed command, so the id is not reused while it's cached."""
+    _compiled_for: tuple[Any, ...] | None = None
+    """os and controllers that _routes were built for."""
 
     def __init__(
         self,
@@ -37,50 +93,85 @@ class SendCommandProcessor:
         self.kb_controller = kb_controller
         self.mouse_controller = mouse_controller
         self.sleep_fn = sleep_fn
+        self._routes = {}
+        self._handlers = {}
+        self._steps = LruCache(max_entries=1024, weight_fn=lambda entry: len(entry[0]))
 
     @classmethod
     def from_none(cls) -> "SendCommandProcessor":
         """To be filled during init."""
         return SendCommandProcessor(None, None, None, None, None)  # type: ignore
 
+    def compile(self) -> None:
+        """Build the table of which controller sends each key, so sending doesn't search
+        the key lists for every key. Sent commands are compiled against it once.
+        Done on first send, and when os or a controller is replaced.
+        Call again if methods of a controller are replaced."""
+        kbc, mc = self.kb_controller, self.mouse_controller
+        routes: dict[str, KeyRoute] = {}
+        if mc is not None:
+            mouse_route = (mc, mc.press, mc.release, mc.toggled)
+            routes.update(dict.fromkeys(mouse.get_keys(), mouse_route))
+        if kbc is not None:  # keyboard is first, if a symbol is in both
+            kb_route = (kbc, kbc.press, kbc.release, kbc.toggled)
+            routes.update(dict.fromkeys(keyboard.get_keys(self.os), kb_route))
+        self._routes = routes
+        self._handlers = {}
+        self._steps.clear()
+        self._compiled_for = (self.os, kbc, mc)
+
     def send(
         self,
-        command: str,
+        command: str | Iterable[str],
         interval: float | None = None,
         press_duration: float | None = None,
         speed: float = 1,
+        stream: bool = False,
     ) -> None:
         """
         Entry point, processes the command and sends instructions.
 
-        :param command: What to send.
+        :param command: What to send. Or strings to send one after another, as they come,
+            like lines of a file. A combo must not be split between them.
         :param interval: Time before each key/button press.
         :param press_duration: Time between key press and release, only applies on click, not on up/down.
         :param speed: All sleep commands are divided by this number. Does not influence interval or press_duration.
+        :param stream: Parse while sending, instead of before. Sending a long text starts at once,
+            and memory doesn't grow with its length. A mistake in the command raises
+            when parsing reaches it, after what's before it is sent.
+            Always on for strings one after another.
         """
-        config = config_thread_local_storage.action_config
+        config = flow_control.action_config()
         interval = interval if interval is not None else config.send_interval
         press_duration = (
             press_duration if press_duration is not None else config.send_press_duration
         )
 
-        instructions: list[SendInstruction] = self.parser.parse(
-            command, self.shift_down()
-        )
-        for instruction in instructions:
-            if isinstance(instruction, KeyInstruction):
-                if (
-                    instruction.dir in [constants.KeyDir.DOWN, constants.KeyDir.CLICK]
-                    and interval
-                ):
-                    self.sleep_fn(interval)
-                self._send_key_instruction(instruction, press_duration)
+        if self._compiled_for != (self.os, self.kb_controller, self.mouse_controller):
+            self.compile()
+        steps: Iterable[SendStep]
+        if stream or not isinstance(command, str):
+            steps = map(self._step, self.parser.stream(command, self.shift_down()))
+        else:
+            steps = self._compiled_steps(
+                self.parser.compile(command, self.shift_down())
+            )
+        sleep = self.sleep_fn
+        if self.sleep_until_fn is not None:
+            sleep = Schedule(
+                self.get_time_fn(), self.sleep_until_fn, self.get_time_fn
+            ).sleep
+        for handler, instruction in steps:
+            if handler is not None:
+                if interval and instruction.dir in _PRESS_DIRS:  # type: ignore
+                    sleep(interval)
+                handler(instruction.symbol, press_duration, sleep)  # type: ignore
             elif isinstance(instruction, WheelInstruction):
                 self.mouse_controller.press(instruction.wheel_symbol)
             elif isinstance(instruction, CursorMoveInstruction):
                 self.mouse_controller.move(*instruction.xy, instruction.relative)
             elif isinstance(instruction, SleepInstruction):
-                self.sleep_fn(instruction.time / speed)
+                sleep(instruction.time / speed)
             else:
                 raise SendError
 
@@ -91,38 +182,77 @@ class SendCommandProcessor:
                 return shift
         return None
 
-    def _send_key_instruction(self, ki: KeyInstruction, press_duration: float) -> None:
-        symbol = ki.symbol
-        cmd: KeyboardController | MouseController
-        if symbol in keyboard.get_keys(self.os):
-            cmd = self.kb_controller
-        elif symbol in mouse.get_keys():
-            cmd = self.mouse_controller
-        else:
-            raise SendError
-
-        if ki.dir == constants.KeyDir.DOWN:
-            cmd.press(symbol)
-        elif ki.dir == constants.KeyDir.UP:
-            cmd.release(symbol)
-        elif ki.dir == constants.KeyDir.CLICK:
-            self._click(cmd, symbol, press_duration)
-        elif ki.dir == constants.KeyDir.ON:
-            if not cmd.toggled(symbol):
-                self._click(cmd, symbol, press_duration)
-        elif ki.dir == constants.KeyDir.OFF:
-            if cmd.toggled(symbol):
-                self._click(cmd, symbol, press_duration)
-        else:
-            raise SendError
+    def _compiled_steps(self, program: SendProgram) -> tuple[SendStep, ...]:
+        return self._steps.get(
+            id(program), lambda: (program, tuple(map(self._step, program)))
+        )[1]
 
-    def _click(
-        self,
-        cmd: KeyboardController | MouseController,
-        symbol: str,
-        press_duration: float,
-    ) -> None:
-        cmd.press(symbol)
-        if press_duration:
-            self.sleep_fn(press_duration)
-        cmd.release(symbol)
+    def _step(self, instruction: SendInstruction) -> SendStep:
+        if isinstance(instruction, KeyInstruction):
+            return self._key_handler(instruction.symbol, instruction.dir), instruction
+        return None, instruction
+
+    def _key_handler(self, symbol: str, key_dir: constants.KeyDir) -> KeyHandler:
+        if (handler := self._handlers.get((symbol, key_dir))) is None:
+            route = self._routes.get(symbol)
+            send_key = _KEY_DIR_FNS.get(key_dir)
+            if route is None or send_key is None:
+                return _unknown_key
+            handler = self._handlers[symbol, key_dir] = partial(send_key, route)
+        return handler
+
+
+def _press(
+    route: KeyRoute, symbol: str, press_duration: float, sleep: Callable[[float], None]
+) -> None:
+    route[1](symbol)
+
+
+def _release(
+    route: KeyRoute, symbol: str, press_duration: float, sleep: Callable[[float], None]
+) -> None:
+    route[2](symbol)
+
+
+def _click(
+    route: KeyRoute, symbol: str, press_duration: float, sleep: Callable[[float], None]
+) -> None:
+    _, press, release, _ = route
+    press(symbol)
+    if press_duration:
+        sleep(press_duration)
+    release(symbol)
+
+
+def _on(
+    route: KeyRoute, symbol: str, press_duration: float, sleep: Callable[[float], None]
+) -> None:
+    if not route[3](symbol):
+        _click(route, symbol, press_duration, sleep)
+
+
+def _off(
+    route: KeyRoute, symbol: str, press_duration: float, sleep: Callable[[float], None]
+) -> None:
+    if route[3](symbol):
+        _click(route, symbol, press_duration, sleep)
+
+
+def _unknown_key(
+    symbol: str, press_duration: float, sleep: Callable[[float], None]
+) -> None:
+    raise SendError
+
+
+_KEY_DIR_FNS: dict[
+    constants.KeyDir, Callable[[KeyRoute, str, float, Callable[[float], None]], None]
+] = {
+    constants.KeyDir.DOWN: _press,
+    constants.KeyDir.UP: _release,
+    constants.KeyDir.CLICK: _click,
+    constants.KeyDir.ON: _on,
+    constants.KeyDir.OFF: _off,
+}
+
+_PRESS_DIRS = frozenset([constants.KeyDir.DOWN, constants.KeyDir.CLICK])
+"""Directions that press, so interval is slept before them."""
@@ -1,7 +1,9 @@
 import time
 from dataclasses import dataclass
+from typing import Awaitable
 from typing import Callable
 
+from tapper.controller import flow_control
 from tapper.controller.flow_control import StopTapperActionException
 from tapper.parser import common
 
@@ -34,6 +36,17 @@ class SleepCommandProcessor:
     """Checks whether action should be paused."""
     actual_sleep_fn: Callable[[float], None] = time.sleep
     get_time_fn: Callable[[], float] = time.perf_counter
+    wait_change_fn: Callable[[int, float], None] | None = None
+    """Waits until flow_control.changes differs from the first arg, or for timeout.
+    If set, sleep wakes on kill or pause right away, and otherwise sleeps once.
+    If None, sleep checks for kill and pause every check_interval."""
+    precision: float = 0
+    """Sleep ends with spinning for up to this many seconds, instead of waiting,
+    to end closer to the deadline. Costs CPU. Only with wait_change_fn."""
+    wait_change_async_fn: Callable[
+        [int, float], Awaitable[None]
+    ] = flow_control.wait_change
+    """Same as wait_change_fn, for sleep_async. Waits on the same clock as get_time_fn."""
 
     @classmethod
     def from_none(cls) -> "SleepCommandProcessor":
@@ -45,6 +58,8 @@ class SleepCommandProcessor:
             raise ValueError(
                 "SleepCommandProcessor check_interval must be greater than 0."
             )
+        if self.precision < 0:
+            raise ValueError("SleepCommandProcessor precision must not be negative.")
 
     def sleep(self, length_of_time: float | str) -> None:
         """
@@ -56,6 +71,9 @@ class SleepCommandProcessor:
         :param length_of_time: Either number (seconds),
             or str seconds/millis like: "1s", "50ms".
         """
+        if self.wait_change_fn is not None:
+            self.sleep_until(self.get_time_fn() + parse_sleep_time(length_of_time))
+            return
         self.kill_if_required()
         self.pause_if_required()
         sleep_time = parse_sleep_time(length_of_time)
@@ -71,9 +89,72 @@ class SleepCommandProcessor:
             operational_total_time = self.get_time_fn() - operational_start_time
             sleep_time = sleep_time - operational_total_time
 
+    def sleep_until(self, deadline: float) -> None:
+        """
+        Same as `sleep`, until get_time_fn() reaches deadline.
+        Sleeping to deadlines of a schedule doesn't let oversleeping add up.
+        With wait_change_fn, wakes on kill or pause right away, else sleeps once.
+        Time paused counts as slept.
+        """
+        wait = self.wait_change_fn
+        if wait is None:
+            self.sleep(max(0.0, deadline - self.get_time_fn()))
+            return
+        while True:
+            # read before checks, so a change after them wakes the wait
+            since = flow_control.changes
+            self.kill_if_required()
+            if self.pause_check_fn():
+                # check_interval is a fallback, for pause not set through flow_control
+                wait(since, self.check_interval)
+            elif (remaining := deadline - self.get_time_fn()) > self.precision:
+                wait(since, remaining - self.precision)
+            else:
+                self.spin_until(deadline)
+                return
+
+    def spin_until(self, deadline: float) -> None:
+        while self.get_time_fn() < deadline:
+            self.actual_sleep_fn(0)  # lets other threads run
+
+    async def sleep_async(self, length_of_time: float | str) -> None:
+        """
+        Same as `sleep`, for actions that are `async def` functions: `await tapper.sleep_async(1)`.
+        Doesn't hold a thread. Wakes on kill or unpause right away,
+        instead of checking every check_interval.
+
+        :param length_of_time: Either number (seconds),
+            or str seconds/millis like: "1s", "50ms".
+        """
+        deadline = self.get_time_fn() + parse_sleep_time(length_of_time)
+        while True:
+            # before checks, so a change after them wakes the wait
+            since = flow_control.changes
+            self.kill_if_required()
+            await self.pause_if_required_async()
+            remaining = deadline - self.get_time_fn()
+            if remaining <= 0:
+                return
+            await self.wait_change_async_fn(since, remaining)
+
+    async def pause_if_required_async(self) -> None:
+        while True:
+            since = flow_control.changes
+            if not self.pause_check_fn():
+                return
+            # check_interval is a fallback, for pause not set through flow_control
+            await self.wait_change_async_fn(since, self.check_interval)
+
     def pause_if_required(self) -> None:
-        while self.pause_check_fn():
-            self.actual_sleep_fn(self.check_interval)
+        while True:
+            since = flow_control.changes
+            if not self.pause_check_fn():
+                return
+            if self.wait_change_fn is None:
+                self.actual_sleep_fn(self.check_interval)
+            else:
+                # check_interval is a fallback, for pause not set through flow_control
+                self.wait_change_fn(since, self.check_interval)
 
     def kill_if_required(self) -> None:
         if self.kill_check_fn():
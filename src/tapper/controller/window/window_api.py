@@ -3,11 +3,52 @@ from abc import abstractmethod
 from typing import Any
 from typing import Callable
 from typing import Optional
+from typing import TYPE_CHECKING
 
 from tapper.controller.resource_controller import ResourceController
 from tapper.model import constants
 from tapper.model.window import Window
 
+if TYPE_CHECKING:
+    from tapper.controller.window.window_cache import CachedWindowTracker
+
+
+def str_match(filtered: str, iterated: str | None, strict: bool) -> bool:
+    if not filtered or not iterated:
+        return False
+    if strict:
+        return filtered == iterated
+    else:
+        return filtered.casefold() in iterated.casefold()
+
+
+def win_filter(
+    win: Optional[Window],
+    exec_or_title: Optional[str] = None,
+    title: Optional[str] = None,
+    exec: Optional[str] = None,
+    strict: bool = False,
+    process_id: Optional[int] = None,
+    handle: Any = None,
+) -> Optional[Window]:
+    if not win:
+        return None
+    if handle and win.handle != handle:
+        return None
+    if process_id and win.process_id != process_id:
+        return None
+    if (
+        exec_or_title
+        and not str_match(exec_or_title, win.exec, strict)
+        and not str_match(exec_or_title, win.title, strict)
+    ):
+        return None
+    if exec and not str_match(exec, win.exec, strict):
+        return None
+    if title and not str_match(title, win.title, strict):
+        return None
+    return win
+
 
 class WindowTracker(ABC):
     @abstractmethod
@@ -124,21 +165,35 @@ class WindowController(ResourceController):
 
     _os: str
     _only_visible_windows: bool
+    _foreground_cache_interval: Optional[float] = None
     """Provided before init."""
 
     _tracker: WindowTracker
     _commander: WindowCommander
+    _foreground_cache: Optional["CachedWindowTracker"] = None
 
     def _init(self) -> None:
         if not hasattr(self, "_tracker") or not hasattr(self, "_commander"):
             self._tracker, self._commander = by_os[self._os](self._only_visible_windows)
+        if self._foreground_cache_interval and self._foreground_cache is None:
+            from tapper.controller.window.window_cache import CachedWindowTracker
+
+            self._foreground_cache = CachedWindowTracker(
+                self._tracker, self._foreground_cache_interval
+            )
+
+    @property
+    def foreground_cache(self) -> Optional["CachedWindowTracker"]:
+        """CachedWindowTracker, if foreground window is cached. Has hits, misses, staleness().
+        Only trigger conditions use it, see `active_cached`."""
+        return self._foreground_cache
 
     def _start(self) -> None:
         self._commander.start()
-        self._tracker.start()
+        (self._foreground_cache or self._tracker).start()  # cache starts its source
 
     def _stop(self) -> None:
-        self._tracker.stop()
+        (self._foreground_cache or self._tracker).stop()
         self._commander.stop()
 
     def get_open(
@@ -230,6 +285,22 @@ class WindowController(ResourceController):
             exec_or_title, title, exec, strict, process_id, handle
         )
 
+    def active_cached(
+        self,
+        exec_or_title: Optional[str] = None,
+        title: Optional[str] = None,
+        exec: Optional[str] = None,
+        strict: bool = False,
+        process_id: Optional[int] = None,
+        handle: Any = None,
+    ) -> Optional[Window]:
+        """
+        Same as `active`, but from the foreground cache if it's on, so it can be
+        up to twice the cache interval old. For trigger conditions, checked for many signals.
+        """
+        tracker = self._foreground_cache or self._tracker
+        return tracker.active(exec_or_title, title, exec, strict, process_id, handle)
+
     def to_active(
         self,
         window_or_exec_or_title: Optional[Window | str] = None,
@@ -0,0 +1,126 @@
+"""
+Foreground window snapshot, kept up to date in the background.
+
+Trigger conditions like win_exec are checked for many signals, and asking the OS
+each time is slow. With this, checking the foreground window is an in-memory comparison.
+"""
+import math
+import threading
+import time
+from typing import Any
+from typing import Optional
+
+from tapper.controller.window.window_api import win_filter
+from tapper.controller.window.window_api import WindowTracker
+from tapper.feedback.logger import log
+from tapper.model.window import Window
+
+
+class CachedWindowTracker(WindowTracker):
+    """Wraps another tracker, and answers `active` from a snapshot of the foreground window.
+
+    The snapshot is refreshed by a watcher thread every `interval` seconds,
+    and by `on_foreground_changed`, for sources that can notify about focus changes.
+    If the snapshot is older than `max_age`, it's refreshed on the spot, which counts as a miss.
+    """
+
+    source: WindowTracker
+    interval: float
+    max_age: float
+    hits: int
+    """Answered from the snapshot."""
+    misses: int
+    """Had to ask the source."""
+
+    _snapshot: tuple[Optional[Window], float]
+    """Foreground window, and perf_counter time it was taken. Replaced as a whole."""
+    _stop_event: threading.Event
+    _watcher: Optional[threading.Thread]
+
+    def __init__(
+        self,
+        source: WindowTracker,
+        interval: float = 0.05,
+        max_age: Optional[float] = None,
+    ) -> None:
+        self.source = source
+        self.interval = interval
+        self.max_age = max_age if max_age is not None else interval * 2
+        self.hits = 0
+        self.misses = 0
+        self._snapshot = (None, -math.inf)
+        self._stop_event = threading.Event()
+        self._watcher = None
+
+    def start(self) -> None:
+        self.source.start()
+        self.refresh()
+        self._stop_event.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, name="tapper-window-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        self.source.stop()
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                log.warning(f"Foreground window refresh failed: {e}")
+
+    def refresh(self) -> Optional[Window]:
+        """Takes a new snapshot from the source."""
+        window = self.source.active()
+        self._snapshot = (window, time.perf_counter())
+        return window
+
+    def on_foreground_changed(self) -> None:
+        """Call from an OS focus-change event, to not wait for the watcher."""
+        self.refresh()
+
+    def staleness(self) -> float:
+        """Seconds since the snapshot was taken. Infinite if never."""
+        return time.perf_counter() - self._snapshot[1]
+
+    def snapshot(self) -> Optional[Window]:
+        """Foreground window, from the snapshot if it's fresh enough."""
+        window, taken_at = self._snapshot
+        if time.perf_counter() - taken_at <= self.max_age:
+            self.hits += 1
+            return window
+        self.misses += 1
+        return self.refresh()
+
+    def get_open(
+        self,
+        exec_or_title: Optional[str] = None,
+        title: Optional[str] = None,
+        exec: Optional[str] = None,
+        strict: bool = False,
+        process_id: Optional[int] = None,
+        handle: Any = None,
+        limit: Optional[int] = None,
+    ) -> list[Window]:
+        return self.source.get_open(
+            exec_or_title, title, exec, strict, process_id, handle, limit
+        )
+
+    def active(
+        self,
+        exec_or_title: Optional[str] = None,
+        title: Optional[str] = None,
+        exec: Optional[str] = None,
+        strict: bool = False,
+        process_id: Optional[int] = None,
+        handle: Any = None,
+    ) -> Optional[Window]:
+        return win_filter(
+            self.snapshot(), exec_or_title, title, exec, strict, process_id, handle
+        )
@@ -13,6 +13,7 @@ import win32gui
 import win32process
 from tapper.controller.window.window_api import WindowCommander
 from tapper.controller.window.window_api import WindowTracker
+from tapper.controller.window.window_api import win_filter
 from tapper.model.window import Window
 
 user32 = ctypes.windll.user32  # type: ignore
@@ -69,43 +70,6 @@ def get_process_exec(pid: Optional[int]) -> Optional[str]:
         kernel32.CloseHandle(h_process)
 
 
-def str_match(filtered: str, iterated: str | None, strict: bool) -> bool:
-    if not filtered or not iterated:
-        return False
-    if strict:
-        return filtered == iterated
-    else:
-        return filtered.casefold() in iterated.casefold()
-
-
-def win_filter(
-    win: Optional[Window],
-    exec_or_title: Optional[str] = None,
-    title: Optional[str] = None,
-    exec: Optional[str] = None,
-    strict: bool = False,
-    process_id: Optional[int] = None,
-    handle: Any = None,
-) -> Optional[Window]:
-    if not win:
-        return None
-    if handle and win.handle != handle:
-        return None
-    if process_id and win.process_id != process_id:
-        return None
-    if (
-        exec_or_title
-        and not str_match(exec_or_title, win.exec, strict)
-        and not str_match(exec_or_title, win.title, strict)
-    ):
-        return None
-    if exec and not str_match(exec, win.exec, strict):
-        return None
-    if title and not str_match(title, win.title, strict):
-        return None
-    return win
-
-
 def add_win_if_required(
     result: list[Window],
     exec_or_title: Optional[str] = None,
@@ -0,0 +1,189 @@
+"""
+Opt-in timing of the signal hot path: hook callback, signal processing, matching, running actions.
+
+Hook callbacks that take too long get dropped by the OS, so this is the time to watch.
+Spans are written into a preallocated ring buffer, and only aggregated when a snapshot is asked for.
+"""
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+from tapper.feedback.logger import log
+
+HOOK = "hook"
+"""ListenerWrapper, the whole hook callback."""
+ON_SIGNAL = "on_signal"
+"""SignalProcessor.on_signal."""
+MATCH = "match"
+"""Finding a Tap for a signal."""
+RUN = "run"
+"""Handing the action to ActionRunner."""
+REPEAT = "repeat"
+"""SignalProcessor.on_repeat, the autorepeat fast path."""
+
+SUB_BUCKET_BITS = 4
+"""Histogram precision: values within 1/2**SUB_BUCKET_BITS of each other share a bucket."""
+
+FnT = TypeVar("FnT", bound=Callable[..., Any])
+
+
+def bucket_of(ns: int) -> int:
+    """Log-linear bucket, like HdrHistogram: exact for small values, constant relative error above."""
+    shift = max(ns.bit_length() - SUB_BUCKET_BITS, 0)
+    return (shift << SUB_BUCKET_BITS) + (ns >> shift)
+
+
+def bucket_highest(bucket: int) -> int:
+    """Highest value that falls into this bucket."""
+    shift, top = divmod(bucket, 1 << SUB_BUCKET_BITS)
+    return ((top + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Counts of values per log-linear bucket."""
+
+    counts: dict[int, int]
+    count: int
+    max_ns: int
+
+    def __init__(self) -> None:
+        self.counts = {}
+        self.count = 0
+        self.max_ns = 0
+
+    def add(self, ns: int) -> None:
+        bucket = bucket_of(ns)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, p: float) -> int:
+        """Value that p percent of values are at or below, within bucket precision."""
+        if not self.count:
+            return 0
+        target = max(math.ceil(p / 100 * self.count), 1)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                return min(bucket_highest(bucket), self.max_ns)
+        return self.max_ns
+
+
+@dataclass(frozen=True)
+class StageStats:
+    count: int
+    p50_ns: int
+    p99_ns: int
+    max_ns: int
+
+    def __str__(self) -> str:
+        return (
+            f"p50 {self.p50_ns / 1000:.1f}us, p99 {self.p99_ns / 1000:.1f}us, "
+            f"max {self.max_ns / 1000:.1f}us ({self.count})"
+        )
+
+
+class LatencyRecorder:
+    """Fixed-size ring buffer of (stage, duration) spans.
+
+    Listeners may run in different threads, so recording takes a lock.
+    Snapshot doesn't, and may see a span that is being overwritten, which is fine for stats.
+    """
+
+    size: int
+    log_interval: Optional[float]
+    """Seconds between summaries in the log. None to not log."""
+    recorded: int
+    """Total spans ever recorded, including overwritten ones."""
+    stages: list[str]
+
+    _stage_ids: bytearray
+    _spans: array  # type: ignore[type-arg]
+    _lock: threading.Lock
+    _stop_event: threading.Event
+
+    def __init__(self, size: int = 4096, log_interval: Optional[float] = 60) -> None:
+        self.size = size
+        self.log_interval = log_interval
+        self.recorded = 0
+        self.stages = [HOOK, ON_SIGNAL, MATCH, RUN, REPEAT]
+        self._stage_ids = bytearray(size)
+        self._spans = array("q", bytes(8 * size))
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def stage_id(self, stage: str) -> int:
+        if stage not in self.stages:
+            self.stages.append(stage)
+        return self.stages.index(stage)
+
+    def record(self, stage_id: int, ns: int) -> None:
+        with self._lock:
+            i = self.recorded % self.size
+            self._stage_ids[i] = stage_id
+            self._spans[i] = ns
+            self.recorded += 1
+
+    def instrument(self, stage: str, fn: FnT) -> FnT:
+        """Wraps fn to record its duration as stage."""
+        stage_id = self.stage_id(stage)
+        record = self.record
+        clock = time.perf_counter_ns
+
+        @wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(stage_id, clock() - start)
+
+        return timed  # type: ignore
+
+    def instrument_method(self, obj: Any, name: str, stage: str) -> None:
+        """Replaces obj's method with a timed one. Callers holding the old bound method are not timed."""
+        setattr(obj, name, self.instrument(stage, getattr(obj, name)))
+
+    def histograms(self) -> dict[str, LatencyHistogram]:
+        """Histograms per stage, of spans still in the buffer."""
+        result = {stage: LatencyHistogram() for stage in self.stages}
+        for i in range(min(self.recorded, self.size)):
+            result[self.stages[self._stage_ids[i]]].add(self._spans[i])
+        return result
+
+    def snapshot(self) -> dict[str, StageStats]:
+        """p50/p99/max per stage, over the most recent spans."""
+        return {
+            stage: StageStats(h.count, h.percentile(50), h.percentile(99), h.max_ns)
+            for stage, h in self.histograms().items()
+            if h.count
+        }
+
+    def report(self) -> str:
+        return "\n".join(f"{stage}: {s}" for stage, s in self.snapshot().items())
+
+    def start(self) -> None:
+        """Starts logging summaries, if log_interval is set."""
+        if not self.log_interval:
+            return
+        self._stop_event.clear()
+        threading.Thread(
+            target=self._log_loop, name="tapper-latency-log", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def _log_loop(self) -> None:
+        while not self._stop_event.wait(self.log_interval):
+            if report := self.report():
+                log.info(f"Signal latency:\n{report}")
@@ -1,6 +1,5 @@
-import time
-
 import tapper
+from tapper.boot import initializer
 from tapper.helper._util.image import base
 from tapper.helper.model_types import BboxT
 from tapper.helper.model_types import ImagePixelMatrixT
@@ -91,8 +90,8 @@ def wait_for(
     precision: float,
 ) -> XyCoordsT | None:
     target_image = base.target_to_image(target, bbox)
-    finish_time = time.perf_counter() + timeout
-    while time.perf_counter() < finish_time:
+    finish_time = initializer.clock.now() + timeout
+    while initializer.clock.now() < finish_time:
         outer = base.outer_to_image(None, bbox)
         if found := find(target_image, outer, precision):
             return found
@@ -108,8 +107,8 @@ def wait_for_disappear(
     precision: float,
 ) -> bool:
     target_image = base.target_to_image(target, bbox)
-    finish_time = time.perf_counter() + timeout
-    while time.perf_counter() < finish_time:
+    finish_time = initializer.clock.now() + timeout
+    while initializer.clock.now() < finish_time:
         outer = base.outer_to_image(None, bbox)
         if not find(target_image, outer, precision):
             return True
@@ -126,8 +125,8 @@ def wait_for_one_of(
     precision: float,
 ) -> tuple[ImageT, XyCoordsT] | tuple[None, None]:
     targets_normalized = base.targets_normalize(targets)
-    finish_time = time.perf_counter() + timeout
-    while time.perf_counter() < finish_time:
+    finish_time = initializer.clock.now() + timeout
+    while initializer.clock.now() < finish_time:
         found, xy = find_one_of(targets_normalized, None, precision)
         if found is not None and xy is not None:
             return found, xy
@@ -1,10 +1,10 @@
-import time
 from typing import Any
 from typing import Callable
 
 import numpy as np
 import tapper
 from PIL import ImageColor
+from tapper.boot import initializer
 from tapper.helper._util.image import base
 from tapper.helper.model_types import BboxT
 from tapper.helper.model_types import ImagePixelMatrixT
@@ -140,16 +140,16 @@ def wait_for(
     interval: float,
     variation: int,
 ) -> XyCoordsT | None:
-    finish_time = time.perf_counter() + timeout
+    finish_time = initializer.clock.now() + timeout
     while True:
         if found := find(
             color, bbox_or_coords, return_absolute_coords, None, variation=variation
         ):
             return found
-        if time.perf_counter() > finish_time:
+        if initializer.clock.now() > finish_time:
             return None
         tapper.sleep(interval)
-        if time.perf_counter() > finish_time:
+        if initializer.clock.now() > finish_time:
             return None
 
 
@@ -160,8 +160,8 @@ def wait_for_disappear(
     interval: float,
     variation: int,
 ) -> bool:
-    finish_time = time.perf_counter() + timeout
-    while time.perf_counter() < finish_time:
+    finish_time = initializer.clock.now() + timeout
+    while initializer.clock.now() < finish_time:
         if not find(color, bbox_or_coords, False, None, variation=variation):
             return True
         tapper.sleep(interval)
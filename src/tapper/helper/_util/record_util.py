@@ -1,5 +1,5 @@
-import time
 from dataclasses import dataclass
+from dataclasses import replace
 from typing import Any
 from typing import Callable
 
@@ -51,7 +51,7 @@ class SignalRecord:
 recording_: list[SignalRecord] | None = None
 
 record_signal = lambda signal: recording_.append(  # type: ignore
-    SignalRecord(signal, time.perf_counter(), mouse.get_pos())
+    SignalRecord(signal, initializer.clock.now(), mouse.get_pos())
 )
 
 
@@ -59,7 +59,7 @@ def toggle_recording(
     callbacks: list[Callable[[str], Any]], config: RecordConfig
 ) -> None:
     global recording_
-    timeout = lambda time2: time.perf_counter() - time2 > config.max_recording_time
+    timeout = lambda time2: initializer.clock.now() - time2 > config.max_recording_time
 
     if recording_ is None or (recording_ and timeout(recording_[0].time)):
         start_recording()
@@ -113,7 +113,7 @@ def cut_start_stop(
         )
 
     start_buttons_number = first_with_dir(records[1:], KeyDirBool.DOWN) + 1
-    cut_from_time = time.perf_counter() - end_cut_time
+    cut_from_time = initializer.clock.now() - end_cut_time
     records = [r for r in records if r.time < cut_from_time]
 
     if start_buttons_number == -1:
@@ -168,9 +168,9 @@ def to_instructions(records: list[SignalRecord]) -> list[SendInstruction]:
         instruction = meta_instruction(symbol)  # type: ignore
         if isinstance(instruction, KeyInstruction):
             if record.signal[1] == KeyDirBool.DOWN:
-                instruction.dir = KeyDir.DOWN
+                instruction = replace(instruction, dir=KeyDir.DOWN)
             else:
-                instruction.dir = KeyDir.UP
+                instruction = replace(instruction, dir=KeyDir.UP)
         elif not isinstance(instruction, WheelInstruction):
             raise TypeError(f"Got instruction type {type(instruction)}")
         result.append(instruction)
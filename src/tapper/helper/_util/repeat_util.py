@@ -1,4 +1,3 @@
-import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Callable
 
@@ -52,11 +51,10 @@ def _run_task(repeatable: Repeatable) -> None:
         if repeatable.interval <= TIME_SPLIT:
             tapper.sleep(repeatable.interval)
         else:
-            started_at = time.perf_counter()
-            elapsed = 0.0
-            while repeatable.interval - elapsed > 0.0:
-                tapper.sleep(min(TIME_SPLIT, repeatable.interval - elapsed))
-                elapsed = time.perf_counter() - started_at
+            # to a deadline: remaining time to a near deadline is exact, so it ends
+            deadline = initializer.clock.now() + repeatable.interval
+            while (remaining := deadline - initializer.clock.now()) > 0.0:
+                tapper.sleep(min(TIME_SPLIT, remaining))
                 if is_end_run(repeatable):
                     running_repeatable = None
                     return
@@ -82,7 +80,7 @@ def to_pressed_condition(symbol: str) -> Callable[[], bool]:
     else:
         raise ValueError(f"Repeat while pressed: '{symbol}' not recognised.")
     return lambda: (
-        device.pressed(symbol) or symbol in initializer.keeper_pressed.pressed_keys  # type: ignore
+        device.pressed(symbol) or initializer.keeper_pressed.is_pressed(symbol)  # type: ignore
     )
 
 
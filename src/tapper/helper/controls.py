@@ -3,7 +3,6 @@ import os
 import signal
 import subprocess
 import sys
-import uuid
 
 from tapper.controller import flow_control as _flow_control
 from tapper.feedback.logger import log
@@ -21,6 +20,14 @@ def restart() -> None:
     _terminate()
 
 
+def reload() -> None:
+    """Applies changes to tapper.root and tapper.control_group in-process, see tapper.reload.
+    Much faster than restart, but doesn't re-run the script."""
+    import tapper
+
+    tapper.reload()
+
+
 def terminate() -> None:
     log.info("Terminating tapper...")
     _terminate()
@@ -36,19 +43,19 @@ def pause_actions_on() -> None:
     Note: will only pause when `tapper.sleep` is used inside the action,
             directly or via other tapper functions."""
     log.debug("Pausing tapper actions")
-    _flow_control.paused = True
+    _flow_control.set_paused(True)
 
 
 def pause_actions_off() -> None:
     """Turns off pause. Does nothing if pause is already off."""
     log.debug("Un-pausing tapper actions")
-    _flow_control.paused = False
+    _flow_control.set_paused(False)
 
 
 def pause_actions_toggle() -> None:
     """Turns on pause if not paused, turns pause off if it's on."""
     log.debug(f"Pausing tapper actions toggle: {not _flow_control.paused}")
-    _flow_control.paused = not _flow_control.paused
+    _flow_control.set_paused(not _flow_control.paused)
 
 
 def kill_running_actions() -> None:
@@ -56,4 +63,4 @@ def kill_running_actions() -> None:
     Note: will only kill when `tapper.sleep` is used inside the action,
             directly or via other tapper functions."""
     log.debug("Killing tapper actions")
-    _flow_control.kill_id = uuid.uuid4()
+    _flow_control.kill()
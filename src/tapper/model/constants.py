@@ -53,3 +53,5 @@ WinputListenerResult = {ListenerResult.SUPPRESS: 4, ListenerResult.PROPAGATE: 0}
 
 EvdevKeyDir = {0: KeyDirBool.UP, 1: KeyDirBool.DOWN, 2: KeyDirBool.DOWN}
 EvdevReverseKeyDir = {KeyDirBool.UP: 0, KeyDirBool.DOWN: 1}
+EvdevRepeat = 2
+"""Event value of autorepeat, sent while a key is held."""
@@ -15,10 +15,13 @@ Here it's all printable ASCII characters."""
 
 
 class SendInstruction(ABC):
-    """Single instruction parsed from send command."""
+    """Single instruction parsed from send command.
+    Immutable: parsed commands are cached, and shared between threads."""
 
+    __slots__ = ()
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class KeyInstruction(SendInstruction):
     """Regular key, such as on keyboard or mouse button. Generic."""
 
@@ -26,14 +29,14 @@ class KeyInstruction(SendInstruction):
     dir: constants.KeyDir = field(default=constants.KeyDir.CLICK)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WheelInstruction(SendInstruction):
     """Single mouse wheel scroll."""
 
     wheel_symbol: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CursorMoveInstruction(SendInstruction):
     """Move mouse cursor. Absolute."""
 
@@ -41,11 +44,16 @@ class CursorMoveInstruction(SendInstruction):
     relative: bool = field(default=False)
 
     def __init__(self, xy_rel: tuple[int, int] | tuple[tuple[int, int], bool]) -> None:
-        self.xy = xy_rel if isinstance(xy_rel[0], int) else xy_rel[0]
-        self.relative = isinstance(xy_rel[1], bool) and xy_rel[1]
+        xy = xy_rel if isinstance(xy_rel[0], int) else xy_rel[0]
+        object.__setattr__(self, "xy", xy)
+        object.__setattr__(self, "relative", isinstance(xy_rel[1], bool) and xy_rel[1])
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SleepInstruction(SendInstruction):
     time: float
     """Seconds."""
+
+
+SendProgram = tuple[SendInstruction, ...]
+"""Parsed send command."""
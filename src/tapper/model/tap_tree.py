@@ -26,6 +26,20 @@ class TapGeneric(ABC):
     Time between key press and release, in seconds. Will be overridden if specified on `send` itself.
     Only applies to click, not up/down. `e down;e up` will not have this time inbetween, `e` will.
     """
+    throttle: Optional[float | str]
+    """After triggering, don't trigger again for this long. Seconds, or str like "200ms".
+    Signals not triggered because of throttle, debounce or ignore_autorepeat
+    are still suppressed, as if the Tap triggered."""
+    debounce: Optional[float | str]
+    """Don't trigger on a signal that comes sooner than this after the previous signal
+    of the same trigger, triggered or not. Seconds, or str like "50ms"."""
+    ignore_autorepeat: Optional[bool]
+    """Don't trigger on repeated key down signals, sent by the OS while a key is held.
+    Taps with held time, like "a 1s", need these to trigger."""
+    trigger_on_repeat: Optional[bool]
+    """Trigger on autorepeat from listeners that tell it apart from a key press (Linux).
+    Otherwise autorepeat from these doesn't trigger, and is suppressed or propagated
+    the same as the key press was. Taps with held time, like "a 1s", trigger anyway."""
     trigger_conditions: dict[str, Any]
     """Keyword trigger conditions that can be used as part of `Tap` or `Group`. See config for docs."""
 
@@ -40,6 +54,7 @@ class Tap(TapGeneric):
     """
     Action to be executed when triggered. Will run in a separate thread.
     If string is specified, it will send(action) instead.
+    Can be an `async def` function, see config.action_runner_async_tasks.
     """
     _parent: "Group"
 
@@ -51,6 +66,10 @@ class Tap(TapGeneric):
         suppress_trigger: Optional[bool] = None,
         send_interval: Optional[float] = None,
         send_press_duration: Optional[float] = None,
+        throttle: Optional[float | str] = None,
+        debounce: Optional[float | str] = None,
+        ignore_autorepeat: Optional[bool] = None,
+        trigger_on_repeat: Optional[bool] = None,
         **trigger_conditions: Any,
     ) -> None:
         self.trigger = trigger
@@ -61,6 +80,10 @@ class Tap(TapGeneric):
         )
         self.send_interval = send_interval
         self.send_press_duration = send_press_duration
+        self.throttle = throttle
+        self.debounce = debounce
+        self.ignore_autorepeat = ignore_autorepeat
+        self.trigger_on_repeat = trigger_on_repeat
         self.trigger_conditions = trigger_conditions
 
     def conditions(self, **trigger_conditions: Any) -> "Tap":
@@ -108,6 +131,10 @@ class Group(TapGeneric):
         suppress_trigger: Optional[bool] = None,
         send_interval: Optional[float] = None,
         send_press_duration: Optional[float] = None,
+        throttle: Optional[float | str] = None,
+        debounce: Optional[float | str] = None,
+        ignore_autorepeat: Optional[bool] = None,
+        trigger_on_repeat: Optional[bool] = None,
         **trigger_conditions: Any,
     ) -> None:
         self.name = name
@@ -117,6 +144,10 @@ class Group(TapGeneric):
         )
         self.send_interval = send_interval
         self.send_press_duration = send_press_duration
+        self.throttle = throttle
+        self.debounce = debounce
+        self.ignore_autorepeat = ignore_autorepeat
+        self.trigger_on_repeat = trigger_on_repeat
         self.trigger_conditions = trigger_conditions
 
         self._children = []
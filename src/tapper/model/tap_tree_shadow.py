@@ -1,4 +1,5 @@
 """See tap_tree for docs, same fields as here."""
+import math
 from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
@@ -7,12 +8,10 @@ from typing import Optional
 
 from tapper.model import constants
 from tapper.model.tap_tree import TapGeneric
+from tapper.model.trigger import AuxMasks
 from tapper.model.trigger import Trigger
 from tapper.model.types_ import Action
 from tapper.model.types_ import TriggerConditionFn
-from tapper.util.cache import lru_cache
-from tapper.util.datastructs import to_flat_list
-from tapper.util.datastructs import unique_list
 
 
 class STapGeneric(ABC):
@@ -25,10 +24,20 @@ class STapGeneric(ABC):
     send_interval: float
     send_press_duration: float
     trigger_conditions: list[TriggerConditionFn]
+    main_triggers_down: frozenset[str]
+    main_triggers_up: frozenset[str]
+    """All main keys, by direction. If group - all children's main keys."""
+    parent: Optional["SGroup"]
 
-    @abstractmethod
-    def get_main_triggers(self, direction: constants.KeyDirBool) -> list[str]:
+    def get_main_triggers(self, direction: constants.KeyDirBool) -> frozenset[str]:
         """All main keys. If group - all children's main keys."""
+        if direction:
+            return self.main_triggers_down
+        return self.main_triggers_up
+
+    @abstractmethod
+    def refresh_main_triggers(self) -> None:
+        """Recompute main_triggers_down/up. Done automatically by constructor and SGroup.add."""
 
 
 @dataclass
@@ -39,12 +48,28 @@ class STap(STapGeneric):
     action: Action
     executor: int
     suppress_trigger: constants.ListenerResult
+    aux_masks: Optional[AuxMasks] = None
+    """Compiled from trigger.aux against the state keeper, by SignalProcessor."""
+    throttle: float = 0
+    debounce: float = 0
+    ignore_autorepeat: bool = False
+    trigger_on_repeat: bool = False
+    triggered_at: float = field(default=-math.inf, repr=False, compare=False)
+    """Time of the last trigger. For throttle."""
+    signal_at: float = field(default=-math.inf, repr=False, compare=False)
+    """Time of the last signal that reached this Tap. For debounce."""
+    main_triggers_down: frozenset[str] = field(init=False, repr=False)
+    main_triggers_up: frozenset[str] = field(init=False, repr=False)
+    parent: Optional["SGroup"] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.refresh_main_triggers()
 
-    def get_main_triggers(self, direction: constants.KeyDirBool) -> list[str]:
-        if self.trigger.main.direction == direction:
-            return self.trigger.main.symbols
-        else:
-            return []
+    def refresh_main_triggers(self) -> None:
+        main = self.trigger.main
+        symbols = frozenset(main.symbols)
+        self.main_triggers_down = symbols if main.direction else frozenset()
+        self.main_triggers_up = frozenset() if main.direction else symbols
 
 
 @dataclass
@@ -52,14 +77,49 @@ class SGroup(STapGeneric):
     """Shadow Group: used during runtime."""
 
     children: list[STapGeneric] = field(default_factory=list)
+    """If changed other than by `add`, call refresh_main_triggers."""
+    main_triggers_down: frozenset[str] = field(init=False, repr=False)
+    main_triggers_up: frozenset[str] = field(init=False, repr=False)
+    parent: Optional["SGroup"] = field(default=None, repr=False, compare=False)
 
-    @lru_cache  # type: ignore
-    def get_main_triggers(self, direction: constants.KeyDirBool) -> list[str]:  # type: ignore
-        nested_non_unique = [
-            child.get_main_triggers(direction) for child in self.children
-        ]
-        return unique_list(to_flat_list(nested_non_unique))
+    def __post_init__(self) -> None:
+        for child in self.children:
+            child.parent = self
+        self.refresh_main_triggers()
+
+    def refresh_main_triggers(self) -> None:
+        """Also refreshes parents, as they contain this group's triggers."""
+        self.main_triggers_down = frozenset().union(
+            *(child.main_triggers_down for child in self.children)
+        )
+        self.main_triggers_up = frozenset().union(
+            *(child.main_triggers_up for child in self.children)
+        )
+        if self.parent is not None:
+            self.parent.refresh_main_triggers()
 
     def add(self, *children: STapGeneric) -> "SGroup":
         self.children.extend(children)
+        for child in children:
+            child.parent = self
+        self._include_main_triggers(
+            frozenset().union(*(child.main_triggers_down for child in children)),
+            frozenset().union(*(child.main_triggers_up for child in children)),
+        )
         return self
+
+    def relink_parents(self) -> None:
+        """Set parent of each descendant to the group it is in.
+        Nodes reused on reload keep the parent from the old tree until this is called."""
+        for child in self.children:
+            child.parent = self
+            if isinstance(child, SGroup):
+                child.relink_parents()
+
+    def _include_main_triggers(self, down: frozenset[str], up: frozenset[str]) -> None:
+        if down <= self.main_triggers_down and up <= self.main_triggers_up:
+            return
+        self.main_triggers_down |= down
+        self.main_triggers_up |= up
+        if self.parent is not None:
+            self.parent._include_main_triggers(down, up)
@@ -39,6 +39,21 @@ class AuxiliaryKey(TriggerKey):
     """Minimum time between its press and main signal for the trigger to work."""
 
 
+@dataclass(frozen=True)
+class AuxMasks:
+    """Auxiliary keys of a Trigger, compiled to bitmasks of symbol ids.
+    See `keeper.Pressed`."""
+
+    all_of: int = 0
+    """Single-symbol keys without time: every bit must be pressed."""
+    any_of: tuple[int, ...] = ()
+    """Multi-symbol keys without time, like "ctrl": at least one bit of each must be pressed."""
+    timed: tuple[tuple[int, float], ...] = ()
+    """Keys with time: (mask, time). One of the bits must be pressed for at least time."""
+    count: int = 0
+    """Number of auxiliary keys."""
+
+
 @dataclass(frozen=True)
 class Trigger:
     """Signals are compared against this to determine if action should be performed."""
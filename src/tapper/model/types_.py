@@ -16,6 +16,8 @@ Signal emitted by SignalListener. Is not alias to other symbol.
 
 OnSignalFn = Callable[[Signal], constants.ListenerResult]
 """An action to execute on receiving a signal from a listener."""
+OnRepeatFn = Callable[[str], constants.ListenerResult]
+"""An action to execute on autorepeat of a held key. Takes the key's symbol."""
 
 SymbolsWithAliases = dict[str, list[str]]
 """              symbol/alias, reference
@@ -1,11 +1,14 @@
-import copy
+import itertools
 import re
 from dataclasses import dataclass
 from dataclasses import field
-from functools import cache
+from dataclasses import replace
 from typing import Any
 from typing import Callable
+from typing import Iterable
+from typing import Iterator
 from typing import Optional
+from typing import Sequence
 
 from tapper.model import constants
 from tapper.model import keyboard
@@ -14,20 +17,27 @@ from tapper.model.send import COMBO_CONTENT
 from tapper.model.send import COMBO_WRAP
 from tapper.model.send import KeyInstruction
 from tapper.model.send import SendInstruction
+from tapper.model.send import SendProgram
 from tapper.model.send import SleepInstruction
 from tapper.model.send import WheelInstruction
 from tapper.parser import common
-from tapper.util import datastructs
+from tapper.util.cache import LruCache
 
 SYMBOL_DELIMITER = "+"
 PROPERTY_DELIMITER = " "
 COMMA_DELIMITER = ","
 COMBO_DELIMITER = ";"
 
+COMBO_TOKEN = "combo"
+UPPER_TOKEN = "upper"
+RUN_LENGTH = 256
+"""Most chars parsed at once, when parsing while sending."""
+
 default_shift = "left_shift"
+"""Shift pressed for upper case chars, unless another shift is already down."""
 
-ki_shift_down = lambda: KeyInstruction(default_shift, constants.KeyDir.DOWN)
-ki_shift_up = lambda: KeyInstruction(default_shift, constants.KeyDir.UP)
+ki_shift_down = lambda shift=default_shift: KeyInstruction(shift, constants.KeyDir.DOWN)
+ki_shift_up = lambda shift=default_shift: KeyInstruction(shift, constants.KeyDir.UP)
 
 
 def parse_wrap(combo_wrap: str) -> re.Pattern[str]:
@@ -35,7 +45,6 @@ def parse_wrap(combo_wrap: str) -> re.Pattern[str]:
     return re.compile(prefix + COMBO_CONTENT + suffix)
 
 
-@cache
 def match_combos(command: str, pattern: re.Pattern[str]) -> list[re.Match[str]]:
     start = 0
     matches = []
@@ -54,8 +63,26 @@ class _Key:
     props: list[str]
     """Unparsed properties."""
 
-    def __hash__(self) -> int:
-        return super().__hash__()
+
+def split_combo(content: str) -> list[str]:
+    """
+    Splits combo content on COMBO_DELIMITER, in one pass.
+    Delimiter that a symbol starts with is the symbol: "a+;;b" -> ["a+;", "b"].
+    """
+    result = []
+    start = 0
+    symbol_start = True
+    for i, char in enumerate(content):
+        if symbol_start:
+            symbol_start = False
+        elif char == SYMBOL_DELIMITER:
+            symbol_start = True
+        elif char == COMBO_DELIMITER:
+            result.append(content[start:i])
+            start = i + 1
+            symbol_start = True
+    result.append(content[start:])
+    return result
 
 
 def to_content(combo: re.Match[str]) -> str:
@@ -71,14 +98,13 @@ def resolve_last_with_props(
     result = [base_ins]
     for prop in props:
         if sleep := sleep_prop(prop):
-            if (
-                isinstance(result[-1], KeyInstruction)
-                and result[-1].dir == constants.KeyDir.CLICK
-            ):
-                result[-1].dir = constants.KeyDir.DOWN
-                sym = result[-1].symbol
+            last = result[-1]
+            if isinstance(last, KeyInstruction) and last.dir == constants.KeyDir.CLICK:
+                # multiplied clicks are all pressed down: "a 2x 1s" is a down, a down, 1s, a up
+                down = replace(last, dir=constants.KeyDir.DOWN)
+                result = [down if ins is last else ins for ins in result]
                 result.append(sleep)
-                result.append(KeyInstruction(sym, constants.KeyDir.UP))
+                result.append(KeyInstruction(last.symbol, constants.KeyDir.UP))
                 dir_allowed = False
             else:
                 result.append(sleep)
@@ -94,9 +120,7 @@ def resolve_last_with_props(
             if not isinstance(ins, KeyInstruction):
                 raise SendParseError
             else:
-                last = copy.deepcopy(ins)
-                last.dir = constants.KeyDir(dir)
-                result[-1] = last
+                result[-1] = replace(ins, dir=constants.KeyDir(dir))
                 if constants.KeyDir.DOWN != dir:
                     mult_allowed = False
         else:
@@ -138,7 +162,7 @@ def dir_prop(prop: str) -> Optional[str]:
         return None
 
 
-def has_chars(instructions: list[SendInstruction]) -> bool:
+def has_chars(instructions: SendProgram) -> bool:
     return any(
         isinstance(ins, KeyInstruction) and ins.symbol in keyboard.chars_en
         for ins in instructions
@@ -163,98 +187,148 @@ class SendParser:
     ] = field(default_factory=dict)
     """Regex and corresponding instruction and action to parse values for the instruction."""
 
-    def __hash__(self) -> int:
-        return super().__hash__()
+    programs: LruCache[tuple[str, str | None], SendProgram] = field(
+        default_factory=lambda: LruCache(max_entries=1024, weight_fn=len)
+    )
+    """Parsed commands. Weight is number of instructions, so long texts don't pile up."""
+
+    combos: LruCache[str, SendProgram] = field(
+        default_factory=lambda: LruCache(max_entries=1024, weight_fn=len)
+    )
+    """Parsed combo contents, shared by commands."""
+
+    _lexer: re.Pattern[str] | None = field(default=None, init=False, repr=False)
+    """Compiled on first parse, from pattern and symbols."""
+    _chars: dict[str, KeyInstruction] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    """Char in a command, and its instruction. Upper case chars are without shift."""
 
     def set_wrap(self, combo_wrap: str) -> None:
         self.pattern = parse_wrap(combo_wrap)
+        self._lexer = None
+        self.programs.clear()
 
-    @cache
     def parse(self, command: str, shift_in: str | None = None) -> list[SendInstruction]:
         """Parse send command into sequential instructions."""
-        global default_shift
-        self.pattern = self.pattern or parse_wrap(COMBO_WRAP)
+        return list(self.compile(command, shift_in))
+
+    def compile(self, command: str, shift_in: str | None = None) -> SendProgram:
+        """
+        Same as parse, cached.
+        :param command: send command.
+        :param shift_in: shift that is down before the command, if any.
+        """
+        return self.programs.get(
+            (command, shift_in), lambda: self._compile(command, shift_in)
+        )
 
-        if shift_in:
-            default_shift = shift_in
+    def stream(
+        self, commands: str | Iterable[str], shift_in: str | None = None
+    ) -> Iterator[SendInstruction]:
+        """
+        Same as parse, lazily: instructions are parsed as they are taken.
+        Memory doesn't grow with the length of the command.
+        :param commands: send command, or commands parsed one after another, as one.
+            A combo must not be split between them.
+        :param shift_in: shift that is down before the command, if any.
+        """
+        for chunk in self._chunks(commands, shift_in):
+            yield from chunk
+
+    def _compile(self, command: str, shift_in: str | None) -> SendProgram:
+        return tuple(itertools.chain.from_iterable(self._chunks(command, shift_in)))
+
+    def _chunks(
+        self, commands: str | Iterable[str], shift_in: str | None
+    ) -> Iterator[Sequence[SendInstruction]]:
+        """Instructions of a combo, or of a run of up to RUN_LENGTH chars, at a time."""
+        if isinstance(commands, str):
+            commands = (commands,)
+        shift = shift_in or default_shift
         shift_down = bool(shift_in)
-        result = []
-        combos = match_combos(command, self.pattern).copy()
-
-        i = 0
-        while i < len(command):
-            if combos:
-                combo = combos[0]
-                if i == combo.start():
-                    combos.remove(combo)
-                    cmds = self.parse_combo(to_content(combo), shift_down)
-                    result.extend(cmds)
-
-                    i = combo.end()
-                    if i >= len(command):
-                        break
+        lexer = self._lexer or self._compile_lexer()
+        chars = self._chars
+
+        for command in commands:
+            for token in lexer.finditer(command):
+                if token.lastgroup == COMBO_TOKEN:
+                    yield self.parse_combo(to_content(token), shift_down, shift)
                     continue
-            symbol = self.unalias(command[i])
-            if symbol not in self.symbols:
-                raise SendParseError(
-                    f"Symbol '{symbol}' not recognised in command '{command}'"
-                )
-            if symbol in keyboard.chars_en_upper:
-                symbol = keyboard.chars_en_upper_to_lower[symbol]
-                if not shift_down:
-                    result.append(ki_shift_down())
-                    shift_down = True
-                result.append(KeyInstruction(symbol))
-            else:
-                if shift_down:
-                    result.append(ki_shift_up())
-                    shift_down = False
-                result.append(KeyInstruction(symbol))
-            i += 1
+                try:
+                    run = [chars[char] for char in token.group()]
+                except KeyError as e:
+                    raise SendParseError(
+                        f"Symbol '{self.unalias(e.args[0])}' not recognised in command '{command}'"
+                    )
+                if (token.lastgroup == UPPER_TOKEN) != shift_down:
+                    shift_down = not shift_down
+                    yield (ki_shift_down(shift) if shift_down else ki_shift_up(shift),)
+                yield run
 
         if shift_down and not shift_in:
-            result.append(ki_shift_up())
+            yield (ki_shift_up(shift),)
         elif shift_in and not shift_down:
-            result.append(ki_shift_down())
-        return result
+            yield (ki_shift_down(shift),)
 
-    def parse_combo(self, content: str, shift_down: bool) -> list[SendInstruction]:
+    def _compile_lexer(self) -> re.Pattern[str]:
+        """
+        One regex that splits a command into combos, and runs of chars
+        typed with and without shift. Chars are mapped to instructions in advance.
+        """
+        self._chars = {}
+        for char in [*self.symbols, *self.aliases]:
+            symbol = self.unalias(char)
+            if len(char) != 1 or symbol not in self.symbols:
+                continue
+            symbol = keyboard.chars_en_upper_to_lower.get(symbol, symbol)
+            self._chars[char] = KeyInstruction(symbol)
+        upper = "".join(
+            re.escape(char)
+            for char in self._chars
+            if self.unalias(char) in keyboard.chars_en_upper
+        )
+        upper_char, other_char = f"[{upper}]", f"[^{upper}]"
+        if not upper:
+            upper_char, other_char = "(?!)", "."
+        combo = (self.pattern or parse_wrap(COMBO_WRAP)).pattern
+        self._lexer = re.compile(
+            f"(?P<{COMBO_TOKEN}>{combo})"
+            f"|(?P<{UPPER_TOKEN}>(?:(?!{combo}){upper_char}){{1,{RUN_LENGTH}}})"
+            f"|(?:(?!{combo}){other_char}){{1,{RUN_LENGTH}}}",
+            re.DOTALL,
+        )
+        return self._lexer
+
+    def parse_combo(
+        self, content: str, shift_down: bool, shift: str = default_shift
+    ) -> SendProgram:
         """
         Parse a combo from content string
         :param content: string like "a+b"
         :param shift_down: if shift is down before combo
+        :param shift: which shift is down
         :return: parsed instructions
         """
-        result = self._parse_combo(content).copy()
+        result = self.combos.get(content, lambda: tuple(self._parse_combo(content)))
         if shift_down and has_chars(result):
-            result.insert(0, ki_shift_up())
-            result.append(ki_shift_down())
+            return ki_shift_up(shift), *result, ki_shift_down(shift)
         return result
 
-    @cache
     def _parse_combo(self, content: str) -> list[SendInstruction]:
+        result = []
+        for chain in split_combo(content):
+            result.extend(self._parse_chain(chain))
+        return result
 
+    def _parse_chain(self, content: str) -> list[SendInstruction]:
+        """Parse one combo without COMBO_DELIMITER, like "a+b 20ms+lmb 2x"."""
         if not content:
             raise SendParseError
 
         symbols_split = common.split(content, SYMBOL_DELIMITER)
         chain_symbols_split = symbols_split[:-1]
 
-        for i in range(len(symbols_split)):
-            one_split = symbols_split[i]
-            if len(one_split) > 1 and COMBO_DELIMITER in one_split[1:]:
-                combo_delim_index = i + 1 + one_split.index(COMBO_DELIMITER, 1)
-                combo_delim_index += sum(len(s) for s in symbols_split[:i])
-
-                parsed_combos = [
-                    self._parse_combo(combo).copy()
-                    for combo in [
-                        content[: combo_delim_index - 1],
-                        content[combo_delim_index:],
-                    ]
-                ]
-                return datastructs.to_flat_list(parsed_combos)
-
         result = []
         result_wrap = []
 
@@ -279,7 +353,6 @@ class SendParser:
         result.extend(result_wrap[::-1])
         return result
 
-    @cache
     def parse_chain_split(
         self, key: _Key
     ) -> tuple[list[SendInstruction], Optional[SendInstruction]]:
@@ -296,19 +369,17 @@ class SendParser:
         if key.symbol in keyboard.chars_en_upper:
             raise SendParseError
 
+        opening: SendInstruction
+        closing: SendInstruction
         instruction_type = self.symbols[key.symbol]
         if instruction_type == KeyInstruction:
-            base_ins = KeyInstruction(key.symbol)
+            opening = KeyInstruction(key.symbol, constants.KeyDir.DOWN)
+            closing = KeyInstruction(key.symbol, constants.KeyDir.UP)
         elif instruction_type == WheelInstruction:
-            base_ins = WheelInstruction(key.symbol)  # type: ignore
+            opening = closing = WheelInstruction(key.symbol)
         else:
             raise SendParseError
 
-        opening = copy.deepcopy(base_ins)
-        opening.dir = constants.KeyDir.DOWN
-        closing = copy.deepcopy(base_ins)
-        closing.dir = constants.KeyDir.UP
-
         if key.props:
             try:
                 return resolve_chain_opening_with_props(opening, key.props), closing
@@ -324,7 +395,6 @@ class SendParser:
         except KeyError:
             return symbol
 
-    @cache
     def parse_last_split(self, key: _Key) -> list[SendInstruction]:
         """
         In combo like       "a+b 20ms+lmb 2x"
@@ -354,7 +424,6 @@ class SendParser:
                 raise SendParseError
         return [base_ins]
 
-    @cache
     def parse_regex_symbol(self, symbol: str) -> list[SendInstruction]:
         for regex, value in self.regexes.items():
             instruction_type, fn = value
@@ -28,6 +28,16 @@ class SignalListener(ABC):
         """
         raise errors.NotSubstitutedError
 
+    def on_repeat(self, symbol: str) -> constants.ListenerResult:
+        """Autorepeat of a held key, for listeners that can tell it from a key press.
+
+        May be substituted with a faster path, that doesn't trigger most Taps.
+        By default, this is a key press.
+
+        :return: Same as on_signal.
+        """
+        return self.on_signal((symbol, constants.KeyDirBool.DOWN))
+
     @abstractmethod
     def start(self) -> None:
         """Initialize resources and start listening.
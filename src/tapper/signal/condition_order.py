@@ -0,0 +1,121 @@
+"""
+Learns how expensive each kind of trigger condition is, and how often it rejects,
+to check cheap and selective conditions first.
+
+Conditions of a Tap or Group are all required, so the order doesn't change
+whether it matches, only how many conditions are called before the answer is known.
+"""
+import math
+import threading
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from tapper.model.tap_tree_shadow import STapGeneric
+from tapper.model.types_ import TriggerConditionFn
+
+
+def condition_kind(fn: TriggerConditionFn) -> str:
+    """Keyword name set by TreeTransformer, like "win_exec"."""
+    return getattr(fn, "__name__", type(fn).__name__)
+
+
+@dataclass
+class ConditionStats:
+    """Measurements of one kind of condition."""
+
+    evaluated: int = 0
+    rejected: int = 0
+    """Times the result was falsy."""
+    total_ns: int = 0
+
+    @property
+    def avg_ns(self) -> float:
+        return self.total_ns / self.evaluated if self.evaluated else 0
+
+    @property
+    def reject_rate(self) -> float:
+        return self.rejected / self.evaluated if self.evaluated else 0
+
+    @property
+    def rank(self) -> float:
+        """Expected cost to get one rejection. Lower goes first.
+        Not yet measured conditions go first, to get measured."""
+        if not self.evaluated:
+            return 0
+        if not self.rejected:
+            return math.inf
+        return self.avg_ns / self.reject_rate
+
+
+@dataclass
+class ConditionOrdering:
+    """Stats per condition kind, and reordering of conditions of Taps and Groups by them."""
+
+    reorder_every: int = 1000
+    """Reorder after this many signals."""
+    stats: dict[str, ConditionStats] = field(default_factory=dict)
+    signals: int = 0
+    """Since last reorder."""
+    _nodes: list[STapGeneric] = field(default_factory=list, repr=False)
+    """To reorder next."""
+    _due: threading.Event = field(
+        default_factory=threading.Event, repr=False, compare=False
+    )
+    _stop_event: threading.Event = field(
+        default_factory=threading.Event, repr=False, compare=False
+    )
+
+    def record(self, fn: TriggerConditionFn, ns: int, result: Any) -> None:
+        kind = condition_kind(fn)
+        if (stats := self.stats.get(kind)) is None:
+            stats = self.stats[kind] = ConditionStats()
+        stats.evaluated += 1
+        stats.total_ns += ns
+        if not result:
+            stats.rejected += 1
+
+    def on_signal(self, nodes: list[STapGeneric]) -> None:
+        """Counts signals, and when it's time, wakes the thread that reorders
+        nodes' conditions. Sorting is kept off the hook thread."""
+        self.signals += 1
+        if self.signals >= self.reorder_every:
+            self.signals = 0
+            self._nodes = nodes
+            self._due.set()
+
+    def start(self) -> None:
+        """Starts the thread that reorders conditions."""
+        self._stop_event.clear()
+        threading.Thread(
+            target=self._reorder_loop, name="tapper-condition-order", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._due.set()
+
+    def _reorder_loop(self) -> None:
+        while self._due.wait() and not self._stop_event.is_set():
+            self._due.clear()
+            self.reorder(self._nodes)
+
+    def reorder(self, nodes: list[STapGeneric]) -> None:
+        """Sorts conditions of each node by rank. Stable, so ties keep the declared order.
+        Lists are replaced, not mutated, as other threads may be iterating them."""
+        for node in nodes:
+            node.trigger_conditions = sorted(node.trigger_conditions, key=self.rank)
+
+    def rank(self, fn: TriggerConditionFn) -> float:
+        if (stats := self.stats.get(condition_kind(fn))) is None:
+            return 0
+        return stats.rank
+
+    def report(self) -> str:
+        """Human-readable stats, in the order conditions are checked."""
+        lines = [
+            f"{kind}: {s.evaluated} calls, avg {s.avg_ns / 1000:.1f}us, "
+            f"rejects {s.reject_rate:.0%}"
+            for kind, s in sorted(self.stats.items(), key=lambda ks: ks[1].rank)
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,68 @@
+"""
+Flat lookup of Taps by signal, compiled from a Shadow Tree.
+
+Instead of walking the whole tree for every signal, SignalProcessor only
+looks at Taps that have the signal's symbol and direction as main key.
+"""
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Callable
+from typing import Sequence
+
+from tapper.model.constants import KeyDirBool
+from tapper.model.tap_tree_shadow import SGroup
+from tapper.model.tap_tree_shadow import STap
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """Tap that may trigger on a signal, with groups that must be active for it."""
+
+    tap: STap
+    ancestors: tuple[SGroup, ...]
+    """Groups from the indexed group down to the Tap's parent, outermost first."""
+
+
+@dataclass
+class DispatchIndex:
+    """(symbol, direction) to Taps, in the order the recursive walk would try them."""
+
+    candidates: dict[tuple[str, KeyDirBool], list[Candidate]] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def compile(cls, group: SGroup) -> "DispatchIndex":
+        index = DispatchIndex()
+        index._add_group(group, ())
+        return index
+
+    def _add_group(self, group: SGroup, ancestors: tuple[SGroup, ...]) -> None:
+        ancestors = (*ancestors, group)
+        for child in reversed(group.children):
+            if isinstance(child, SGroup):
+                self._add_group(child, ancestors)
+            elif isinstance(child, STap):
+                main = child.trigger.main
+                candidate = Candidate(child, ancestors)
+                for symbol in dict.fromkeys(main.symbols):
+                    self.candidates.setdefault((symbol, main.direction), []).append(
+                        candidate
+                    )
+            else:
+                raise ValueError(f"FATAL TYPE MISMATCH: {type(child) = }")
+
+    def filter(self, predicate: Callable[[Candidate], bool]) -> "DispatchIndex":
+        """New index, with only the candidates that satisfy predicate."""
+        index = DispatchIndex()
+        for key, candidates in self.candidates.items():
+            if kept := [c for c in candidates if predicate(c)]:
+                index.candidates[key] = kept
+        return index
+
+    def get(self, symbol: str, direction: KeyDirBool) -> Sequence[Candidate]:
+        """Taps that have this main key, highest priority first."""
+        return self.candidates.get((symbol, direction), ())
+
+    def __len__(self) -> int:
+        return sum(len(c) for c in self.candidates.values())
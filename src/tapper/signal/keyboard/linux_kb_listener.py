@@ -7,6 +7,7 @@ from tapper.feedback.logger import LogExceptions
 from tapper.model import constants
 from tapper.model import keyboard
 from tapper.model.constants import EvdevKeyDir
+from tapper.model.constants import EvdevRepeat
 from tapper.model.constants import EvdevReverseKeyDir
 from tapper.model.constants import KeyDirBool
 from tapper.model.constants import ListenerResult
@@ -49,7 +50,10 @@ class LinuxKeyboardSignalListener(KeyboardSignalListener):
             if event.type == evdev.ecodes.EV_KEY:
                 try:
                     symbol = keyboard.linux_evdev_code_to_symbol_map[event.code]
-                    result_on = self.on_signal((symbol, EvdevKeyDir[event.value]))
+                    if event.value == EvdevRepeat:
+                        result_on = self.on_repeat(symbol)
+                    else:
+                        result_on = self.on_signal((symbol, EvdevKeyDir[event.value]))
                     if result_on == ListenerResult.PROPAGATE:
                         self.virtual_kb.write_event(event)
                 except KeyError:
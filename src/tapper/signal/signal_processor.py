@@ -1,4 +1,5 @@
 import time
+from typing import Callable
 
 from tapper.action import wrapper
 from tapper.action.runner import ActionRunner
@@ -7,10 +8,21 @@ from tapper.model.constants import KeyDirBool
 from tapper.model.constants import ListenerResult
 from tapper.model.tap_tree_shadow import SGroup
 from tapper.model.tap_tree_shadow import STap
+from tapper.model.tap_tree_shadow import STapGeneric
 from tapper.model.types_ import Signal
+from tapper.model.types_ import TriggerConditionFn
+from tapper.signal.condition_order import ConditionOrdering
+from tapper.signal.dispatch_index import Candidate
+from tapper.signal.dispatch_index import DispatchIndex
 from tapper.state import keeper
 
 
+def triggers_on_repeat(candidate: Candidate) -> bool:
+    """Key press Taps with trigger_on_repeat, or held time: "a 1s" needs repeats."""
+    main = candidate.tap.trigger.main
+    return bool(main.direction and (candidate.tap.trigger_on_repeat or main.time))
+
+
 class SignalProcessor:
     """Highest-level component for signal processing."""
 
@@ -18,6 +30,23 @@ class SignalProcessor:
     control: SGroup
     state_keeper: keeper.Pressed
     runner: ActionRunner
+    _indexes: tuple[DispatchIndex, ...] | None = None
+    """Root and control indexes, compiled from the trees, see `compile`,
+    then the same with only Taps that trigger on autorepeat.
+    One attribute, so all are replaced at once."""
+    _down_results: dict[str, ListenerResult]
+    """Result of the last key press of each symbol. Autorepeat of it gets the same."""
+    conditions_evaluated: int = 0
+    """Trigger conditions called, since start."""
+    conditions_saved: int = 0
+    """Trigger conditions not called, because the result for the signal was already known.
+    Relies on TreeTransformer sharing conditions with the same name and value."""
+    condition_ordering: ConditionOrdering | None = None
+    """If set, measures conditions and reorders them, cheap and selective first."""
+    _multi_condition_nodes: list[STapGeneric]
+    """Taps and Groups with more than one condition: only these can be reordered."""
+    get_time_fn: Callable[[], float] = time.perf_counter
+    """Time of signals, for throttle, debounce and held keys. Same clock as state_keeper."""
 
     def __init__(
         self,
@@ -30,6 +59,46 @@ class SignalProcessor:
         self.control = control
         self.state_keeper = state_keeper
         self.runner = runner
+        self._down_results = {}
+
+    @property
+    def root_index(self) -> DispatchIndex | None:
+        return self._indexes[0] if self._indexes else None
+
+    @property
+    def control_index(self) -> DispatchIndex | None:
+        return self._indexes[1] if self._indexes else None
+
+    def compile(self) -> None:
+        """Build dispatch indexes from root and control. Call if the trees change."""
+        self.swap(self.root, self.control)
+
+    def swap(self, root: SGroup, control: SGroup) -> None:
+        """Replace the trees. Indexes are compiled first, then replaced at once:
+        a signal processed meanwhile in another thread uses either old trees or new ones.
+        Then nodes reused from the old trees get their parents in the new ones."""
+        root_index = DispatchIndex.compile(root)
+        control_index = DispatchIndex.compile(control)
+        nodes: dict[int, STapGeneric] = {}
+        for index in [root_index, control_index]:
+            for candidates in index.candidates.values():
+                for candidate in candidates:
+                    tap = candidate.tap
+                    tap.aux_masks = self.state_keeper.compile_aux(tap.trigger.aux)
+                    for node in [*candidate.ancestors, tap]:
+                        nodes[id(node)] = node
+        self._multi_condition_nodes = [
+            node for node in nodes.values() if len(node.trigger_conditions) > 1
+        ]
+        self.root, self.control = root, control
+        self._indexes = (
+            root_index,
+            control_index,
+            root_index.filter(triggers_on_repeat),
+            control_index.filter(triggers_on_repeat),
+        )
+        root.relink_parents()
+        control.relink_parents()
 
     @LogExceptions()
     def on_signal(self, signal: Signal) -> ListenerResult:
@@ -38,60 +107,167 @@ class SignalProcessor:
         Only real signals are expected.
         """
         symbol, direction = signal
-        state = self.state_keeper.get_state(time.perf_counter())
-        if tap := self.match(self.control, symbol, direction, state):
-            self.runner.run_control(wrapper.wrapped_action(tap))
+        if self._indexes is None:
+            self.compile()
+        root_index, control_index, _, _ = self._indexes  # type: ignore
+        result = self.dispatch(root_index, control_index, symbol, direction)
+        if result is None:
+            result = ListenerResult.PROPAGATE
+        if direction:
+            self._down_results[symbol] = result
+        return result
+
+    @LogExceptions()
+    def on_repeat(self, symbol: str) -> ListenerResult:
+        """
+        Autorepeat of a held key, from listeners that tell it apart from a key press.
+        Only Taps that trigger on repeat are matched, see `triggers_on_repeat`.
+        If none triggers, result is the same as for the key press.
+        """
+        if self._indexes is None:
+            self.compile()
+        _, _, root_repeat, control_repeat = self._indexes  # type: ignore
+        down = KeyDirBool.DOWN
+        if root_repeat.get(symbol, down) or control_repeat.get(symbol, down):
+            result = self.dispatch(root_repeat, control_repeat, symbol, down)
+            if result is not None:
+                return result
+        return self._down_results.get(symbol, ListenerResult.PROPAGATE)
+
+    def dispatch(
+        self,
+        root_index: DispatchIndex,
+        control_index: DispatchIndex,
+        symbol: str,
+        direction: KeyDirBool,
+    ) -> ListenerResult | None:
+        """Run the action of the first Tap that matches, control first.
+        If its throttle, debounce or ignore_autorepeat doesn't allow it,
+        the action is skipped, but the signal is still suppressed as the Tap says.
+
+        :return: Whether to suppress the signal, or None if no Tap matched.
+        """
+        if self.condition_ordering is not None:
+            self.condition_ordering.on_signal(self._multi_condition_nodes)
+        now = self.get_time_fn()
+        memo: dict[int, bool] = {}
+        if tap := self.match_index(control_index, symbol, direction, now, memo):
+            if self.timing_allows(tap, symbol, direction, now):
+                tap.triggered_at = now
+                self.runner.run_control(wrapper.wrapped_action(tap))
             return tap.suppress_trigger
-        elif tap := self.match(self.root, symbol, direction, state):
-            self.runner.run(wrapper.wrapped_action(tap), tap.executor)
+        elif tap := self.match_index(root_index, symbol, direction, now, memo):
+            if self.timing_allows(tap, symbol, direction, now):
+                tap.triggered_at = now
+                self.runner.run(wrapper.wrapped_action(tap), tap.executor, tap)
             return tap.suppress_trigger
-        else:
-            return ListenerResult.PROPAGATE
+        return None
+
+    def match_index(
+        self,
+        index: DispatchIndex,
+        symbol: str,
+        direction: KeyDirBool,
+        now: float,
+        memo: dict[int, bool],
+    ) -> STap | None:
+        """Find first Tap that matches, among the indexed candidates.
+        Picks the same Tap as `match`, and evaluates group conditions in the same order.
+
+        :param memo: results of conditions evaluated for this signal.
+        """
+        group_active: dict[int, bool] = {}
+        for candidate in index.get(symbol, direction):
+            tap = candidate.tap
+            for group in candidate.ancestors:
+                if (active := group_active.get(id(group))) is None:
+                    active = self.conditions_met(group.trigger_conditions, memo)
+                    group_active[id(group)] = active
+                if not active:
+                    break
+            else:
+                if self.tap_matches(tap, symbol, direction, now, memo):
+                    return tap
+        return None
 
     def match(
-        self, group: SGroup, symbol: str, direction: KeyDirBool, state: dict[str, float]
+        self,
+        group: SGroup,
+        symbol: str,
+        direction: KeyDirBool,
+        now: float,
+        memo: dict[int, bool],
     ) -> STap | None:
-        """Find first Tap that matches, recursive."""
-        if symbol not in group.get_main_triggers(direction):  # type: ignore
+        """Find first Tap that matches, recursive. Reference for `match_index`."""
+        if symbol not in group.get_main_triggers(direction):
             return None
-        if not all(bool(fn()) for fn in group.trigger_conditions):
+        if not self.conditions_met(group.trigger_conditions, memo):
             return None
 
         for child in reversed(group.children):
             if isinstance(child, SGroup):
-                if found := self.match(child, symbol, direction, state):
+                if found := self.match(child, symbol, direction, now, memo):
                     return found
             elif isinstance(child, STap):
-                if self.tap_matches(child, symbol, direction, state):
+                if self.tap_matches(child, symbol, direction, now, memo):
                     return child
             else:
                 raise ValueError(f"FATAL TYPE MISMATCH: {type(child) = }")
         return None
 
+    def timing_allows(
+        self, tap: STap, symbol: str, direction: KeyDirBool, now: float
+    ) -> bool:
+        """Check throttle, debounce and ignore_autorepeat of a Tap that matched.
+        The signal counts for debounce."""
+        if tap.ignore_autorepeat and direction and self.state_keeper.is_pressed(symbol):
+            return False  # pressed before this signal, state is updated after
+        if tap.debounce:
+            previous, tap.signal_at = tap.signal_at, now
+            if now - previous < tap.debounce:
+                return False
+        return now - tap.triggered_at >= tap.throttle
+
     def tap_matches(
-        self, tap: STap, symbol: str, direction: KeyDirBool, state: dict[str, float]
+        self,
+        tap: STap,
+        symbol: str,
+        direction: KeyDirBool,
+        now: float,
+        memo: dict[int, bool],
     ) -> bool:
-        """Check if Tap matches all conditions."""
+        """Check if Tap matches all conditions. Expects aux_masks to be compiled."""
         if symbol not in tap.get_main_triggers(direction):
             return False
-        if len(state) < len(tap.trigger.aux):
+        aux = tap.aux_masks
+        if aux.count and not self.state_keeper.aux_pressed(aux, now):  # type: ignore
             return False
-        if not all(bool(fn()) for fn in tap.trigger_conditions):
+        if not self.conditions_met(tap.trigger_conditions, memo):
             return False
 
-        for aux in tap.trigger.aux:
-            pressed = False
-            for aux_symbol in aux.symbols:
-                if aux_symbol in state and aux.time <= state[aux_symbol]:
-                    pressed = True
-                    break
-            if not pressed:
-                return False
-
         if tap.trigger.main.time:
-            if symbol in state and tap.trigger.main.time < state[symbol]:
-                return True
+            held = self.state_keeper.held_for(symbol, now)
+            return held is not None and tap.trigger.main.time < held
+
+        return True
+
+    def conditions_met(
+        self, conditions: list[TriggerConditionFn], memo: dict[int, bool]
+    ) -> bool:
+        """All conditions are truthy. Each condition is called at most once per memo."""
+        ordering = self.condition_ordering
+        for fn in conditions:
+            if (result := memo.get(id(fn))) is None:
+                if ordering is None:
+                    result = bool(fn())
+                else:
+                    start = time.perf_counter_ns()
+                    result = bool(fn())
+                    ordering.record(fn, time.perf_counter_ns() - start, result)
+                memo[id(fn)] = result
+                self.conditions_evaluated += 1
             else:
+                self.conditions_saved += 1
+            if not result:
                 return False
-
         return True
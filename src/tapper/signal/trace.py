@@ -0,0 +1,224 @@
+"""
+Capture of signals that reach ListenerWrapper, and replay of them into a SignalProcessor.
+
+Trace file is append-only, struct-packed:
+    header, then records, each starting with a kind byte.
+    SYMBOL record gives a symbol name an id, the first time the symbol is seen.
+    SIGNAL record is (symbol id, flags, perf_counter time).
+
+Replay allows reproducing slowdowns and regression-testing tap trees offline, without devices.
+"""
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import BinaryIO
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from tapper.feedback.latency import LatencyHistogram
+from tapper.feedback.latency import StageStats
+from tapper.model.constants import KeyDirBool
+from tapper.model.types_ import OnRepeatFn
+from tapper.model.types_ import OnSignalFn
+from tapper.model.types_ import Signal
+from tapper.state import keeper
+
+MAGIC = b"TAPTRC\x01\n"
+
+SYMBOL = 0
+SIGNAL = 1
+symbol_struct = struct.Struct("<BHB")
+"""kind, symbol id, name length; followed by utf-8 name."""
+signal_struct = struct.Struct("<BHBd")
+"""kind, symbol id, flags, time."""
+
+FLAG_DOWN = 1
+FLAG_EMULATED = 2
+FLAG_REPEAT = 4
+
+
+@dataclass(frozen=True)
+class TracedSignal:
+    symbol: str
+    direction: KeyDirBool
+    time: float
+    """time.perf_counter at capture."""
+    emulated: bool = False
+    repeat: bool = False
+    """Autorepeat of a held key, that went to on_repeat."""
+
+    @property
+    def signal(self) -> Signal:
+        return self.symbol, self.direction
+
+
+class TraceWriter:
+    """Appends signals to a trace file. Safe to call from several listener threads."""
+
+    path: str
+    _file: BinaryIO
+    _symbol_ids: dict[str, int]
+    _lock: threading.Lock
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._symbol_ids = {}
+        if os.path.exists(path) and os.path.getsize(path):
+            for s in read_trace(path):
+                self._symbol_ids.setdefault(s.symbol, len(self._symbol_ids))
+            self._file = open(path, "ab")
+        else:
+            self._file = open(path, "wb")
+            self._file.write(MAGIC)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        signal: Signal,
+        at: Optional[float] = None,
+        emulated: bool = False,
+        repeat: bool = False,
+    ) -> None:
+        at = time.perf_counter() if at is None else at
+        symbol, direction = signal
+        flags = (
+            (FLAG_DOWN if direction == KeyDirBool.DOWN else 0)
+            | (FLAG_EMULATED if emulated else 0)
+            | (FLAG_REPEAT if repeat else 0)
+        )
+        with self._lock:
+            if (symbol_id := self._symbol_ids.get(symbol)) is None:
+                symbol_id = self._symbol_ids[symbol] = len(self._symbol_ids)
+                name = symbol.encode()
+                self._file.write(symbol_struct.pack(SYMBOL, symbol_id, len(name)))
+                self._file.write(name)
+            self._file.write(signal_struct.pack(SIGNAL, symbol_id, flags, at))
+
+    def flush(self) -> None:
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+def read_trace(path: str) -> Iterator[TracedSignal]:
+    """Signals in the order they were recorded. Truncated last record is ignored."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a tapper signal trace: {path}")
+        data = file.read()
+    symbols: dict[int, str] = {}
+    pos = 0
+    while pos < len(data):
+        kind = data[pos]
+        if kind == SYMBOL:
+            if pos + symbol_struct.size > len(data):
+                return
+            _, symbol_id, length = symbol_struct.unpack_from(data, pos)
+            pos += symbol_struct.size
+            if pos + length > len(data):
+                return
+            symbols[symbol_id] = data[pos : pos + length].decode()
+            pos += length
+        elif kind == SIGNAL:
+            if pos + signal_struct.size > len(data):
+                return
+            _, symbol_id, flags, at = signal_struct.unpack_from(data, pos)
+            pos += signal_struct.size
+            yield TracedSignal(
+                symbols[symbol_id],
+                KeyDirBool.DOWN if flags & FLAG_DOWN else KeyDirBool.UP,
+                at,
+                bool(flags & FLAG_EMULATED),
+                bool(flags & FLAG_REPEAT),
+            )
+        else:
+            raise ValueError(f"Corrupt signal trace {path} at byte {pos}")
+
+
+@dataclass
+class ReplayReport:
+    signals: int = 0
+    """Real signals, sent to on_signal."""
+    emulated: int = 0
+    """Emulated signals, only sent to state keeper."""
+    repeats: int = 0
+    """Autorepeats, sent to on_repeat."""
+    elapsed: float = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    """Of on_signal and on_repeat, per signal."""
+
+    @property
+    def throughput(self) -> float:
+        """Signals per second."""
+        return self.signals / self.elapsed if self.elapsed else 0
+
+    def latency_stats(self) -> StageStats:
+        h = self.latency
+        return StageStats(h.count, h.percentile(50), h.percentile(99), h.max_ns)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.signals} signals in {self.elapsed:.3f}s, "
+            f"{self.throughput:.0f} signals/s, latency {self.latency_stats()}"
+        )
+
+
+def replay(
+    signals: Iterable[TracedSignal],
+    on_signal: OnSignalFn,
+    state_keeper: keeper.Pressed,
+    speed: Optional[float] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    on_repeat: Optional[OnRepeatFn] = None,
+) -> ReplayReport:
+    """Feeds signals the way ListenerWrapper does.
+
+    :param on_repeat: receives recorded autorepeats, which don't change state.
+        If None, autorepeats are handled as key presses by on_signal.
+
+    :param speed: 1 for real-time, 2 for twice as fast, etc.
+        None for as fast as possible.
+        Taps with held-for-time triggers only behave as recorded in real time.
+    """
+    report = ReplayReport()
+    clock = time.perf_counter_ns
+    start = time.perf_counter()
+    first: Optional[float] = None
+    for traced in signals:
+        if speed:
+            if first is None:
+                first = traced.time
+            due = start + (traced.time - first) / speed
+            if (delay := due - time.perf_counter()) > 0:
+                sleep(delay)
+        signal = traced.signal
+        if traced.emulated:
+            report.emulated += 1
+        elif traced.repeat and on_repeat is not None:
+            signal_start = clock()
+            on_repeat(traced.symbol)
+            report.latency.add(clock() - signal_start)
+            report.repeats += 1
+            continue
+        else:
+            signal_start = clock()
+            on_signal(signal)
+            report.latency.add(clock() - signal_start)
+            report.signals += 1
+        state_keeper.key_event(signal)
+    report.elapsed = time.perf_counter() - start
+    return report
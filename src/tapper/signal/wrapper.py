@@ -1,9 +1,12 @@
 from functools import partial
 
 from tapper.model import constants
+from tapper.model.constants import KeyDirBool
+from tapper.model.types_ import OnRepeatFn
 from tapper.model.types_ import OnSignalFn
 from tapper.model.types_ import Signal
 from tapper.signal.base_listener import SignalListener
+from tapper.signal.trace import TraceWriter
 from tapper.state import keeper
 from tapper.util import event
 
@@ -15,31 +18,52 @@ class ListenerWrapper:
     on_signal: OnSignalFn
     """External action to do on signal, if it's not emulated."""
 
+    on_repeat: OnRepeatFn | None
+    """External action to do on autorepeat of a held key.
+    Repeats are not published and don't change state.
+    If None, repeats are handled as key presses by on_signal."""
+
     emul_keeper: keeper.Emul | None
     """Dependency injected, not a special instance."""
 
     state_keeper: keeper.Pressed
     """Dependency injected, not a special instance."""
 
+    trace: TraceWriter | None = None
+    """If set, every signal is recorded into it, see tapper.signal.trace."""
+
     def __init__(
         self,
         on_signal: OnSignalFn,
         emul_keeper: keeper.Emul | None,
         state_keeper: keeper.Pressed,
+        on_repeat: OnRepeatFn | None = None,
     ) -> None:
         self.on_signal = on_signal  # type: ignore
         self.emul_keeper = emul_keeper
         self.state_keeper = state_keeper
+        self.on_repeat = on_repeat
 
     def wrap(self, listener: SignalListener) -> SignalListener:
         listener.on_signal = partial(self._on_signal_wrap, topic=listener.name)  # type: ignore
+        if self.on_repeat is not None:
+            listener.on_repeat = self._on_repeat_wrap  # type: ignore
         return listener
 
+    def _on_repeat_wrap(self, symbol: str) -> constants.ListenerResult:
+        if self.trace:
+            self.trace.record((symbol, KeyDirBool.DOWN), repeat=True)
+        return self.on_repeat(symbol)  # type: ignore
+
     def _on_signal_wrap(self, signal: Signal, topic: str) -> constants.ListenerResult:
         # linux doesn't need emul as it uses virtual devices
         if self.emul_keeper and self.emul_keeper.is_emulated(signal):
+            if self.trace:
+                self.trace.record(signal, emulated=True)
             self.state_keeper.key_event(signal)
             return constants.ListenerResult.PROPAGATE
+        if self.trace:
+            self.trace.record(signal)
         result = self.on_signal(signal)  # type: ignore
         event.publish(topic, signal)
         self.state_keeper.key_event(signal)
@@ -1,9 +1,13 @@
+import threading
 import time
 from dataclasses import dataclass
 from dataclasses import field
 from typing import Any
+from typing import Callable
 
 from tapper.model import constants
+from tapper.model.trigger import AuxiliaryKey
+from tapper.model.trigger import AuxMasks
 from tapper.model.types_ import Signal
 
 
@@ -31,12 +35,32 @@ class Emul:
 
 @dataclass
 class Pressed:
-    """Keeps track of the currently pressed buttons."""
+    """Keeps track of the currently pressed buttons.
+
+    Each registered symbol has an id - a bit in `pressed_mask`,
+    and an index in `pressed_at` to keep the time of press.
+    Listeners may run in different threads, so changes of the mask take a lock.
+    Reads don't: the mask is replaced as a whole.
+    """
 
     registered_symbols: list[str] = field(default_factory=list)
     """Only keys that can be pressed down. No aliases."""
-    pressed_keys: dict[str, float] = field(default_factory=dict)
-    """Keys, and pressed at time."""
+    symbol_ids: dict[str, int] = field(init=False)
+    pressed_mask: int = field(init=False, default=0)
+    """Bit is set when symbol with this id is pressed."""
+    pressed_at: list[float] = field(init=False)
+    """By symbol id. Only valid while the symbol is pressed."""
+    get_time_fn: Callable[[], float] = field(default=time.perf_counter, repr=False)
+    """Time of press, when not given."""
+    _lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.symbol_ids = {
+            symbol: i for i, symbol in enumerate(dict.fromkeys(self.registered_symbols))
+        }
+        self.pressed_at = [0.0] * len(self.symbol_ids)
 
     def key_event(self, on_signal: Signal) -> None:
         symbol, direction = on_signal
@@ -45,15 +69,37 @@ class Pressed:
         else:
             self.key_released(symbol)
 
-    def key_pressed(self, symbol: str) -> None:
-        """Key has been pressed."""
-        if symbol in self.registered_symbols and symbol not in self.pressed_keys:
-            self.pressed_keys[symbol] = time.perf_counter()
+    def key_pressed(self, symbol: str, at: float | None = None) -> None:
+        """Key has been pressed.
+        :param at: time of press, by default now.
+        """
+        if (id_ := self.symbol_ids.get(symbol)) is None:
+            return
+        bit = 1 << id_
+        with self._lock:
+            if not self.pressed_mask & bit:
+                self.pressed_at[id_] = self.get_time_fn() if at is None else at
+                self.pressed_mask |= bit
 
     def key_released(self, symbol: str) -> None:
         """Key has been released."""
-        if symbol in self.pressed_keys:
-            del self.pressed_keys[symbol]
+        if (id_ := self.symbol_ids.get(symbol)) is not None:
+            with self._lock:
+                self.pressed_mask &= ~(1 << id_)
+
+    def is_pressed(self, symbol: str) -> bool:
+        if (id_ := self.symbol_ids.get(symbol)) is None:
+            return False
+        return bool(self.pressed_mask >> id_ & 1)
+
+    @property
+    def pressed_keys(self) -> dict[str, float]:
+        """Keys, and pressed at time."""
+        return {
+            s: self.pressed_at[i]
+            for s, i in self.symbol_ids.items()
+            if self.pressed_mask >> i & 1
+        }
 
     def get_state(self, current_time: float) -> dict[str, float]:
         """Keys currently pressed and for how long."""
@@ -61,3 +107,54 @@ class Pressed:
             s: current_time - pressed_at
             for (s, pressed_at) in self.pressed_keys.items()
         }
+
+    def mask_of(self, symbols: list[str]) -> int:
+        """Bits of the symbols. Unregistered symbols can't be pressed and have no bit."""
+        mask = 0
+        for symbol in symbols:
+            if (id_ := self.symbol_ids.get(symbol)) is not None:
+                mask |= 1 << id_
+        return mask
+
+    def compile_aux(self, aux: list[AuxiliaryKey]) -> AuxMasks:
+        all_of = 0
+        any_of = []
+        timed = []
+        for key in aux:
+            mask = self.mask_of(key.symbols)
+            if key.time:
+                timed.append((mask, key.time))
+            elif mask and len(key.symbols) == 1:
+                all_of |= mask
+            else:
+                any_of.append(mask)
+        return AuxMasks(all_of, tuple(any_of), tuple(timed), len(aux))
+
+    def aux_pressed(self, aux: AuxMasks, current_time: float) -> bool:
+        """Are all auxiliary keys pressed, and for long enough."""
+        mask = self.pressed_mask
+        if mask & aux.all_of != aux.all_of or mask.bit_count() < aux.count:
+            return False
+        for any_mask in aux.any_of:
+            if not mask & any_mask:
+                return False
+        for timed_mask, min_time in aux.timed:
+            if not self._held_any(mask & timed_mask, current_time, min_time):
+                return False
+        return True
+
+    def held_for(self, symbol: str, current_time: float) -> float | None:
+        """How long the key is pressed, None if it's not."""
+        if (id_ := self.symbol_ids.get(symbol)) is None:
+            return None
+        if not self.pressed_mask >> id_ & 1:
+            return None
+        return current_time - self.pressed_at[id_]
+
+    def _held_any(self, mask: int, current_time: float, min_time: float) -> bool:
+        while mask:
+            lowest = mask & -mask
+            if min_time <= current_time - self.pressed_at[lowest.bit_length() - 1]:
+                return True
+            mask ^= lowest
+        return False
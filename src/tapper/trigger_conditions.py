@@ -61,9 +61,9 @@ def window(window_c: WindowController) -> dict[str, Callable[[Any], Any]]:
     if not window_c:
         return kwargs
 
-    kwargs["win"] = window_c.active
-    kwargs["win_title"] = lambda title: window_c.active(title=title)
-    kwargs["win_exec"] = lambda ex: window_c.active(exec=ex, strict=True)
+    kwargs["win"] = window_c.active_cached
+    kwargs["win_title"] = lambda title: window_c.active_cached(title=title)
+    kwargs["win_exec"] = lambda ex: window_c.active_cached(exec=ex, strict=True)
 
     kwargs["open_win"] = window_c.is_open
     kwargs["open_win_title"] = lambda title: window_c.is_open(title=title)
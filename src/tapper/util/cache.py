@@ -1,7 +1,12 @@
 import functools
+import threading
 import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 from typing import Callable
+from typing import Generic
+from typing import TypeVar
 
 Fn = Callable[[Any], Any]
 
@@ -32,3 +37,81 @@ def lru_cache(maxsize: int = 128, typed: bool = False) -> Fn:
         return decorator(func)
 
     return decorator
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class LruCache(Generic[K, V]):
+    """Thread-safe cache, bounded by number of entries and total weight of values.
+    Least recently used entries are evicted first."""
+
+    max_entries: int
+    max_weight: int
+    """Bound of total weight_fn of values. A value heavier than this is not cached."""
+    weight_fn: Callable[[V], int]
+    """Approximates memory held by a value. Like length of a list."""
+    stats: CacheStats
+    weight: int
+    """Total weight of values now cached."""
+
+    _entries: OrderedDict[K, tuple[V, int]]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_weight: int = 1_000_000,
+        weight_fn: Callable[[V], int] = lambda value: 1,
+    ) -> None:
+        if max_entries < 1 or max_weight < 1:
+            raise ValueError("LruCache max_entries and max_weight must be at least 1.")
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.weight_fn = weight_fn
+        self.stats = CacheStats()
+        self.weight = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K, compute: Callable[[], V]) -> V:
+        """Cached value for key. If there is none, computes and caches it.
+        compute is called outside the lock, so two threads may compute the same key."""
+        with self._lock:
+            if (entry := self._entries.get(key)) is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry[0]
+            self.stats.misses += 1
+        value = compute()
+        weight = self.weight_fn(value)
+        if weight > self.max_weight:
+            return value
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = value, weight
+            self.weight += weight
+            while (
+                len(self._entries) > self.max_entries or self.weight > self.max_weight
+            ):
+                _, (_, evicted_weight) = self._entries.popitem(last=False)
+                self.weight -= evicted_weight
+                self.stats.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,92 @@
+"""
+Time source of tapper: sleeping, and reading time.
+
+Injected by initializer.init from config.clock. With SimulatedClock,
+sleeping returns at once and moves time forward, so long macros and repeats
+can be tested in milliseconds, with the same timing every run.
+"""
+import asyncio
+import threading
+import time
+from typing import Any
+from typing import Callable
+
+
+class Clock:
+    """Real time."""
+
+    def now(self) -> float:
+        """Seconds, like time.perf_counter: only differences are meaningful."""
+        return time.perf_counter()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+    def wait_for(
+        self,
+        condition: threading.Condition,
+        predicate: Callable[[], bool],
+        timeout: float | None,
+    ) -> bool:
+        """Same as condition.wait_for. Must be called with condition's lock held."""
+        return condition.wait_for(predicate, timeout)
+
+    async def wait_async(
+        self, future: "asyncio.Future[Any]", timeout: float | None
+    ) -> None:
+        """Waits for future to be done, or for timeout. For coroutines."""
+        await asyncio.wait([future], timeout=timeout)
+
+
+class SimulatedClock(Clock):
+    """Time that moves only when slept in.
+
+    Sleeps return at once, and move time forward by their length.
+    Meant for one thread sleeping at a time: a test of a macro, or a repeat.
+    Sleeps in several threads at once all add up to the same time.
+    """
+
+    time: float
+    resolution: float
+    """Shortest sleep. sleep(0) moves time this much, so spinning until a time ends."""
+
+    _lock: threading.Lock
+
+    def __init__(self, start: float = 0.0, resolution: float = 1e-6) -> None:
+        self.time = start
+        self.resolution = resolution
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.time += max(seconds, self.resolution)
+
+    def wait_for(
+        self,
+        condition: threading.Condition,
+        predicate: Callable[[], bool],
+        timeout: float | None,
+    ) -> bool:
+        """Sleeps for timeout, if predicate is false. Without timeout, waits in real time
+        for another thread to notify the condition."""
+        if result := predicate():
+            return result
+        if timeout is None:
+            return condition.wait_for(predicate)
+        self.sleep(timeout)
+        return predicate()
+
+    async def wait_async(
+        self, future: "asyncio.Future[Any]", timeout: float | None
+    ) -> None:
+        """Sleeps for timeout, if future is not done. Without timeout, waits in real time."""
+        if future.done():
+            return
+        if timeout is None:
+            await asyncio.wait([future])
+            return
+        self.sleep(timeout)
+        await asyncio.sleep(0)  # lets other coroutines run
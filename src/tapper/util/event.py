@@ -8,43 +8,138 @@
 
     In publisher:
         event.publish(PREDEFINED_TOPIC_NAME, message_of_any_type)
+
+    Subscribers of a topic are a tuple, replaced whole on subscribe and unsubscribe,
+    so publish reads it without a lock, from any thread.
 """
+import queue
+import threading
 from typing import Any
 from typing import Callable
 from typing import ClassVar
 from typing import Optional
 from typing import Protocol
 
+from tapper.feedback.logger import LogExceptions
+
 SubscribedFunction = Callable[[Any], Optional[bool]]
 """
 If return value is False, the function is unsubscribed.
 """
 
-_subscribers: dict[str, list[SubscribedFunction]] = dict()
+_subscribers: dict[str, tuple[SubscribedFunction, ...]] = dict()
+_lock = threading.Lock()
+"""Held to change _subscribers. Not needed to read it."""
+
+_CLOSE = object()
+"""Put in a QueuedSubscriber's queue to stop its thread."""
 
 
-def subscribe(topic: str, subscribed_function: SubscribedFunction) -> None:
+class QueuedSubscriber:
+    """
+    Delivers messages to a function in its own thread, through a bounded queue.
+    Publisher only puts a message in the queue, so a slow function doesn't delay it.
+    Messages that don't fit in the queue are dropped.
+    """
+
+    topic: str
+    function: SubscribedFunction
+    dropped: int
+    """Messages not delivered, because the queue was full."""
+
+    _queue: "queue.Queue[Any]"
+    _thread: threading.Thread
+    _dropped_lock: threading.Lock
+    _closed: bool
+
+    def __init__(self, topic: str, function: SubscribedFunction, size: int) -> None:
+        if size < 1:
+            raise ValueError("QueuedSubscriber size must be at least 1.")
+        self.topic = topic
+        self.function = function
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=size)
+        self._dropped_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._drain, name=f"tapper-event-{topic}", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message: Any) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def close(self) -> None:
+        """Stops the thread, after it delivers messages already in the queue."""
+        if threading.current_thread() is self._thread:
+            self._closed = True  # function unsubscribed itself
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def _drain(self) -> None:
+        deliver = LogExceptions()(self.function)
+        while not self._closed and (message := self._queue.get()) is not _CLOSE:
+            if deliver(message) is False:
+                unsubscribe(self.topic, self)
+
+    def __repr__(self) -> str:
+        return f"QueuedSubscriber({self.function!r}, dropped={self.dropped})"
+
+
+def _matches(subscriber: SubscribedFunction, function: SubscribedFunction) -> bool:
+    return subscriber == function or (
+        isinstance(subscriber, QueuedSubscriber) and subscriber.function == function
+    )
+
+
+def subscribe(
+    topic: str, subscribed_function: SubscribedFunction, queue_size: int | None = None
+) -> SubscribedFunction:
     """Subscribes a function to messages from a topic.
 
     :param topic: predefined string
     :param subscribed_function: function that will receive messages.
         It has to accept one parameter, and should be compatible
         with publisher's message' data type.
+    :param queue_size: If set, the function receives messages in its own thread,
+        through a queue of this size. For slow subscribers like recorders and loggers,
+        so they don't delay signal processing. See `QueuedSubscriber`.
+    :return: What is subscribed: the function, or its QueuedSubscriber.
     """
-    if topic not in _subscribers:
-        _subscribers[topic] = []
-    if subscribed_function not in _subscribers[topic]:
-        _subscribers[topic].append(subscribed_function)
+    with _lock:
+        subscribers = _subscribers.get(topic, ())
+        for subscriber in subscribers:
+            if _matches(subscriber, subscribed_function):
+                return subscriber
+        if queue_size is not None:
+            subscribed_function = QueuedSubscriber(
+                topic, subscribed_function, queue_size
+            )
+        _subscribers[topic] = (*subscribers, subscribed_function)
+    return subscribed_function
 
 
 def unsubscribe(topic: str, subscribed_function: SubscribedFunction) -> None:
     """Unsubscribes a function to stop receiving messages from a topic.
+    If it was subscribed with a queue, returns after messages in the queue are delivered.
 
     :param topic: same as subscribed.
     :param subscribed_function: the same function that was subscribed.
     """
-    if subscribed_function in _subscribers[topic]:
-        _subscribers[topic].remove(subscribed_function)
+    with _lock:
+        subscribers = _subscribers.get(topic, ())
+        removed = [s for s in subscribers if _matches(s, subscribed_function)]
+        if not removed:
+            return
+        _subscribers[topic] = tuple(s for s in subscribers if s not in removed)
+    for subscriber in removed:
+        if isinstance(subscriber, QueuedSubscriber):
+            subscriber.close()
 
 
 def publish(topic: str, message: Any) -> None:
@@ -54,9 +149,7 @@ def publish(topic: str, message: Any) -> None:
     :param message: Any data type, dataclass of this
         should in a separate module to decouple from subscribers.
     """
-    if topic not in _subscribers:
-        return
-    for subscribed_function in _subscribers[topic]:
+    for subscribed_function in _subscribers.get(topic, ()):
         result = subscribed_function(message)
         if result is False:
             unsubscribe(topic, subscribed_function)
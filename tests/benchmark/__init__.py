@@ -0,0 +1 @@
+"""Performance scripts, not collected by pytest. See each module's doc for how to run."""
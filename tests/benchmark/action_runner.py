@@ -0,0 +1,87 @@
+"""
+Stress of ActionRunnerImpl.run from several producer threads, like evdev listeners
+of several keyboards. Compares the in-flight counter with rebuilding the list
+of running futures on each call, as it used to be.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/action_runner.py
+"""
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from tapper.action.runner import ActionRunnerImpl
+from tapper.action.runner import ExecutorConfig
+from tapper.action.runner import QueuePolicy
+from tapper.model import types_
+
+PRODUCERS = [1, 2, 4, 8]
+RUNS_PER_PRODUCER = 20000
+THREADS = 4
+ACTION_S = 0.0005
+"""Actions are this long, so most runs find the executor busy."""
+
+
+class PruningRunner:
+    """The old admission: prune finished futures, compare the length with threads."""
+
+    def __init__(self, threads: int) -> None:
+        self.threads = threads
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.runnables: list[Future[Any]] = []
+        self.lock = threading.Lock()
+
+    def run(self, fn: types_.Action) -> None:
+        with self.lock:
+            self.runnables = [r for r in self.runnables if not r.done()]
+            if len(self.runnables) < self.threads:
+                self.runnables.append(self.executor.submit(fn))
+
+
+def stress(run: types_.Action, producers: int) -> float:
+    """:return: ns per run call, over all producers."""
+
+    def produce() -> None:
+        for _ in range(RUNS_PER_PRODUCER):
+            run()
+
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = time.perf_counter_ns()
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    return (time.perf_counter_ns() - start) / (producers * RUNS_PER_PRODUCER)
+
+
+def main() -> None:
+    def action() -> None:
+        time.sleep(ACTION_S)
+
+    print(
+        f"{'producers':>9} {'pruning ns':>11} {'drop ns':>8} {'fifo ns':>8}"
+        f" {'accepted':>9} {'rejected':>9}"
+    )
+    for producers in PRODUCERS:
+        pruning = PruningRunner(THREADS)
+        pruning_ns = stress(lambda: pruning.run(action), producers)
+
+        drop = ActionRunnerImpl([THREADS])
+        drop_ns = stress(lambda: drop.run(action), producers)
+
+        fifo = ActionRunnerImpl([ExecutorConfig(THREADS, QueuePolicy.FIFO, 64)])
+        fifo_ns = stress(lambda: fifo.run(action), producers)
+
+        while fifo.stats[0].queue_depth:  # shutdown would leave them unscheduled
+            time.sleep(ACTION_S)
+        stats = drop.stats[0]
+        print(
+            f"{producers:>9} {pruning_ns:>11.0f} {drop_ns:>8.0f} {fifo_ns:>8.0f}"
+            f" {stats.accepted:>9} {stats.rejected:>9}"
+        )
+        for executor in [pruning.executor, *drop.executors, *fifo.executors]:
+            executor.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
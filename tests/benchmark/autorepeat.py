@@ -0,0 +1,83 @@
+"""
+CPU spent on autorepeat while a key is held, as evdev sends it: about 30 repeats/s.
+Compares repeats handled as key presses, as they used to be, with the repeat path
+that reuses the key press result.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/autorepeat.py
+"""
+import time
+from typing import Callable
+
+from benchmark.synthetic import kw_conditions
+from benchmark.synthetic import make_tree
+from benchmark.synthetic import TreeSpec
+from benchmark.tap_tree import CountingRunner
+from benchmark.tap_tree import PRESETS
+from tapper.boot import initializer
+from tapper.boot.tree_transformer import TreeTransformer
+from tapper.model.constants import KeyDirBool
+from tapper.model.tap_tree import Group
+from tapper.signal.signal_processor import SignalProcessor
+from tapper.signal.wrapper import ListenerWrapper
+from tapper.util import event
+from testutil_model import DummyListener
+
+REPEATS = 20000
+REPEATS_PER_S = 30
+HELD = "a"
+
+
+def make_processor(spec: TreeSpec) -> SignalProcessor:
+    transformer = TreeTransformer(
+        lambda command: None, initializer.default_trigger_parser(), kw_conditions(spec)
+    )
+    control_group = Group("control_group")
+    initializer.control_config_fill(control_group)
+    processor = SignalProcessor(
+        transformer.transform(make_tree(spec)),
+        transformer.transform(control_group),
+        initializer.default_keeper_pressed(),
+        CountingRunner(),
+    )
+    processor.compile()
+    return processor
+
+
+def cpu_ns_per_repeat(repeat: Callable[[], object]) -> float:
+    start = time.process_time_ns()
+    for _ in range(REPEATS):
+        repeat()
+    return (time.process_time_ns() - start) / REPEATS
+
+
+def main() -> None:
+    event.subscribe(DummyListener.name, lambda signal: None)  # like the tray icon
+
+    print(
+        f"{'taps':>6} {'aux':>4} {'as press ns':>12} {'repeat ns':>10}"
+        f" {'speedup':>8} {'CPU saved, ms per held minute':>30}"
+    )
+    for spec in PRESETS:
+        processor = make_processor(spec)
+        as_press = DummyListener()
+        ListenerWrapper(processor.on_signal, None, processor.state_keeper).wrap(
+            as_press
+        )
+        fast = DummyListener()
+        ListenerWrapper(
+            processor.on_signal, None, processor.state_keeper, processor.on_repeat
+        ).wrap(fast)
+
+        as_press.on_signal((HELD, KeyDirBool.DOWN))
+        old = cpu_ns_per_repeat(lambda: as_press.on_repeat(HELD))
+        new = cpu_ns_per_repeat(lambda: fast.on_repeat(HELD))
+        saved_ms = (old - new) * REPEATS_PER_S * 60 / 1e6
+        print(
+            f"{spec.taps:>6} {spec.aux:>4} {old:>12.0f} {new:>10.0f}"
+            f" {old / new:>7.1f}x {saved_ms:>30.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
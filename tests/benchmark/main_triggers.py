@@ -0,0 +1,76 @@
+"""
+Main trigger lookup in a group with hundreds of distinct triggers:
+frozenset stored on SGroup vs the list it used to be, and recursive match per signal.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/main_triggers.py
+"""
+import random
+import time
+from typing import Callable
+
+from tapper.boot import initializer
+from tapper.model.constants import KeyDirBool
+from tapper.model.tap_tree_shadow import SGroup
+from tapper.model.tap_tree_shadow import STap
+from tapper.model.trigger import MainKey
+from tapper.model.trigger import Trigger
+from tapper.signal.signal_processor import SignalProcessor
+from testutil_model import DummyActionRunner
+
+GROUP_SIZES = [100, 300, 1000]
+LOOKUPS = 20000
+
+
+def make_group(size: int) -> SGroup:
+    """Distinct made-up symbols, so every trigger is unique."""
+    group = SGroup()
+    group.trigger_conditions = []
+    for i in range(size):
+        stap = STap(Trigger(MainKey([f"key{i}"])), lambda: None, 0, None)  # type: ignore
+        stap.trigger_conditions = []
+        group.add(stap)
+    return group
+
+
+def per_lookup_ns(lookup: Callable[[str], object], symbols: list[str]) -> float:
+    start = time.perf_counter_ns()
+    for symbol in symbols:
+        lookup(symbol)
+    return (time.perf_counter_ns() - start) / len(symbols)
+
+
+def main() -> None:
+    rnd = random.Random(0)
+    down = KeyDirBool.DOWN
+    now = time.perf_counter()
+
+    print(
+        f"{'triggers':>8} {'build us':>9} {'list ns':>8} {'frozenset ns':>13} {'match ns':>9}"
+    )
+    for size in GROUP_SIZES:
+        start = time.perf_counter_ns()
+        group = make_group(size)
+        build_us = (time.perf_counter_ns() - start) / 1000
+        # half are misses, like signals of keys without taps
+        symbols = [f"key{rnd.randrange(size * 2)}" for _ in range(LOOKUPS)]
+
+        as_list = list(group.get_main_triggers(down))
+        as_set = group.get_main_triggers(down)
+        list_ns = per_lookup_ns(lambda s: s in as_list, symbols)
+        set_ns = per_lookup_ns(lambda s: s in as_set, symbols)
+
+        processor = SignalProcessor(
+            group, SGroup(), initializer.default_keeper_pressed(), DummyActionRunner()
+        )
+        processor.compile()
+        match_ns = per_lookup_ns(
+            lambda s: processor.match(group, s, down, now, {}), symbols
+        )
+        print(
+            f"{size:>8} {build_us:>9.0f} {list_ns:>8.0f} {set_ns:>13.0f} {match_ns:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Replays a signal trace into a fresh SignalProcessor, with dummy runner and controllers.
+Record a trace by setting config.signal_trace_path.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/replay_trace.py trace.bin
+    PYTHONPATH=src:tests python tests/benchmark/replay_trace.py trace.bin --taps my_taps.py --speed 1
+
+--taps is a script that adds Taps to tapper.root and tapper.control_group.
+It is run with __name__ other than "__main__", so keep tapper.start() under the main guard.
+"""
+import argparse
+import runpy
+
+import tapper
+from tapper import config
+from tapper.boot import initializer
+from tapper.boot.tree_transformer import TreeTransformer
+from tapper.signal import trace
+from tapper.signal.signal_processor import SignalProcessor
+from testutil_model import Dummy
+
+
+def use_dummy_controllers() -> None:
+    """Trigger conditions call controllers, these answer without an OS."""
+    listener = Dummy.Listener.get_for_os("")
+    kb_tc = Dummy.KbTC(listener, [])
+    tapper.kb._tracker, tapper.kb._commander = kb_tc, kb_tc
+    mouse_tc = Dummy.MouseTC(listener, [])
+    tapper.mouse._tracker, tapper.mouse._commander = mouse_tc, mouse_tc
+    win_tc = Dummy.WinTC([])
+    tapper.window._tracker, tapper.window._commander = win_tc, win_tc
+
+
+def make_processor(os: str) -> tuple[SignalProcessor, Dummy.ActionRunner]:
+    transformer = TreeTransformer(
+        lambda command: None,
+        initializer.default_trigger_parser(os),
+        config.kw_trigger_conditions,
+    )
+    root = transformer.transform(tapper.root)
+    initializer.set_default_controls_if_empty(tapper.control_group)
+    initializer.control_config_fill(tapper.control_group)
+    control = transformer.transform(tapper.control_group)
+    runner = Dummy.ActionRunner()
+    processor = SignalProcessor(
+        root, control, initializer.default_keeper_pressed(os), runner
+    )
+    processor.compile()
+    return processor, runner
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    args.add_argument("trace")
+    args.add_argument("--taps", help="script that adds Taps")
+    args.add_argument(
+        "--speed", type=float, help="1 is real time; omit for as fast as possible"
+    )
+    args.add_argument("--os", default=config.os, help="os the trace was recorded on")
+    parsed = args.parse_args()
+
+    use_dummy_controllers()
+    if parsed.taps:
+        runpy.run_path(parsed.taps, run_name="tapper_replay")
+    processor, runner = make_processor(parsed.os)
+
+    signals = list(trace.read_trace(parsed.trace))
+    report = trace.replay(
+        signals,
+        processor.on_signal,
+        processor.state_keeper,
+        parsed.speed,
+        on_repeat=processor.on_repeat,
+    )
+    print(report)
+    triggered = sum(len(actions) for actions in runner.actions_ran.values())
+    print(f"{triggered} actions, {len(runner.control_actions_ran)} control actions")
+
+
+if __name__ == "__main__":
+    main()
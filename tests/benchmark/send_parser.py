@@ -0,0 +1,105 @@
+"""
+Time to parse send commands, uncached: long text, dense combos, and a deep ";" chain.
+Compares the char by char parser, as it used to be, with the single-pass lexer.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/send_parser.py
+"""
+import time
+from typing import Callable
+
+from tapper.boot import initializer
+from tapper.model import keyboard
+from tapper.model.errors import SendParseError
+from tapper.model.send import KeyInstruction
+from tapper.model.send import SendInstruction
+from tapper.parser import common
+from tapper.parser.send_parser import COMBO_DELIMITER
+from tapper.parser.send_parser import ki_shift_down
+from tapper.parser.send_parser import ki_shift_up
+from tapper.parser.send_parser import match_combos
+from tapper.parser.send_parser import SendParser
+from tapper.parser.send_parser import SYMBOL_DELIMITER
+from tapper.parser.send_parser import to_content
+
+TEXT = "The quick brown Fox jumps over the lazy Dog, 1234567890!\n" * 70
+COMBOS = "$(ctrl+c)$(x100y200)$(lmb 20ms)$(alt+tab)q" * 200
+CHAIN = "$(" + ";".join(["ctrl+a", "b 2x", "x10y10r", "shift+c"] * 100) + ")"
+CASES = {"long text": TEXT, "dense combos": COMBOS, "deep ; chain": CHAIN}
+RUNS = 20
+
+
+def old_parse_combo(parser: SendParser, content: str) -> list[SendInstruction]:
+    """Re-splits the rest of the content on each ";"."""
+    symbols_split = common.split(content, SYMBOL_DELIMITER)
+    for i in range(len(symbols_split)):
+        one_split = symbols_split[i]
+        if len(one_split) > 1 and COMBO_DELIMITER in one_split[1:]:
+            combo_delim_index = i + 1 + one_split.index(COMBO_DELIMITER, 1)
+            combo_delim_index += sum(len(s) for s in symbols_split[:i])
+            return [
+                *old_parse_combo(parser, content[: combo_delim_index - 1]),
+                *old_parse_combo(parser, content[combo_delim_index:]),
+            ]
+    return parser._parse_chain(content)
+
+
+def old_parse(parser: SendParser, command: str) -> list[SendInstruction]:
+    """Char by char, with unalias and symbol lookups for each."""
+    assert parser.pattern is not None
+    shift_down = False
+    result: list[SendInstruction] = []
+    combos = match_combos(command, parser.pattern)
+    i = 0
+    while i < len(command):
+        if combos:
+            combo = combos[0]
+            if i == combo.start():
+                combos.remove(combo)
+                result.extend(old_parse_combo(parser, to_content(combo)))
+                i = combo.end()
+                continue
+        symbol = parser.unalias(command[i])
+        if symbol not in parser.symbols:
+            raise SendParseError(symbol)
+        if symbol in keyboard.chars_en_upper:
+            symbol = keyboard.chars_en_upper_to_lower[symbol]
+            if not shift_down:
+                result.append(ki_shift_down())
+                shift_down = True
+        elif shift_down:
+            result.append(ki_shift_up())
+            shift_down = False
+        result.append(KeyInstruction(symbol))
+        i += 1
+    if shift_down:
+        result.append(ki_shift_up())
+    return result
+
+
+def new_parse(parser: SendParser, command: str) -> list[SendInstruction]:
+    parser.combos.clear()
+    return list(parser._compile(command, None))
+
+
+def us_per_parse(parse: Callable[[str], list[SendInstruction]], command: str) -> float:
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        parse(command)
+    return (time.perf_counter() - start) / RUNS * 1e6
+
+
+def main() -> None:
+    parser = initializer.default_send_parser()
+    print(f"{'command':>14} {'chars':>6} {'old us':>9} {'new us':>9} {'speedup':>8}")
+    for name, command in CASES.items():
+        assert old_parse(parser, command) == new_parse(parser, command)
+        old = us_per_parse(lambda c: old_parse(parser, c), command)
+        new = us_per_parse(lambda c: new_parse(parser, c), command)
+        print(
+            f"{name:>14} {len(command):>6} {old:>9.0f} {new:>9.0f} {old / new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-signal latency of SignalProcessor matching, recursive walk vs dispatch index.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/signal_match.py
+"""
+import random
+import time
+from typing import Callable
+
+from tapper.boot import initializer
+from tapper.model import keyboard
+from tapper.model.constants import KeyDirBool
+from tapper.model.tap_tree_shadow import SGroup
+from tapper.model.tap_tree_shadow import STap
+from tapper.model.trigger import AuxiliaryKey
+from tapper.model.trigger import MainKey
+from tapper.model.trigger import Trigger
+from tapper.signal.signal_processor import SignalProcessor
+from testutil_model import DummyActionRunner
+
+TREE_SIZES = [10, 100, 1000, 3000]
+SIGNALS = 5000
+MODIFIERS = [["left_control", "right_control"], ["left_alt", "right_alt"]]
+
+
+def make_tree(taps: int, rnd: random.Random) -> SGroup:
+    """Groups of 20 taps each, with modifier combos on random letters."""
+    root = SGroup()
+    root.trigger_conditions = []
+    group = root
+    for i in range(taps):
+        if i % 20 == 0:
+            group = SGroup()
+            group.trigger_conditions = []
+            root.add(group)
+        aux = [AuxiliaryKey(m) for m in rnd.sample(MODIFIERS, rnd.randint(0, 2))]
+        main = MainKey([rnd.choice(keyboard.chars_en_lower)])
+        stap = STap(Trigger(main, aux), lambda: None, 0, None)  # type: ignore
+        stap.trigger_conditions = []
+        group.add(stap)
+    return root
+
+
+def per_signal_ns(match: Callable[[str], object], symbols: list[str]) -> float:
+    start = time.perf_counter_ns()
+    for symbol in symbols:
+        match(symbol)
+    return (time.perf_counter_ns() - start) / len(symbols)
+
+
+def main() -> None:
+    rnd = random.Random(0)
+    symbols = [rnd.choice(keyboard.chars_en_lower) for _ in range(SIGNALS)]
+    now = time.perf_counter()
+
+    print(f"{'taps':>6} {'walk ns/signal':>16} {'index ns/signal':>16} {'speedup':>8}")
+    for size in TREE_SIZES:
+        root = make_tree(size, rnd)
+        state_keeper = initializer.default_keeper_pressed()
+        state_keeper.key_pressed("left_control")
+        processor = SignalProcessor(root, SGroup(), state_keeper, DummyActionRunner())
+        processor.compile()
+        index = processor.root_index
+        down = KeyDirBool.DOWN
+
+        walk = per_signal_ns(lambda s: processor.match(root, s, down, now, {}), symbols)
+        indexed = per_signal_ns(
+            lambda s: processor.match_index(index, s, down, now, {}), symbols  # type: ignore
+        )
+        print(f"{size:>6} {walk:>16.0f} {indexed:>16.0f} {walk / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Timing error of sleeps on this machine: how late each sleep ends, as p50/p99/max.
+Compares time.sleep, tapper.sleep, and tapper.sleep with precision (spin at the end).
+Then drift over a long command: sleeping each interval vs to deadlines of a Schedule.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python tests/benchmark/sleep_precision.py
+"""
+import statistics
+import time
+from typing import Callable
+
+from tapper.controller import flow_control
+from tapper.controller.send_processor import Schedule
+from tapper.controller.sleep_processor import SleepCommandProcessor
+
+LENGTHS = [0.0005, 0.002, 0.01]
+SLEEPS = 200
+PRECISION = 0.002
+COMMAND_KEYS = 500
+COMMAND_INTERVAL = 0.002
+KEY_WORK_S = 0.0001
+"""Time a key press takes, between sleeps."""
+
+
+def processor(precision: float) -> SleepCommandProcessor:
+    return SleepCommandProcessor(
+        check_interval=0.1,
+        kill_check_fn=lambda: False,
+        pause_check_fn=lambda: False,
+        wait_change_fn=flow_control.wait_change_blocking,
+        precision=precision,
+    )
+
+
+def late_us(sleep: Callable[[float], None], length: float) -> list[float]:
+    errors = []
+    for _ in range(SLEEPS):
+        start = time.perf_counter()
+        sleep(length)
+        errors.append((time.perf_counter() - start - length) * 1e6)
+    return errors
+
+
+def work() -> None:
+    end = time.perf_counter() + KEY_WORK_S
+    while time.perf_counter() < end:
+        pass
+
+
+def drift_ms(sleep: Callable[[float], None]) -> float:
+    start = time.perf_counter()
+    for _ in range(COMMAND_KEYS):
+        sleep(COMMAND_INTERVAL)
+        work()
+    expected = COMMAND_KEYS * COMMAND_INTERVAL
+    return (time.perf_counter() - start - expected) * 1000
+
+
+def main() -> None:
+    sleeps = {
+        "time.sleep": time.sleep,
+        "tapper.sleep": processor(0).sleep,
+        f"precision {PRECISION * 1000:g}ms": processor(PRECISION).sleep,
+    }
+    print(f"{'sleep':>16} {'length ms':>10} {'p50 us':>8} {'p99 us':>8} {'max us':>8}")
+    for name, sleep in sleeps.items():
+        for length in LENGTHS:
+            errors = late_us(sleep, length)
+            p99 = statistics.quantiles(errors, n=100)[98]
+            print(
+                f"{name:>16} {length * 1000:>10g} {statistics.median(errors):>8.0f}"
+                f" {p99:>8.0f} {max(errors):>8.0f}"
+            )
+
+    print(
+        f"\n{COMMAND_KEYS} keys at {COMMAND_INTERVAL * 1000:g}ms interval,"
+        f" {KEY_WORK_S * 1e6:g}us per key: drift from the expected duration"
+    )
+    for name, precision in [("tapper.sleep", 0), ("precision", PRECISION)]:
+        sleeper = processor(precision)
+        relative = drift_ms(sleeper.sleep)
+        schedule = Schedule(time.perf_counter(), sleeper.sleep_until, time.perf_counter)
+        scheduled = drift_ms(schedule.sleep)
+        print(
+            f"{name:>16}: each interval {relative:>7.1f}ms,"
+            f" schedule {scheduled:>6.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Synthetic tap trees and signal streams, for benchmarks."""
+import random
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+
+from tapper.model import keyboard
+from tapper.model.constants import KeyDirBool
+from tapper.model.tap_tree import Group
+from tapper.model.tap_tree import Tap
+from tapper.model.types_ import KwTriggerConditions
+from tapper.model.types_ import Signal
+
+AUX_KEYS = ["ctrl", "alt", "shift", "space", "tab", "enter"]
+AUX_SYMBOLS = [
+    ["left_control", "right_control"],
+    ["left_alt", "right_alt"],
+    ["left_shift", "right_shift"],
+    ["space"],
+    ["tab"],
+    ["enter"],
+]
+MAIN_KEYS = [*keyboard.chars_en_lower, *keyboard.fn_keys]
+CONDITION_VALUES = 10
+"""Each condition gets a value in range of this. Value 0 rejects."""
+
+
+@dataclass
+class TreeSpec:
+    taps: int = 1000
+    breadth: int = 4
+    """Child groups of each group."""
+    depth: int = 2
+    """Levels of groups under root. Taps are spread between the deepest groups."""
+    aux: int = 1
+    """Auxiliary keys in each trigger, like "ctrl" in "ctrl+a"."""
+    conditions: int = 1
+    """Trigger conditions on each Tap and Group."""
+    seed: int = 0
+
+
+def condition_names(spec: TreeSpec) -> list[str]:
+    return [f"cond{i}" for i in range(spec.conditions)]
+
+
+def kw_conditions(spec: TreeSpec) -> KwTriggerConditions:
+    """Cheap conditions, that reject for value 0."""
+    return {name: bool for name in condition_names(spec)}
+
+
+def make_tree(spec: TreeSpec, action: Callable[[], Any] = lambda: None) -> Group:
+    """Root group with nested groups and taps, ready for TreeTransformer."""
+    if spec.aux > len(AUX_KEYS):
+        raise ValueError(f"At most {len(AUX_KEYS)} aux keys are supported.")
+    rnd = random.Random(spec.seed)
+    names = condition_names(spec)
+
+    def conditions() -> dict[str, int]:
+        return {name: rnd.randrange(CONDITION_VALUES) for name in names}
+
+    root = Group(
+        "root",
+        executor=0,
+        suppress_trigger=True,
+        send_interval=0,
+        send_press_duration=0,
+    )
+    leaves = [root]
+    for level in range(spec.depth):
+        next_leaves = []
+        for parent in leaves:
+            for i in range(spec.breadth):
+                group = Group(f"{parent.name}.{i}", **conditions())
+                parent.add(group)
+                next_leaves.append(group)
+        leaves = next_leaves
+
+    for i in range(spec.taps):
+        trigger = "+".join([*rnd.sample(AUX_KEYS, spec.aux), rnd.choice(MAIN_KEYS)])
+        leaves[i % len(leaves)].add(Tap(trigger, action, **conditions()))
+    return root
+
+
+def make_signals(spec: TreeSpec, count: int) -> list[Signal]:
+    """Presses of random main keys, with aux keys held for some of them.
+    About count signals, each press is down and up."""
+    rnd = random.Random(spec.seed + 1)
+    signals: list[Signal] = []
+    while len(signals) < count:
+        held = [
+            rnd.choice(s) for s in rnd.sample(AUX_SYMBOLS, rnd.randint(0, spec.aux))
+        ]
+        main = rnd.choice(MAIN_KEYS)
+        signals.extend((s, KeyDirBool.DOWN) for s in held)
+        signals.extend([(main, KeyDirBool.DOWN), (main, KeyDirBool.UP)])
+        signals.extend((s, KeyDirBool.UP) for s in reversed(held))
+    return signals
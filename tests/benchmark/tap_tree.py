@@ -0,0 +1,150 @@
+"""
+Benchmark of the whole signal path on synthetic tap trees:
+TreeTransformer.transform, then signals from the dummy listener through
+ListenerWrapper and SignalProcessor.on_signal. Prints JSON, to compare between commits.
+
+Run with src and tests on the path:
+    PYTHONPATH=src:tests python -m benchmark.tap_tree > before.json
+    PYTHONPATH=src:tests python -m benchmark.tap_tree --taps 3000 --depth 3 --aux 2
+
+Without tree options, runs a matrix of presets.
+"""
+import argparse
+import dataclasses
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from benchmark.synthetic import kw_conditions
+from benchmark.synthetic import make_signals
+from benchmark.synthetic import make_tree
+from benchmark.synthetic import TreeSpec
+from tapper.action.runner import ActionRunner
+from tapper.boot import initializer
+from tapper.boot.tree_transformer import TreeTransformer
+from tapper.model import types_
+from tapper.model.tap_tree import Group
+from tapper.signal.signal_processor import SignalProcessor
+from tapper.signal.wrapper import ListenerWrapper
+from testutil_model import DummyListener
+
+PRESETS = [
+    TreeSpec(taps=10, breadth=1, depth=1, aux=0, conditions=0),
+    TreeSpec(taps=100, breadth=2, depth=2, aux=1, conditions=1),
+    TreeSpec(taps=1000, breadth=4, depth=2, aux=1, conditions=1),
+    TreeSpec(taps=1000, breadth=4, depth=3, aux=2, conditions=3),
+    TreeSpec(taps=3000, breadth=8, depth=2, aux=2, conditions=2),
+]
+
+
+class CountingRunner(ActionRunner):
+    """Doesn't run or keep actions, so they don't skew allocations."""
+
+    ran = 0
+
+    def run(
+        self, fn: types_.Action, executor_ordinal: int = 0, source: Any = None
+    ) -> None:
+        self.ran += 1
+
+    def run_control(self, fn: types_.Action) -> None:
+        self.ran += 1
+
+
+def bench(spec: TreeSpec, signal_count: int) -> dict[str, Any]:
+    tree = make_tree(spec)
+    transformer = TreeTransformer(
+        lambda command: None, initializer.default_trigger_parser(), kw_conditions(spec)
+    )
+    start = time.perf_counter_ns()
+    root = transformer.transform(tree)
+    transform_ns = time.perf_counter_ns() - start
+
+    control_group = Group("control_group")
+    initializer.control_config_fill(control_group)
+    control = transformer.transform(control_group)
+    runner = CountingRunner()
+    state_keeper = initializer.default_keeper_pressed()
+    processor = SignalProcessor(root, control, state_keeper, runner)
+    start = time.perf_counter_ns()
+    processor.compile()
+    compile_ns = time.perf_counter_ns() - start
+
+    listener = DummyListener()
+    ListenerWrapper(processor.on_signal, None, state_keeper).wrap(listener)
+    signals = make_signals(spec, signal_count)
+
+    for signal in signals[:1000]:  # warmup
+        listener.on_signal(signal)
+    runner.ran = 0
+
+    start = time.perf_counter_ns()
+    for signal in signals:
+        listener.on_signal(signal)
+    elapsed_ns = time.perf_counter_ns() - start
+    triggered = runner.ran
+
+    tracemalloc.start()
+    transient_bytes = 0
+    blocks_before = sys.getallocatedblocks()
+    for signal in signals:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        listener.on_signal(signal)
+        transient_bytes += tracemalloc.get_traced_memory()[1] - before
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+
+    return {
+        "spec": dataclasses.asdict(spec),
+        "signals": len(signals),
+        "triggered": triggered,
+        "transform_ms": round(transform_ns / 1e6, 3),
+        "compile_ms": round(compile_ns / 1e6, 3),
+        "ns_per_signal": round(elapsed_ns / len(signals), 1),
+        "peak_alloc_bytes_per_signal": round(transient_bytes / len(signals), 1),
+        "retained_blocks_per_signal": round(retained_blocks / len(signals), 4),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    args = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    for name, default in dataclasses.asdict(TreeSpec()).items():
+        args.add_argument(f"--{name}", type=int, help=f"default {default}")
+    args.add_argument("--signals", type=int, default=20000)
+    parsed = args.parse_args()
+
+    tree_options = {
+        name: value
+        for name, value in vars(parsed).items()
+        if name != "signals" and value is not None
+    }
+    specs = [TreeSpec(**tree_options)] if tree_options else PRESETS
+
+    result = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "results": [bench(spec, parsed.signals) for spec in specs],
+    }
+    json.dump(result, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,12 @@ from tapper.controller.keyboard.kb_api import KeyboardController
 from tapper.controller.mouse.mouse_api import MouseController
 from tapper.controller.send_processor import SendCommandProcessor
 from tapper.model.constants import KeyDirBool
+from tapper.model.constants import ListenerResult
 from tapper.model.types_ import SendFn
 from tapper.model.types_ import Signal
+from tapper.signal.base_listener import SignalListener
 from tapper.state import keeper
+from tapper.util.clock import Clock
 from testutil_model import Dummy
 
 
@@ -40,9 +43,25 @@ def ends_with(outer: list[Any], sub: list[Any]) -> bool:
     return len(outer) >= len(sub) and outer[-len(sub) :] == sub
 
 
+class PropagationLog:
+    """Passes real signals to the listener, and logs those it lets through to the OS."""
+
+    def __init__(self, listener: SignalListener, propagated: list[Signal]) -> None:
+        self.listener = listener
+        self.propagated = propagated
+
+    def on_signal(self, signal: Signal) -> ListenerResult:
+        result = self.listener.on_signal(signal)
+        if result == ListenerResult.PROPAGATE:
+            self.propagated.append(signal)
+        return result
+
+
 class Fixture:
     emul_signals: list[Signal]
     real_signals: list[Signal]
+    propagated: list[Signal]
+    """Real signals that the listener let through to the OS."""
     pressed: list[str]
     toggled: list[str]
 
@@ -65,6 +84,9 @@ def f(dummy: Dummy, is_debug: bool, make_group: Callable) -> Fixture:
     # restore default before each
     config.action_runner_executors_threads = [1]
     config.tray_icon = False
+    config.latency_recorder = None
+    config.action_runner_async_tasks = None
+    config.clock = Clock()
     tapper.root = make_group("root")
     tapper.control_group = make_group("control_group")
     tapper._initialized = False
@@ -79,6 +101,7 @@ def f(dummy: Dummy, is_debug: bool, make_group: Callable) -> Fixture:
     fixture._acts = {}
     fixture.emul_signals = []
     fixture.real_signals = []
+    fixture.propagated = []
     fixture.pressed = []
     fixture.toggled = []
     fixture.actions = []
@@ -105,6 +128,7 @@ def f(dummy: Dummy, is_debug: bool, make_group: Callable) -> Fixture:
 
         sender = tapper._send_processor
         sender.sleep_fn = partial(sleep_logged, signals=fixture.emul_signals)
+        sender.sleep_until_fn = None  # sleeps are logged as they are in commands
 
         real_sender = SendCommandProcessor.from_none()
         real_sender.os = sender.os
@@ -113,15 +137,16 @@ def f(dummy: Dummy, is_debug: bool, make_group: Callable) -> Fixture:
         fixture.send_real = partial(send_and_sleep, real_sender.send)
 
         emul_keeper = keeper.Emul()
+        real_listener = PropagationLog(listener, fixture.propagated)
 
         kb_tc2 = dummy.KbTC(
-            listener, fixture.real_signals, fixture.pressed, fixture.toggled
+            real_listener, fixture.real_signals, fixture.pressed, fixture.toggled
         )
         kbc = KeyboardController()
         kbc._tracker, kbc._commander, kbc._emul_keeper = kb_tc2, kb_tc2, emul_keeper
 
         mouse_tc2 = dummy.MouseTC(
-            listener, fixture.real_signals, fixture.pressed, fixture.toggled
+            real_listener, fixture.real_signals, fixture.pressed, fixture.toggled
         )
         mc = MouseController()
         mc._tracker, mc._commander, mc._emul_keeper = mouse_tc2, mouse_tc2, emul_keeper
@@ -1,14 +1,24 @@
+import asyncio
 import time
 from functools import partial
 
 import tapper
 from integration.conftest import click
+from integration.conftest import down
 from integration.conftest import ends_with
 from integration.conftest import Fixture
 from integration.conftest import sleep_signal
+from integration.conftest import up
 from tapper import config
 from tapper import Group
 from tapper import Tap
+from tapper.action.runner import ExecutorConfig
+from tapper.action.runner import QueuePolicy
+from tapper.boot import initializer
+from tapper.feedback import latency
+from tapper.feedback.latency import LatencyRecorder
+from tapper.helper import repeat
+from tapper.util.clock import SimulatedClock
 
 
 class TestSimple:
@@ -134,6 +144,25 @@ class TestTreeOrder:
         assert f.emul_signals == click("ctrlgr")
 
 
+class TestReload:
+    def test_add_and_change(self, f: Fixture) -> None:
+        changed = Tap("b", f.act(2))
+        tapper.root.add(Tap("a", f.act(1)), changed)
+        f.start()
+
+        f.send_real("a")
+        f.send_real("b")
+        assert f.actions == [1, 2]
+
+        changed.trigger = "c"
+        tapper.root.add({"d": "q"})
+        assert tapper.reload() > 0
+        for symbol in "abcd":
+            f.send_real(symbol)
+        assert f.actions == [1, 2, 1, 2]
+        assert f.emul_signals == click("q")
+
+
 class TestConcurrentActions:
     def test_simplest(self, f: Fixture) -> None:
         tapper.root.add({"a": "$(1ms)", "b": "$(2ms)"})
@@ -176,3 +205,145 @@ class TestConcurrentActions:
 
         f.send_real("xzhgfdsa")
         assert f.emul_signals == [sleep_signal(ms / 1000) for ms in [2, 16, 15, 14]]
+
+
+class TestTiming:
+    def test_throttle_and_autorepeat(self, f: Fixture) -> None:
+        # queue, so actions are not dropped because the executor is busy
+        config.action_runner_executors_threads = [ExecutorConfig(1, QueuePolicy.FIFO)]
+        tapper.root.add(
+            Tap("a", f.act(1), throttle="1s"),
+            Group(ignore_autorepeat=True).add(Tap("b", f.act(2))),
+        )
+        f.start()
+
+        f.send_real("aaa")
+        assert f.actions == [1]
+        f.send_real("$(b down;b down;b down;b up)")
+        assert f.actions == [1, 2]
+
+    def test_blocked_remap_suppressed(self, f: Fixture) -> None:
+        config.action_runner_executors_threads = [ExecutorConfig(1, QueuePolicy.FIFO)]
+        tapper.root.add(
+            Tap("a", "b", ignore_autorepeat=True),
+            Tap("c", "d", throttle="1s"),
+            Tap("e", "f", debounce="1s"),
+        )
+        f.start()
+
+        f.send_real("$(a down;a down;a down;a up)ccee")
+        assert f.real_signals == [*down("aaa"), *up("a"), *click("ccee")]
+        assert f.emul_signals == click("bdf")
+        assert f.propagated == [*up("a"), *up("cc"), *up("ee")]
+
+
+class TestAsyncActions:
+    def test_concurrent_in_one_loop(self, f: Fixture) -> None:
+        config.action_runner_async_tasks = 100
+
+        async def action() -> None:
+            await tapper.sleep_async(0.03)
+            f.actions.append(1)
+
+        tapper.root.add(Tap("a", action))
+        f.start()
+
+        f.send_real("aaa")
+        time.sleep(0.05)
+        assert f.actions == [1, 1, 1]
+
+    def test_send_from_coroutine(self, f: Fixture) -> None:
+        config.action_runner_async_tasks = 100
+
+        async def action() -> None:
+            await asyncio.to_thread(tapper.send, "q")
+
+        tapper.root.add(Tap("a", action))
+        f.start()
+
+        f.send_real("a")
+        time.sleep(0.02)
+        assert f.emul_signals == click("q")
+
+    def test_without_async_runner(self, f: Fixture) -> None:
+        async def action() -> None:
+            await tapper.sleep_async(0.01)
+            tapper.send("q")
+
+        tapper.root.add(Tap("a", action))
+        f.start()
+
+        f.send_real("a")
+        time.sleep(0.02)
+        assert f.emul_signals == click("q")
+
+
+class TestLatency:
+    def test_off_by_default(self, f: Fixture) -> None:
+        tapper.root.add(Tap("a", f.act(1)))
+        f.start()
+
+        f.send_real("a")
+        assert tapper.latency_snapshot() == {}
+
+    def test_stages_recorded(self, f: Fixture) -> None:
+        config.latency_recorder = LatencyRecorder(log_interval=None)
+        tapper.root.add(Tap("a", f.act(1)))
+        f.start()
+
+        f.send_real("ab")
+        assert f.actions == [1]
+        snapshot = tapper.latency_snapshot()
+        assert snapshot[latency.HOOK].count == 4
+        assert snapshot[latency.ON_SIGNAL].count == 4
+        assert snapshot[latency.MATCH].count >= 4
+        assert snapshot[latency.RUN].count == 1
+        assert snapshot[latency.HOOK].max_ns >= snapshot[latency.ON_SIGNAL].p50_ns
+
+        assert initializer.running_processor is not None
+        initializer.running_processor.on_repeat("a")
+        assert tapper.latency_snapshot()[latency.REPEAT].count == 1
+
+
+class TestSimulatedClock:
+    def test_long_macro(self, f: Fixture) -> None:
+        config.clock = SimulatedClock()
+
+        def macro() -> None:
+            for _ in range(100):
+                tapper.sleep(60)
+                tapper.mouse.click()
+            f.actions.append(1)
+
+        tapper.root.add(Tap("a", macro))
+        f.start()
+
+        time_start = time.perf_counter()
+        f.send_real("a")
+        assert f.actions == [1]
+        assert time.perf_counter() - time_start < 1
+        assert config.clock.now() >= 6000
+        assert len(f.emul_signals) == 200
+
+    def test_repeat(self, f: Fixture) -> None:
+        config.clock = SimulatedClock()
+        repeated = []
+        tapper.root.add(
+            Tap(
+                "a",
+                repeat.while_fn(
+                    lambda: True,
+                    lambda: repeated.append(1),
+                    interval=30,
+                    max_repeats=50,
+                ),
+            )
+        )
+        f.start()
+
+        f.send_real("a")
+        deadline = time.perf_counter() + 2
+        while len(repeated) < 50 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        assert len(repeated) == 50
+        assert config.clock.now() >= 30 * 49
@@ -1,21 +1,20 @@
 import functools
+import threading
 import time
-from concurrent.futures import Future
 from typing import Any
 
 import hypothesis
 import hypothesis.strategies as st
 import pytest
 from hypothesis import given
-from tapper.action import runner
 from tapper.action.runner import ActionRunner
 from tapper.action.runner import ActionRunnerImpl
-from tapper.util import datastructs
+from tapper.action.runner import ExecutorConfig
+from tapper.action.runner import QueuePolicy
 
 
-def all_actions_done(runnables: list[list[Future[Any]]]) -> bool:
-    runnables = datastructs.to_flat_list(runnables)
-    return not runner.prune_done_runnables(runnables)
+def all_actions_done(runner_: ActionRunnerImpl) -> bool:
+    return not any(runner_._in_flight) and not any(runner_._pending)
 
 
 class TestActionRunnerImpl:
@@ -70,7 +69,7 @@ class TestActionRunnerImpl:
             result += 1
 
         [runner_.run(increment) for _ in range(q)]
-        while not all_actions_done(runner_._runnables):
+        while not all_actions_done(runner_):
             time.sleep(0.001)
         assert result == 1
 
@@ -110,6 +109,161 @@ class TestActionRunnerImpl:
                 if actions_quantity[ex_ord] > action_n:
                     runner_.run(functools.partial(increment, ex_ord), ex_ord)
 
-        while not all_actions_done(runner_._runnables):
+        while not all_actions_done(runner_):
             time.sleep(0.01)
         assert expected == result
+
+    def test_in_flight_released_on_failure(self) -> None:
+        runner_ = ActionRunnerImpl([2])
+
+        def throw() -> None:
+            raise UnicodeError
+
+        runner_.run(throw)
+        # noinspection PyTypeChecker
+        runner_.run(None)
+        while not all_actions_done(runner_):
+            time.sleep(0.001)
+        assert runner_.stats[0].accepted == 2
+        runner_.run(throw)
+        assert runner_.stats[0].accepted == 3
+
+    def test_threads_limit_with_many_producers(self) -> None:
+        runner_ = ActionRunnerImpl([3])
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+
+        def track() -> None:
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.001)
+            with lock:
+                running -= 1
+
+        def produce() -> None:
+            for _ in range(200):
+                runner_.run(track)
+
+        threads = [threading.Thread(target=produce) for _ in range(6)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        while not all_actions_done(runner_):
+            time.sleep(0.001)
+        stats = runner_.stats[0]
+        assert max_running <= 3
+        assert stats.accepted + stats.rejected == 1200
+        assert runner_._in_flight == [0]
+
+
+class TestQueuePolicies:
+    PRODUCERS = 4
+    PER_PRODUCER = 50
+
+    @pytest.fixture
+    def gate(self) -> threading.Event:
+        return threading.Event()
+
+    def make_runner(self, policy: QueuePolicy, max_queue: int = 10) -> ActionRunnerImpl:
+        return ActionRunnerImpl([ExecutorConfig(1, policy, max_queue)])
+
+    def flood(
+        self, runner_: ActionRunnerImpl, gate: threading.Event, ran: list[Any]
+    ) -> None:
+        """First action blocks the only thread until all producers are done."""
+        runner_.run(gate.wait)
+
+        def produce(producer: int) -> None:
+            for n in range(self.PER_PRODUCER):
+                runner_.run(functools.partial(ran.append, (producer, n)), 0, producer)
+
+        threads = [
+            threading.Thread(target=produce, args=(p,)) for p in range(self.PRODUCERS)
+        ]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        gate.set()
+        while not all_actions_done(runner_):
+            time.sleep(0.001)
+
+    def test_drop(self, gate: threading.Event) -> None:
+        runner_ = self.make_runner(QueuePolicy.DROP)
+        ran: list[Any] = []
+        self.flood(runner_, gate, ran)
+        stats = runner_.stats[0]
+        assert not ran
+        assert stats.accepted == 1
+        assert stats.rejected == self.PRODUCERS * self.PER_PRODUCER
+        assert stats.max_queue_depth == 0
+
+    def test_fifo(self, gate: threading.Event) -> None:
+        runner_ = self.make_runner(QueuePolicy.FIFO)
+        ran: list[Any] = []
+        self.flood(runner_, gate, ran)
+        stats = runner_.stats[0]
+        assert len(ran) == 10
+        assert stats.accepted == 11
+        assert stats.rejected == self.PRODUCERS * self.PER_PRODUCER - 10
+        assert stats.max_queue_depth == 10
+        assert stats.queue_depth == 0
+        for producer in range(self.PRODUCERS):
+            ns = [n for p, n in ran if p == producer]
+            assert ns == list(range(len(ns)))
+
+    def test_drop_oldest(self, gate: threading.Event) -> None:
+        runner_ = self.make_runner(QueuePolicy.DROP_OLDEST)
+        ran: list[Any] = []
+        self.flood(runner_, gate, ran)
+        stats = runner_.stats[0]
+        total = self.PRODUCERS * self.PER_PRODUCER
+        assert len(ran) == 10
+        assert stats.accepted == total + 1
+        assert stats.evicted == total - 10
+        assert stats.rejected == 0
+        for producer in range(self.PRODUCERS):  # newest of each producer are kept
+            ns = [n for p, n in ran if p == producer]
+            assert ns == list(range(self.PER_PRODUCER - len(ns), self.PER_PRODUCER))
+
+    def test_latest(self, gate: threading.Event) -> None:
+        runner_ = self.make_runner(QueuePolicy.LATEST)
+        ran: list[Any] = []
+        self.flood(runner_, gate, ran)
+        stats = runner_.stats[0]
+        total = self.PRODUCERS * self.PER_PRODUCER
+        assert sorted(ran) == [
+            (p, self.PER_PRODUCER - 1) for p in range(self.PRODUCERS)
+        ]
+        assert stats.evicted == total - self.PRODUCERS
+        assert stats.max_queue_depth == self.PRODUCERS
+
+    def test_latest_queue_limit(self, gate: threading.Event) -> None:
+        runner_ = self.make_runner(QueuePolicy.LATEST, max_queue=2)
+        ran: list[Any] = []
+        self.flood(runner_, gate, ran)
+        assert len(ran) == 2
+        assert runner_.stats[0].rejected > 0
+
+    def test_queue_with_many_threads(self) -> None:
+        runner_ = ActionRunnerImpl([ExecutorConfig(3, QueuePolicy.FIFO, 100)])
+        ran: list[int] = []
+
+        def slow(n: int) -> None:
+            time.sleep(0.001)
+            ran.append(n)
+
+        threads = [
+            threading.Thread(
+                target=lambda: [
+                    runner_.run(functools.partial(slow, n)) for n in range(30)
+                ]
+            )
+            for _ in range(3)
+        ]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        while not all_actions_done(runner_):
+            time.sleep(0.001)
+        assert len(ran) == 90
+        assert runner_.stats[0].rejected == 0
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+from tapper.action.async_runner import AsyncActionRunner
+from tapper.action.runner import ActionRunnerImpl
+from tapper.action.runner import in_own_loop
+
+
+def wait_for(condition: Any, timeout: float = 2) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def async_runner() -> Any:
+    runner_ = AsyncActionRunner(ActionRunnerImpl([1]), max_tasks=3000)
+    yield runner_
+    runner_.stop()
+
+
+class TestAsyncActionRunner:
+    def test_coroutine_runs_in_loop_thread(
+        self, async_runner: AsyncActionRunner
+    ) -> None:
+        threads = []
+
+        async def action() -> None:
+            threads.append(threading.current_thread())
+
+        async_runner.run(action)
+        wait_for(lambda: threads)
+        assert threads == [async_runner._thread]
+
+    def test_callable_runs_in_thread_runner(
+        self, async_runner: AsyncActionRunner
+    ) -> None:
+        threads = []
+        async_runner.run(lambda: threads.append(threading.current_thread()))
+        wait_for(lambda: threads)
+        assert threads[0] is not async_runner._thread
+        assert async_runner.stats.accepted == 0
+
+    def test_thousands_waiting(self, async_runner: AsyncActionRunner) -> None:
+        done = []
+
+        async def action() -> None:
+            await asyncio.sleep(0.1)
+            done.append(1)
+
+        threads_before = threading.active_count()
+        time_start = time.perf_counter()
+        for _ in range(2000):
+            async_runner.run(action)
+        wait_for(lambda: len(done) == 2000)
+        assert time.perf_counter() - time_start < 1
+        assert threading.active_count() <= threads_before
+
+    def test_max_tasks(self) -> None:
+        runner_ = AsyncActionRunner(ActionRunnerImpl([1]), max_tasks=2)
+        gate = asyncio.Event()
+
+        async def action() -> None:
+            await gate.wait()
+
+        [runner_.run(action) for _ in range(5)]
+        wait_for(lambda: runner_.stats.accepted + runner_.stats.rejected == 5)
+        assert runner_.stats.accepted == 2
+        runner_.loop.call_soon_threadsafe(gate.set)
+        wait_for(lambda: not runner_._tasks)
+        runner_.run(action)
+        wait_for(lambda: runner_.stats.accepted == 3)
+        runner_.stop()
+
+    def test_stop_cancels_tasks(self) -> None:
+        runner_ = AsyncActionRunner(ActionRunnerImpl([1]), max_tasks=2)
+        cancelled = []
+
+        async def action() -> None:
+            try:
+                await asyncio.sleep(100)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        runner_.run(action)
+        wait_for(lambda: runner_._tasks)
+        runner_.stop()
+        assert cancelled == [1]
+        assert not runner_._thread.is_alive()
+        assert runner_.loop.is_closed()
+        runner_.stop()  # again, from atexit
+
+    def test_invalid_max_tasks(self) -> None:
+        with pytest.raises(ValueError):
+            AsyncActionRunner(ActionRunnerImpl([1]), max_tasks=0)
+
+
+def test_coroutine_in_thread_runner() -> None:
+    ran = []
+
+    async def action() -> None:
+        await asyncio.sleep(0)
+        ran.append(1)
+
+    in_own_loop(action)()
+    assert ran == [1]
+    runner_ = ActionRunnerImpl([1])
+    runner_.run(action)
+    wait_for(lambda: len(ran) == 2)
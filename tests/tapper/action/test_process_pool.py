@@ -0,0 +1,143 @@
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import pytest
+import tapper
+from tapper.action import process_pool
+from tapper.action.runner import ActionRunnerImpl
+from tapper.action.runner import ExecutorConfig
+from tapper.action.runner import ExecutorKind
+from tapper.action.wrapper import ActionConfig
+from tapper.action.wrapper import WrappedAction
+from tapper.controller import flow_control
+
+
+def echo(*args: Any, **kwargs: Any) -> Any:
+    return os.getpid(), args, kwargs, flow_control.action_config()
+
+
+def fail() -> None:
+    raise KeyError("q")
+
+
+def call_send() -> Any:
+    return tapper.send("abc", interval=0)
+
+
+def call_mouse_move() -> Any:
+    return tapper.mouse.move(10, 20)
+
+
+def call_parent(path: str, *args: Any) -> Any:
+    return process_pool.call_parent(path, *args)
+
+
+def echo_config(config: ActionConfig) -> Any:
+    flow_control.config_thread_local_storage.action_config = config
+    return process_pool.call_parent("echo")[3]
+
+
+def worker_pid() -> int:
+    return os.getpid()
+
+
+def call_sleep() -> Any:
+    return tapper.sleep(0.2)
+
+
+def die() -> None:
+    os._exit(1)
+
+
+@pytest.fixture(scope="module")
+def pool() -> Any:
+    calls = {
+        "echo": echo,
+        "fail": fail,
+        "send": echo,
+        "mouse.move": echo,
+        "sleep": lambda t: time.sleep(t),
+    }
+    executor, server = process_pool.start_pool(2, lambda path: calls[path])
+    yield executor
+    executor.shutdown()
+
+
+class TestProcessPool:
+    def test_warm(self, pool: Any) -> None:
+        assert len(pool._processes) == 2
+
+    def test_call_parent(self, pool: Any) -> None:
+        pid, args, kwargs, _ = pool.submit(call_parent, "echo", 1, "a").result()
+        assert pid == os.getpid()
+        assert args == (1, "a")
+        assert pool.submit(worker_pid).result() != os.getpid()
+
+    def test_proxies(self, pool: Any) -> None:
+        _, args, kwargs, _ = pool.submit(call_send).result()
+        assert args == ("abc",)
+        assert kwargs == {"interval": 0}
+        _, args, _, _ = pool.submit(call_mouse_move).result()
+        assert args == (10, 20)
+
+    def test_exception_returned(self, pool: Any) -> None:
+        with pytest.raises(KeyError):
+            pool.submit(call_parent, "fail").result()
+
+    def test_action_config_passed(self, pool: Any) -> None:
+        config = ActionConfig(0.1, 0.2, flow_control.kill_id)
+        assert pool.submit(echo_config, config).result() == config
+
+    def test_resolve_tapper(self) -> None:
+        assert process_pool.resolve_tapper("send") is tapper.send
+        assert process_pool.resolve_tapper("sleep") is tapper.sleep
+        for path in ["config", "mouse._tracker", "os"]:
+            with pytest.raises(ValueError):
+                process_pool.resolve_tapper(path)
+
+    def test_calls_served_at_once(self, pool: Any) -> None:
+        start = time.perf_counter()
+        futures = [pool.submit(call_sleep) for _ in range(2)]
+        [f.result() for f in futures]
+        assert time.perf_counter() - start < 0.35
+
+    def test_not_in_worker(self) -> None:
+        with pytest.raises(RuntimeError):
+            process_pool.call_parent("send", "a")
+
+
+def test_runner_process_executor(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent = []
+    monkeypatch.setattr(tapper, "send", lambda *args, **kwargs: sent.append(args))
+    runner_ = ActionRunnerImpl([1, ExecutorConfig(2, kind=ExecutorKind.PROCESS)])
+    config = ActionConfig(0, 0, flow_control.kill_id)
+    runner_.run(WrappedAction(call_send, config), 1)
+    runner_.run(lambda: None, 1)  # can't be pickled, logged
+    deadline = time.perf_counter() + 5
+    while any(runner_._in_flight):
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+    assert sent == [("abc",)]
+    assert runner_.stats[1].accepted == 2
+    runner_.executors[1].shutdown()
+
+
+def test_broken_pool_replaced() -> None:
+    executor = process_pool.ProcessExecutor(1, lambda path: echo)
+    try:
+        with pytest.raises(BrokenProcessPool):
+            executor.submit(die).result()
+        assert executor.submit(worker_pid).result() != os.getpid()
+    finally:
+        executor.shutdown()
+
+
+def test_to_picklable() -> None:
+    action = process_pool.to_picklable("$(ctrl+c)")
+    assert action.func is process_pool.call_parent  # type: ignore
+    assert action.args == ("send", "$(ctrl+c)")  # type: ignore
+    assert process_pool.to_picklable(worker_pid) is worker_pid
+    with pytest.raises(ValueError):
+        process_pool.to_picklable(lambda: None)
@@ -3,6 +3,7 @@ from typing import Callable
 
 import pytest
 from tapper import config
+from tapper.action import process_pool
 from tapper.boot import initializer
 from tapper.boot.tree_transformer import TreeTransformer
 from tapper.model.constants import KeyDirBool
@@ -11,6 +12,9 @@ from tapper.model.tap_tree import Group
 from tapper.model.tap_tree import Tap
 from tapper.model.tap_tree_shadow import SGroup
 from tapper.model.tap_tree_shadow import STap
+from tapper.model.trigger import MainKey
+from tapper.model.trigger import Trigger
+from tapper.signal.signal_processor import SignalProcessor
 
 
 def send(text: str) -> str:
@@ -54,8 +58,8 @@ class TestTreeTransformer:
         group.add(tap)
         shadow_group = transform(group)
 
-        assert shadow_group.get_main_triggers(KeyDirBool.DOWN) == ["a"]
-        assert shadow_group.get_main_triggers(KeyDirBool.UP) == []
+        assert shadow_group.get_main_triggers(KeyDirBool.DOWN) == {"a"}
+        assert shadow_group.get_main_triggers(KeyDirBool.UP) == set()
         assert len(shadow_group.children) == 1
         t = shadow_group.children[0]
         assert isinstance(t, STap)
@@ -64,7 +68,7 @@ class TestTreeTransformer:
             assert t.suppress_trigger == self.res
             assert t.send_interval == self.si
             assert t.send_press_duration == self.spd
-            assert t.get_main_triggers(KeyDirBool.DOWN) == ["a"]
+            assert t.get_main_triggers(KeyDirBool.DOWN) == {"a"}
             assert t.original == tap
             assert t.action == send
 
@@ -75,12 +79,12 @@ class TestTreeTransformer:
         group.add(group1, Tap("f1", partial(send, "f1")), group2)
         sg = transform(group)
 
-        assert sg.get_main_triggers(KeyDirBool.DOWN) == ["1", "f1", "a", "b"]
+        assert sg.get_main_triggers(KeyDirBool.DOWN) == {"1", "f1", "a", "b"}
         assert len(sg.children) == 3
         g1, t2, g3 = sg.children
         assert len(g1.children) == 1
         assert len(g3.children) == 2
-        assert g3.get_main_triggers(KeyDirBool.DOWN) == ["a", "b"]
+        assert g3.get_main_triggers(KeyDirBool.DOWN) == {"a", "b"}
 
     def test_prop_override(self, transform: TransformFn, group: Group) -> None:
         tap1 = Tap("1", send)
@@ -90,3 +94,184 @@ class TestTreeTransformer:
         sg = transform(group)
 
         assert sg.children[0].children[0].executor == 3
+
+    def test_timing_inherited(self, transform: TransformFn, group: Group) -> None:
+        group.add(
+            Group(throttle="200ms", ignore_autorepeat=True).add(
+                Tap("a", send),
+                Tap("b", send, throttle=0.5, debounce="1s", ignore_autorepeat=False),
+                {"c": send},
+            ),
+            Tap("d", send),
+            Group(trigger_on_repeat=True).add(Tap("e", send)),
+        )
+        sg = transform(group)
+
+        def timing(stap: STap) -> tuple[float, float, bool]:
+            return stap.throttle, stap.debounce, stap.ignore_autorepeat
+
+        tap_a, tap_b, tap_c = sg.children[0].children
+        assert timing(tap_a) == (0.2, 0, True)
+        assert timing(tap_b) == (0.5, 1, False)
+        assert (tap_c.throttle, tap_c.ignore_autorepeat) == (0.2, True)
+        tap_d = sg.children[1]
+        assert timing(tap_d) == (0, 0, False)
+        assert not tap_d.trigger_on_repeat
+        assert sg.children[2].children[0].trigger_on_repeat
+
+    @pytest.mark.parametrize("throttle", ["fast", -1, "-1s"])
+    def test_timing_invalid(
+        self, transform: TransformFn, group: Group, throttle: str | float
+    ) -> None:
+        group.add(Tap("a", send, throttle=throttle))
+        with pytest.raises(ValueError):
+            transform(group)
+
+    def test_conditions_shared(self, transform: TransformFn, group: Group) -> None:
+        inner = Group(toggled_on="caps").add(
+            Tap("b", send, toggled_on="num_lock", cursor_in=[0, 0, 10, 10]),
+            Tap("c", send, cursor_in=[0, 0, 10, 10]),
+        )
+        group.add(Tap("a", send, toggled_on="caps"), inner)
+        sg = transform(group)
+
+        tap_a, sinner = sg.children
+        tap_b, tap_c = sinner.children
+        assert tap_a.trigger_conditions[0] is sinner.trigger_conditions[0]
+        assert tap_a.trigger_conditions[0] is not tap_b.trigger_conditions[0]
+        # unhashable values are not shared
+        assert tap_b.trigger_conditions[1] is not tap_c.trigger_conditions[0]
+
+    def test_process_executor_actions(self, group: Group) -> None:
+        transformer = TreeTransformer(
+            send,
+            initializer.default_trigger_parser(),
+            config.kw_trigger_conditions,
+            {self.ex},
+        )
+        group.add({"a": "qwe", "b": send})
+        sg = transformer.transform(group)
+        tap_a, tap_b = sg.children
+        assert isinstance(tap_a.action, partial)
+        assert tap_a.action.func is process_pool.call_parent
+        assert tap_a.action.args == ("send", "qwe")
+        assert tap_b.action is send
+
+        group.add(Tap("c", lambda: None))
+        with pytest.raises(ValueError):
+            transformer.transform(group)
+
+
+class TestIncrementalTransform:
+    @pytest.fixture
+    def transformer(self) -> TreeTransformer:
+        return TreeTransformer(
+            send, initializer.default_trigger_parser(), config.kw_trigger_conditions
+        )
+
+    @pytest.fixture
+    def group(self) -> Group:
+        return Group("root", 0, ListenerResult.SUPPRESS, 0.01, 0.01)
+
+    def test_unchanged_reused(self, transformer: TreeTransformer, group: Group) -> None:
+        group.add(Group().add(Tap("a", "b")), {"c": "d", "e": "f"}, Tap("g", "h"))
+        sg = transformer.transform(group)
+        assert transformer.transformed == 5
+
+        transformer.new_generation()
+        assert transformer.transform(group) is sg
+        assert (transformer.transformed, transformer.reused) == (0, 5)
+
+    def test_changed_tap(self, transformer: TreeTransformer, group: Group) -> None:
+        changed = Tap("a", "b")
+        inner = Group().add(changed, Tap("x", "y"))
+        other = Group().add(Tap("c", "d"))
+        group.add(inner, other)
+        sg = transformer.transform(group)
+        unchanged_tap = sg.children[0].children[1]  # type: ignore
+
+        transformer.new_generation()
+        changed.trigger = "z"
+        new_sg = transformer.transform(group)
+        assert new_sg is not sg
+        assert new_sg.get_main_triggers(KeyDirBool.DOWN) == {"z", "x", "c"}
+        new_inner, new_other = new_sg.children
+        assert new_inner.children[1] is unchanged_tap  # type: ignore
+        assert new_other is sg.children[1]
+        assert new_other.parent is sg  # running tree is not changed
+        # changed tap, its group, root
+        assert transformer.transformed == 3
+
+    def test_inherited_prop_changed(
+        self, transformer: TreeTransformer, group: Group
+    ) -> None:
+        group.add(Group().add(Tap("a", "b"), {"c": "d"}))
+        sg = transformer.transform(group)
+
+        transformer.new_generation()
+        group.executor = 5
+        new_sg = transformer.transform(group)
+        assert new_sg is not sg
+        for tap in new_sg.children[0].children:  # type: ignore
+            assert tap.executor == 5
+
+    def test_added_and_removed(
+        self, transformer: TreeTransformer, group: Group
+    ) -> None:
+        tap_a, tap_b = Tap("a", "b"), Tap("c", "d")
+        group.add(tap_a, tap_b)
+        sg = transformer.transform(group)
+
+        transformer.new_generation()
+        group._children.remove(tap_a)
+        group.add(Tap("e", "f"))
+        new_sg = transformer.transform(group)
+        assert new_sg.get_main_triggers(KeyDirBool.DOWN) == {"c", "e"}
+        assert new_sg.children[0] is sg.children[1]
+        assert transformer.reused == 1
+
+        transformer.new_generation()
+        transformer.transform(group)
+        assert id(tap_a) not in transformer.cache
+
+    def test_parents_relinked_on_swap(
+        self, transformer: TreeTransformer, group: Group
+    ) -> None:
+        changed = Tap("b", "c")
+        group.add(Group().add(Tap("a", "b")), changed)
+        sg = transformer.transform(group)
+        processor = SignalProcessor(
+            sg, SGroup(), initializer.default_keeper_pressed(), None  # type: ignore
+        )
+        processor.compile()
+
+        transformer.new_generation()
+        changed.trigger = "x"
+        new_sg = transformer.transform(group)
+        processor.swap(new_sg, processor.control)
+        reused = new_sg.children[0]
+        assert reused is sg.children[0]
+        reused.add(STap(Trigger(MainKey(["z"])), None, 0, ListenerResult.SUPPRESS))  # type: ignore
+        assert "z" in processor.root.get_main_triggers(KeyDirBool.DOWN)
+
+    def test_condition_table_pruned(
+        self, transformer: TreeTransformer, group: Group
+    ) -> None:
+        changed = Tap("c", "d", toggled_on="num_lock")
+        group.add(Tap("a", "b", toggled_on="caps"), changed)
+        sg = transformer.transform(group)
+        assert len(transformer.condition_table) == 2
+
+        transformer.new_generation()
+        changed.trigger_conditions = {"toggled_on": "scroll_lock"}
+        group.add(Tap("e", "f", toggled_on="caps"))
+        new_sg = transformer.transform(group)
+        transformer.new_generation()
+        assert {value for _, _, value in transformer.condition_table} == {
+            "caps",
+            "scroll_lock",
+        }
+        assert (
+            new_sg.children[2].trigger_conditions[0]
+            is sg.children[0].trigger_conditions[0]
+        )
@@ -1,4 +1,5 @@
 import time
+from typing import Iterator
 
 import pytest
 from tapper.action import wrapper
@@ -9,6 +10,8 @@ from tapper.controller.keyboard.kb_api import KeyboardController
 from tapper.controller.mouse.mouse_api import MouseController
 from tapper.controller.send_processor import SendCommandProcessor
 from tapper.model import constants
+from tapper.model.errors import SendError
+from tapper.model.errors import SendParseError
 from tapper.model.types_ import Signal
 from tapper.signal.wrapper import ListenerWrapper
 from tapper.state import keeper
@@ -217,3 +220,79 @@ class TestSendCommandProcessor:
 
         self.sender.send("$(scroll_lock off;caps on)")
         assert self.all_signals == [*click("scroll_lock"), *click("caps_lock")]
+
+    def test_schedule(self) -> None:
+        clock = [100.0]
+        deadlines = []
+
+        def oversleep(deadline: float) -> None:
+            deadlines.append(deadline)
+            clock[0] = deadline + 0.003
+
+        self.sender.sleep_until_fn = oversleep
+        self.sender.get_time_fn = lambda: clock[0]
+        self.sender.send("ab$(50ms)c", interval=0.01, press_duration=0.002)
+        assert deadlines == pytest.approx(
+            [100.01, 100.012, 100.022, 100.024, 100.074, 100.084, 100.086]
+        )
+        assert len(self.all_signals) == 6  # sleeps went to sleep_until_fn
+
+    def test_schedule_behind(self) -> None:
+        clock = [0.0]
+        deadlines = []
+
+        def sleep_until(deadline: float) -> None:
+            deadlines.append(deadline)
+            clock[0] = deadline + (5 if len(deadlines) == 1 else 0)  # paused
+
+        self.sender.sleep_until_fn = sleep_until
+        self.sender.get_time_fn = lambda: clock[0]
+        self.sender.send("abc", interval=0.1)
+        assert deadlines == pytest.approx([0.1, 5.2, 5.3])
+
+    def test_stream_strings(self) -> None:
+        def lines() -> Iterator[str]:
+            yield "aB"
+            assert self.all_signals == [*click("a"), down("left_shift"), *click("b")]
+            yield "C$(ctrl+v)"
+
+        self.sender.send(lines())
+        assert self.all_signals[5:] == [
+            *click("c"),
+            up("left_shift"),
+            down("left_control"),
+            *click("v"),
+            up("left_control"),
+            down("left_shift"),
+            up("left_shift"),
+        ]
+        assert not self.pressed.get_state(now)
+
+    def test_stream_error_when_reached(self) -> None:
+        with pytest.raises(SendParseError):
+            self.sender.send("$(esc)ab⊕", stream=True)
+        assert self.all_signals == [*click("escape")]
+
+    def test_routes(self) -> None:
+        self.sender.send("a$(lmb)")
+        routes = self.sender._routes
+        assert routes["a"][0] is self.sender.kb_controller
+        assert routes["lmb"][0] is self.mc
+        assert routes["left_mouse_button"][1] == self.mc.press
+
+        mc = MouseController()
+        mc._tracker, mc._commander = self.mc._tracker, self.mc._commander
+        mc._emul_keeper = self.mc._emul_keeper
+        self.sender.mouse_controller = mc
+        self.sender.send("$(rmb)")
+        assert self.sender._routes["lmb"][0] is mc
+        assert self.all_signals[-2:] == [*click("right_mouse_button")]
+
+    def test_compiled_command_sent_without_lookups(self) -> None:
+        self.sender.send("a$(lmb)")
+        self.sender._routes = {}
+        self.sender._handlers = {}
+        self.sender.send("a$(lmb)")
+        assert self.all_signals == [*click("a"), *click("left_mouse_button")] * 2
+        with pytest.raises(SendError):
+            self.sender.send("b")
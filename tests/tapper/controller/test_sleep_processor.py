@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import time
 from dataclasses import dataclass
 from dataclasses import field
@@ -7,6 +9,7 @@ from unittest.mock import call
 from unittest.mock import MagicMock
 
 import pytest
+from tapper.controller import flow_control
 from tapper.controller.sleep_processor import SleepCommandProcessor
 from tapper.controller.sleep_processor import StopTapperActionException
 
@@ -157,3 +160,158 @@ class TestRealSleep:
         assert_time_equals(time_start + 0.1, time.perf_counter())
         assert kill_c.count >= 2
         assert pause_c.count >= 2
+
+
+class TestSleepAsync:
+    @pytest.fixture
+    def processor(self) -> Any:
+        kill_id = flow_control.kill_id
+        yield SleepCommandProcessor(
+            check_interval=10,
+            kill_check_fn=lambda: flow_control.kill_id != kill_id,
+            pause_check_fn=flow_control.should_be_paused,
+        )
+        flow_control.set_paused(False)
+
+    def test_correct_time_slept(self, processor: SleepCommandProcessor) -> None:
+        time_start = time.perf_counter()
+        asyncio.run(processor.sleep_async(0.1))
+        assert_time_equals(time_start + 0.1, time.perf_counter())
+
+    def test_many_concurrent(self, processor: SleepCommandProcessor) -> None:
+        async def sleep_many() -> None:
+            await asyncio.gather(*[processor.sleep_async("50ms") for _ in range(1000)])
+
+        time_start = time.perf_counter()
+        asyncio.run(sleep_many())
+        assert time.perf_counter() - time_start < 0.5
+
+    def test_kill_wakes_at_once(self, processor: SleepCommandProcessor) -> None:
+        threading.Timer(0.05, flow_control.kill).start()
+        time_start = time.perf_counter()
+        with pytest.raises(StopTapperActionException):
+            asyncio.run(processor.sleep_async(5))
+        assert_time_equals(time_start + 0.05, time.perf_counter())
+
+    def test_unpause_wakes_at_once(self, processor: SleepCommandProcessor) -> None:
+        flow_control.set_paused(True)
+        threading.Timer(0.05, flow_control.set_paused, [False]).start()
+        time_start = time.perf_counter()
+        asyncio.run(processor.sleep_async(0))
+        assert_time_equals(time_start + 0.05, time.perf_counter())
+
+    def test_killed_while_paused(self, processor: SleepCommandProcessor) -> None:
+        flow_control.set_paused(True)
+
+        def kill_and_unpause() -> None:
+            flow_control.kill()
+            flow_control.set_paused(False)
+
+        threading.Timer(0.05, kill_and_unpause).start()
+        with pytest.raises(StopTapperActionException):
+            asyncio.run(processor.sleep_async(5))
+
+
+class TestSleepWakeOnChange:
+    waits: list[float]
+
+    @pytest.fixture
+    def processor(self) -> Any:
+        self.waits = []
+        kill_id = flow_control.kill_id
+
+        def wait_change(since: int, timeout: float) -> None:
+            self.waits.append(timeout)
+            flow_control.wait_change_blocking(since, timeout)
+
+        yield SleepCommandProcessor(
+            check_interval=10,
+            kill_check_fn=lambda: flow_control.kill_id != kill_id,
+            pause_check_fn=flow_control.should_be_paused,
+            wait_change_fn=wait_change,
+        )
+        flow_control.set_paused(False)
+
+    def test_sleeps_once(self, processor: SleepCommandProcessor) -> None:
+        time_start = time.perf_counter()
+        processor.sleep(0.1)
+        assert_time_equals(time_start + 0.1, time.perf_counter())
+        assert len(self.waits) == 1
+
+    def test_kill_wakes_at_once(self, processor: SleepCommandProcessor) -> None:
+        threading.Timer(0.05, flow_control.kill).start()
+        time_start = time.perf_counter()
+        with pytest.raises(StopTapperActionException):
+            processor.sleep(5)
+        assert_time_equals(time_start + 0.05, time.perf_counter())
+
+    def test_unpause_wakes_at_once(self, processor: SleepCommandProcessor) -> None:
+        flow_control.set_paused(True)
+        threading.Timer(0.05, flow_control.set_paused, [False]).start()
+        time_start = time.perf_counter()
+        processor.sleep(0)
+        assert_time_equals(time_start + 0.05, time.perf_counter())
+
+    def test_pause_counts_as_slept(self, processor: SleepCommandProcessor) -> None:
+        threading.Timer(0.02, flow_control.set_paused, [True]).start()
+        threading.Timer(0.06, flow_control.set_paused, [False]).start()
+        time_start = time.perf_counter()
+        processor.sleep(0.1)
+        assert_time_equals(time_start + 0.1, time.perf_counter())
+        assert len(self.waits) == 3  # sleep, pause, rest of sleep
+
+    def test_killed_while_paused(self, processor: SleepCommandProcessor) -> None:
+        flow_control.set_paused(True)
+
+        def kill_and_unpause() -> None:
+            flow_control.kill()
+            flow_control.set_paused(False)
+
+        threading.Timer(0.05, kill_and_unpause).start()
+        with pytest.raises(StopTapperActionException):
+            processor.sleep(5)
+
+
+class TestSleepPrecision:
+    def test_spins_before_deadline(self) -> None:
+        clock = [0.0]
+        waits: list[float] = []
+        spins = []
+
+        def wait_change(since: int, timeout: float) -> None:
+            waits.append(timeout)
+            clock[0] += timeout + 0.0001
+
+        def actual_sleep(seconds: float) -> None:
+            spins.append(seconds)
+            clock[0] += 0.0005
+
+        processor = SleepCommandProcessor(
+            check_interval=1,
+            kill_check_fn=lambda: False,
+            pause_check_fn=lambda: False,
+            actual_sleep_fn=actual_sleep,
+            get_time_fn=lambda: clock[0],
+            wait_change_fn=wait_change,
+            precision=0.002,
+        )
+        processor.sleep(1)
+        assert waits == [pytest.approx(0.998)]
+        assert spins == [0] * 4
+        assert 1 <= clock[0] < 1.0005
+
+    def test_real_time(self) -> None:
+        processor = SleepCommandProcessor(
+            check_interval=1,
+            kill_check_fn=lambda: False,
+            pause_check_fn=lambda: False,
+            wait_change_fn=flow_control.wait_change_blocking,
+            precision=0.002,
+        )
+        deadline = time.perf_counter() + 0.02
+        processor.sleep_until(deadline)
+        assert 0 <= time.perf_counter() - deadline < 0.005
+
+    def test_invalid_precision(self) -> None:
+        with pytest.raises(ValueError):
+            SleepCommandProcessor(1, lambda: False, lambda: False, precision=-1)
@@ -1,9 +1,15 @@
+import math
+import time
 from functools import partial
 from typing import Any
 from typing import Callable
 from typing import Optional
 
 import pytest
+from tapper.controller.window.window_api import win_filter
+from tapper.controller.window.window_api import WindowController
+from tapper.controller.window.window_api import WindowTracker
+from tapper.controller.window.window_cache import CachedWindowTracker
 from tapper.model.window import Window
 
 
@@ -159,3 +165,105 @@ class TestWin32WindowController:
         assert not self.handles_commanded
         assert win_command(exec="xec")
         assert self.handles_commanded[0] == self.test_window.handle
+
+
+class FakeForegroundTracker(WindowTracker):
+    fore: Optional[Window]
+    calls: int
+
+    def __init__(self, fore: Optional[Window] = None) -> None:
+        self.fore = fore
+        self.calls = 0
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def get_open(self, *args: Any, **kwargs: Any) -> list[Window]:
+        return [self.fore] if self.fore else []
+
+    def active(self, *args: Any, **kwargs: Any) -> Optional[Window]:
+        self.calls += 1
+        return win_filter(self.fore, *args, **kwargs)
+
+
+class TestCachedWindowTracker:
+    notepad = Window("notes - Notepad", "notepad.exe", 1, 10)
+    idea = Window("project - IDEA", "idea64.exe", 2, 20)
+
+    def test_active_from_snapshot(self) -> None:
+        source = FakeForegroundTracker(self.notepad)
+        cache = CachedWindowTracker(source, interval=100)
+        cache.refresh()
+        assert source.calls == 1
+
+        assert cache.active() == self.notepad
+        assert cache.active(exec="notepad.exe", strict=True) == self.notepad
+        assert cache.active(title="notepad") == self.notepad
+        assert cache.active(exec="idea") is None
+        assert cache.active(handle=20) is None
+        assert source.calls == 1
+        assert cache.hits == 5
+        assert cache.misses == 0
+
+    def test_stale_snapshot_refetched(self) -> None:
+        source = FakeForegroundTracker(self.notepad)
+        cache = CachedWindowTracker(source, interval=100)
+        assert cache.staleness() == math.inf
+
+        assert cache.active("notepad") == self.notepad
+        assert (cache.hits, cache.misses) == (0, 1)
+        assert cache.staleness() < 1
+
+        source.fore = self.idea
+        assert cache.active("notepad") == self.notepad
+        cache.max_age = 0
+        assert cache.active("notepad") is None
+        assert cache.active("idea") == self.idea
+        assert (cache.hits, cache.misses) == (1, 3)
+
+    def test_on_foreground_changed(self) -> None:
+        source = FakeForegroundTracker(self.notepad)
+        cache = CachedWindowTracker(source, interval=100)
+        cache.refresh()
+        source.fore = self.idea
+        assert cache.active("idea") is None
+        cache.on_foreground_changed()
+        assert cache.active("idea") == self.idea
+
+    def test_watcher_refreshes(self) -> None:
+        source = FakeForegroundTracker(self.notepad)
+        cache = CachedWindowTracker(source, interval=0.001, max_age=100)
+        cache.start()
+        try:
+            source.fore = self.idea
+            deadline = time.perf_counter() + 2
+            while cache.active("idea") is None and time.perf_counter() < deadline:
+                time.sleep(0.001)
+            assert cache.active("idea") == self.idea
+            assert cache.misses == 0
+        finally:
+            cache.stop()
+        assert cache._watcher is None
+
+    def test_controller_caches_for_conditions(self) -> None:
+        source = FakeForegroundTracker(self.notepad)
+        wc = WindowController()
+        wc._tracker, wc._commander = source, None  # type: ignore
+        wc._foreground_cache_interval = 100
+        wc._init()
+        assert wc.foreground_cache is not None
+        assert wc.foreground_cache.source is source
+        wc._init()
+        assert wc.foreground_cache.source is source
+
+        wc.foreground_cache.refresh()
+        assert wc.active_cached(exec="notepad")
+        assert wc.foreground_cache.hits == 1
+
+        source.fore = self.idea  # like after to_active
+        assert wc.active(exec="idea")
+        assert not wc.active_cached(exec="idea")
+        assert wc.foreground_cache.hits == 2
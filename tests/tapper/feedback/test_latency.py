@@ -0,0 +1,94 @@
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+from tapper.feedback import latency
+from tapper.feedback.latency import bucket_highest
+from tapper.feedback.latency import bucket_of
+from tapper.feedback.latency import LatencyHistogram
+from tapper.feedback.latency import LatencyRecorder
+
+
+@given(st.integers(min_value=0, max_value=10**12))
+def test_bucket_bounds(ns: int) -> None:
+    bucket = bucket_of(ns)
+    highest = bucket_highest(bucket)
+    assert ns <= highest
+    assert highest - ns <= ns / 2**latency.SUB_BUCKET_BITS * 2
+    assert bucket_of(highest) == bucket
+
+
+def test_small_values_exact() -> None:
+    for ns in range(2**latency.SUB_BUCKET_BITS):
+        assert bucket_highest(bucket_of(ns)) == ns
+
+
+class TestLatencyHistogram:
+    def test_empty(self) -> None:
+        assert LatencyHistogram().percentile(50) == 0
+
+    def test_percentiles(self) -> None:
+        h = LatencyHistogram()
+        for ns in range(1, 1001):
+            h.add(ns * 1000)
+        assert h.count == 1000
+        assert h.max_ns == 1_000_000
+        assert h.percentile(50) == pytest.approx(500_000, rel=0.07)
+        assert h.percentile(99) == pytest.approx(990_000, rel=0.07)
+        assert h.percentile(100) == 1_000_000
+
+    def test_single_outlier(self) -> None:
+        h = LatencyHistogram()
+        for _ in range(99):
+            h.add(100)
+        h.add(10**9)
+        assert h.percentile(50) == pytest.approx(100, rel=0.07)
+        assert h.percentile(99) == pytest.approx(100, rel=0.07)
+        assert h.max_ns == 10**9
+
+
+class TestLatencyRecorder:
+    def test_instrument(self) -> None:
+        recorder = LatencyRecorder(size=16, log_interval=None)
+        fn = recorder.instrument(latency.MATCH, lambda x: x * 2)
+        assert fn(3) == 6
+        assert fn(4) == 8
+        snapshot = recorder.snapshot()
+        assert list(snapshot) == [latency.MATCH]
+        assert snapshot[latency.MATCH].count == 2
+        assert snapshot[latency.MATCH].max_ns > 0
+
+    def test_exception_recorded(self) -> None:
+        recorder = LatencyRecorder(size=16, log_interval=None)
+
+        def fail() -> None:
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            recorder.instrument("custom", fail)()
+        assert recorder.snapshot()["custom"].count == 1
+
+    def test_ring_keeps_recent(self) -> None:
+        recorder = LatencyRecorder(size=8, log_interval=None)
+        hook = recorder.stage_id(latency.HOOK)
+        run = recorder.stage_id(latency.RUN)
+        for _ in range(10):
+            recorder.record(hook, 10**6)
+        for _ in range(5):
+            recorder.record(run, 100)
+        assert recorder.recorded == 15
+        snapshot = recorder.snapshot()
+        assert snapshot[latency.HOOK].count == 3
+        assert snapshot[latency.RUN].count == 5
+        assert snapshot[latency.RUN].max_ns == 100
+
+    def test_instrument_method(self) -> None:
+        class Processor:
+            def on_signal(self, signal: str) -> str:
+                return signal
+
+        recorder = LatencyRecorder(size=8, log_interval=None)
+        processor = Processor()
+        recorder.instrument_method(processor, "on_signal", latency.ON_SIGNAL)
+        assert processor.on_signal("a") == "a"
+        assert recorder.snapshot()[latency.ON_SIGNAL].count == 1
+        assert "on_signal: p50" in recorder.report()
@@ -19,13 +19,28 @@ def test_get_triggers() -> None:
     outer_tap3 = stap("out3")
     outer_group = SGroup([outer_tap1, inner_group, outer_tap2, outer_tap3])
 
-    assert outer_group.get_main_triggers(constants.KeyDirBool.DOWN) == [
+    assert outer_group.get_main_triggers(constants.KeyDirBool.DOWN) == {
         "out1",
         "in2",
         "out3",
-    ]
+    }
 
-    assert outer_group.get_main_triggers(constants.KeyDirBool.UP) == ["in1", "out2"]
+    assert outer_group.get_main_triggers(constants.KeyDirBool.UP) == {"in1", "out2"}
 
-    assert inner_tap1.get_main_triggers(constants.KeyDirBool.DOWN) == []
-    assert inner_tap1.get_main_triggers(constants.KeyDirBool.UP) == ["in1"]
+    assert inner_tap1.get_main_triggers(constants.KeyDirBool.DOWN) == set()
+    assert inner_tap1.get_main_triggers(constants.KeyDirBool.UP) == {"in1"}
+
+
+def test_triggers_updated_on_add() -> None:
+    inner_group = SGroup([stap("in1")])
+    outer_group = SGroup([inner_group])
+    assert outer_group.get_main_triggers(constants.KeyDirBool.DOWN) == {"in1"}
+
+    inner_group.add(stap("in2"), stap("in3", constants.KeyDirBool.UP))
+    assert inner_group.get_main_triggers(constants.KeyDirBool.DOWN) == {"in1", "in2"}
+    assert outer_group.get_main_triggers(constants.KeyDirBool.DOWN) == {"in1", "in2"}
+    assert outer_group.get_main_triggers(constants.KeyDirBool.UP) == {"in3"}
+
+    inner_group.children.pop()
+    inner_group.refresh_main_triggers()
+    assert outer_group.get_main_triggers(constants.KeyDirBool.UP) == set()
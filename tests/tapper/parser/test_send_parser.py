@@ -1,3 +1,4 @@
+import tracemalloc
 from typing import Callable
 
 import pytest
@@ -13,6 +14,7 @@ from tapper.parser.send_parser import default_shift
 from tapper.parser.send_parser import ki_shift_down
 from tapper.parser.send_parser import ki_shift_up
 from tapper.parser.send_parser import SendParser
+from tapper.parser.send_parser import split_combo
 from tapper.util import datastructs
 
 down = constants.KeyDir.DOWN
@@ -368,3 +370,100 @@ class TestShiftIn:
             KI("u", click),
             KI(rshift, down),
         ]
+
+
+class TestCompiled:
+    def test_cached(self) -> None:
+        parser = initializer.default_send_parser()
+        first = parser.compile("$(ctrl+c)ab")
+        assert parser.compile("$(ctrl+c)ab") is first
+        assert isinstance(first, tuple)
+        assert parser.programs.stats.hits == 1
+
+    def test_immutable(self, parser: SendParser) -> None:
+        with pytest.raises(AttributeError):
+            parser.compile("a")[0].dir = down  # type: ignore
+
+    def test_parse_returns_copy(self, parser: SendParser) -> None:
+        parser.parse("qw").clear()
+        assert parser.parse("qw") == key_ins("qw")
+
+    def test_bounded(self) -> None:
+        parser = initializer.default_send_parser()
+        for i in range(2000):
+            parser.compile(f"$(x{i}y{i})")
+        assert len(parser.programs) == parser.programs.max_entries
+
+    def test_shift_in_does_not_change_default(self, parser: SendParser) -> None:
+        parser.parse("u", "right_shift")
+        assert parser.parse("U") == [ki_shift_down(), KI("u"), ki_shift_up()]
+        assert default_shift == "left_shift"
+
+
+class TestLexer:
+    def test_shift_runs_around_combos(self, parse: ParseFn) -> None:
+        assert parse("AB$(ctrl+c)Cd") == [
+            ki_shift_down(),
+            *key_ins("ab"),
+            ki_shift_up(),
+            KI("left_control", down),
+            KI("c"),
+            KI("left_control", up),
+            ki_shift_down(),
+            KI("c"),
+            ki_shift_up(),
+            KI("d"),
+        ]
+
+    def test_unclosed_combo_is_text(self, parse: ParseFn) -> None:
+        assert parse("$(a") == [ki_shift_down(), *key_ins("49"), ki_shift_up(), KI("a")]
+
+    def test_set_wrap(self) -> None:
+        parser = initializer.default_send_parser()
+        assert parser.parse("$(esc)") == [KI("escape")]
+        parser.set_wrap(r"<<_>")
+        assert parser.parse("<<esc>") == [KI("escape")]
+
+    @pytest.mark.parametrize(
+        "content, chains",
+        [
+            ("a", ["a"]),
+            ("a;b", ["a", "b"]),
+            ("a+b+;;c", ["a+b+;", "c"]),
+            (";", [";"]),
+            ("ctrl+;", ["ctrl+;"]),
+            ("a;", ["a", ""]),
+        ],
+    )
+    def test_split_combo(self, content: str, chains: list[str]) -> None:
+        assert split_combo(content) == chains
+
+    def test_long_chain(self, parse: ParseFn) -> None:
+        assert parse("$(" + ";".join(["q"] * 500) + ")") == key_ins("q" * 500)
+
+
+class TestStream:
+    def test_same_as_parse(self, parser: SendParser) -> None:
+        command = "Hello, $(ctrl+a;b 2x)World!\n" * 30
+        assert list(parser.stream(command)) == parser.parse(command)
+        assert list(parser.stream(command, "right_shift")) == parser.parse(
+            command, "right_shift"
+        )
+
+    def test_strings_as_one(self, parser: SendParser) -> None:
+        assert list(parser.stream(["He", "LLo", "$(esc)"])) == parser.parse(
+            "HeLLo$(esc)"
+        )
+
+    def test_lazy(self, parser: SendParser) -> None:
+        stream = parser.stream("a" * 100_000 + "⊕")
+        assert next(stream) == KI("a")
+
+    def test_flat_memory(self, parser: SendParser) -> None:
+        text = "Lorem ipsum dolor sit amet.\n" * 40_000
+        tracemalloc.start()
+        for _ in parser.stream(text):
+            pass
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < 100_000
@@ -0,0 +1,80 @@
+import math
+import time
+from functools import partial
+
+from tapper.model.tap_tree_shadow import SGroup
+from tapper.model.tap_tree_shadow import STap
+from tapper.model.trigger import MainKey
+from tapper.model.trigger import Trigger
+from tapper.signal.condition_order import ConditionOrdering
+from tapper.signal.condition_order import ConditionStats
+
+
+def named(name: str, fn, *args) -> partial:
+    condition = partial(fn, *args)
+    condition.__name__ = name
+    return condition
+
+
+def slow_true() -> bool:
+    time.sleep(0.001)
+    return True
+
+
+def test_rank() -> None:
+    assert ConditionStats().rank == 0
+    assert ConditionStats(evaluated=10, rejected=0, total_ns=10).rank == math.inf
+    cheap_selective = ConditionStats(evaluated=10, rejected=9, total_ns=100)
+    cheap_rare = ConditionStats(evaluated=10, rejected=1, total_ns=100)
+    costly_selective = ConditionStats(evaluated=10, rejected=9, total_ns=100000)
+    assert cheap_selective.rank < cheap_rare.rank < costly_selective.rank
+
+
+def test_reorder_cheap_rejecting_first() -> None:
+    flag = [False]
+    slow = named("slow", slow_true)
+    cheap = named("cheap", flag.__getitem__, 0)
+    stap = STap(Trigger(MainKey(["a"])), None, None, None)
+    stap.trigger_conditions = [slow, cheap]
+
+    ordering = ConditionOrdering(reorder_every=3)
+    for _ in range(3):
+        for fn in stap.trigger_conditions:
+            start = time.perf_counter_ns()
+            result = fn()
+            ordering.record(fn, time.perf_counter_ns() - start, result)
+    ordering.reorder([stap])
+
+    assert stap.trigger_conditions == [cheap, slow]
+    assert ordering.stats["cheap"].reject_rate == 1
+    assert ordering.stats["slow"].evaluated == 3
+    assert "cheap" in ordering.report().splitlines()[0]
+
+
+def test_unmeasured_keep_declared_order() -> None:
+    first, second = named("a", bool), named("b", bool)
+    group = SGroup()
+    group.trigger_conditions = [first, second]
+    ConditionOrdering().reorder([group])
+    assert group.trigger_conditions == [first, second]
+
+
+def test_reorder_off_signal_thread() -> None:
+    first, second = named("a", bool), named("b", bool)
+    group = SGroup()
+    group.trigger_conditions = [first, second]
+    ordering = ConditionOrdering(reorder_every=2)
+    ordering.record(first, 10, True)
+    ordering.record(second, 10, False)
+    ordering.on_signal([group])
+    ordering.on_signal([group])
+    assert group.trigger_conditions == [first, second]
+
+    ordering.start()
+    try:
+        deadline = time.perf_counter() + 2
+        while group.trigger_conditions != [second, first]:
+            assert time.perf_counter() < deadline
+            time.sleep(0.001)
+    finally:
+        ordering.stop()
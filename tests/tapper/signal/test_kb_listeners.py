@@ -53,3 +53,58 @@ class TestWin32Listener:
             assert callback_result == actual_result
 
         listener.keyboard_callback(KeyboardEvent(vkCode=c, action=12345, time=0))
+
+
+@pytest.mark.skipif(sys.platform != constants.OS.linux, reason="")
+class TestLinuxListener:
+    class FakeDevice:
+        def __init__(self, events: list) -> None:
+            self.events = events
+            self.written: list = []
+
+        def active_keys(self) -> list[int]:
+            return []
+
+        def grab(self) -> None:
+            pass
+
+        def read_loop(self) -> list:
+            return self.events
+
+        def write_event(self, event) -> None:
+            self.written.append(event)
+
+    def test_repeat(self) -> None:
+        import evdev
+        from evdev import ecodes
+        from tapper.signal.keyboard.linux_kb_listener import (
+            LinuxKeyboardSignalListener,
+        )
+
+        up, down, repeat = [
+            evdev.InputEvent(0, 0, ecodes.EV_KEY, ecodes.KEY_A, value)
+            for value in range(3)
+        ]
+        syn = evdev.InputEvent(0, 0, ecodes.EV_SYN, ecodes.SYN_REPORT, 0)
+        kb = self.FakeDevice([down, syn, repeat, syn, repeat, syn, up, syn])
+        listener = LinuxKeyboardSignalListener()
+        listener.virtual_kb = self.FakeDevice([])  # type: ignore
+        signals: list[Signal] = []
+        repeats: list[str] = []
+
+        def on_signal(signal: Signal) -> ListenerResult:
+            signals.append(signal)
+            return ListenerResult(bool(signal[1]))  # suppress down, propagate up
+
+        listener.on_signal = on_signal  # type: ignore
+        listener.on_repeat = (  # type: ignore
+            lambda symbol: repeats.append(symbol) or ListenerResult.SUPPRESS
+        )
+        listener.keyboard_loop(kb)  # type: ignore
+
+        assert signals == [
+            ("a", constants.KeyDirBool.DOWN),
+            ("a", constants.KeyDirBool.UP),
+        ]
+        assert repeats == ["a", "a"]
+        assert listener.virtual_kb.written == [syn, syn, syn, up, syn]  # type: ignore
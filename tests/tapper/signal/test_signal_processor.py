@@ -1,4 +1,7 @@
+import random
 import time
+from functools import partial
+from typing import Callable
 
 import pytest
 from tapper.action import wrapper
@@ -12,6 +15,8 @@ from tapper.model.trigger import MainKey
 from tapper.model.trigger import Trigger
 from tapper.model.types_ import Action
 from tapper.model.types_ import Signal
+from tapper.signal.condition_order import ConditionOrdering
+from tapper.signal.dispatch_index import DispatchIndex
 from tapper.signal.signal_processor import SignalProcessor
 from tapper.state import keeper
 from testutil_model import Dummy
@@ -215,6 +220,172 @@ class TestSignalProcessor:
             self.runner.actions_ran[1] == self.runner.actions_ran[2] == [generic_action]
         )
 
+    def test_condition_evaluated_once_per_signal(self) -> None:
+        calls = []
+        condition = partial(calls.append, "checked")  # returns None: falsy
+        taps = [tap([["a"]]) for _ in range(3)]
+        for stap in taps:
+            stap.trigger_conditions = [condition]
+        group = SGroup().add(tap([["a"]]))
+        group.trigger_conditions = [condition]
+        self.root.add(*taps, group)
+
+        assert self.processor.on_signal(down("a")) == ListenerResult.PROPAGATE
+        assert calls == ["checked"]
+        assert self.processor.conditions_evaluated == 1
+        assert self.processor.conditions_saved == 3
+
+        self.processor.on_signal(down("a"))
+        assert len(calls) == 2
+
+    def test_condition_ordering_same_result(self) -> None:
+        calls = []
+
+        def slow_true() -> bool:
+            calls.append("slow")
+            return True
+
+        flag = [False]
+        slow = partial(slow_true)
+        slow.__name__ = "slow"
+        cheap = partial(flag.__getitem__, 0)
+        cheap.__name__ = "cheap"
+        ordering = ConditionOrdering(reorder_every=2)
+        self.processor.condition_ordering = ordering
+        conditional = tap([["a"]], action=lambda: "conditional")
+        conditional.trigger_conditions = [slow, cheap]
+        self.root.add(tap([["a"]]), conditional)
+
+        ordering.start()
+        try:
+            for _ in range(2):
+                assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+            deadline = time.perf_counter() + 2
+            while conditional.trigger_conditions != [cheap, slow]:
+                assert time.perf_counter() < deadline
+                time.sleep(0.001)
+        finally:
+            ordering.stop()
+        for _ in range(2):
+            assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        assert calls == ["slow"] * 2  # not called once reordered
+        assert self.runner.actions_ran[0] == [generic_action] * 4
+
+        flag[0] = True
+        self.processor.on_signal(down("a"))
+        assert self.runner.actions_ran[0][-1] is conditional.action
+
+    def test_throttle(self) -> None:
+        throttled = tap([["a"]], action=lambda: "throttled")
+        throttled.throttle = 0.05
+        self.root.add(tap([["a"]]), throttled)
+
+        for _ in range(3):
+            assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        assert self.runner.actions_ran[0] == [throttled.action]
+        time.sleep(0.06)
+        self.processor.on_signal(down("a"))
+        assert self.runner.actions_ran[0][-1] is throttled.action
+
+    def test_debounce(self) -> None:
+        stap = tap([["a"]])
+        stap.debounce = 0.05
+        self.root.add(stap)
+
+        for delay in [0, 0, 0.03, 0.03]:  # last is 0.06 since the first signal
+            time.sleep(delay)
+            assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        assert len(self.runner.actions_ran[0]) == 1
+        time.sleep(0.06)
+        assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        assert len(self.runner.actions_ran[0]) == 2
+
+    def test_debounce_counts_matched_signals(self) -> None:
+        now, active = [0.0], [True]
+        self.processor.get_time_fn = lambda: now[0]
+        stap = tap([["a"]])
+        stap.debounce = 0.05
+        group = SGroup().add(stap)
+        group.trigger_conditions = [lambda: active[0]]
+        self.root.add(group)
+
+        for now[0], active[0], result, triggered in [
+            (0, True, ListenerResult.SUPPRESS, 1),
+            (0.1, False, ListenerResult.PROPAGATE, 1),
+            (0.12, True, ListenerResult.SUPPRESS, 2),
+            (0.15, True, ListenerResult.SUPPRESS, 2),
+        ]:
+            assert self.processor.on_signal(down("a")) == result
+            assert len(self.runner.actions_ran[0]) == triggered
+
+    def test_ignore_autorepeat(self) -> None:
+        stap = tap([["a"]])
+        stap.ignore_autorepeat = True
+        self.root.add(stap)
+
+        assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        self.press("a")
+        assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        self.state_keeper.key_released("a")
+        assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        assert len(self.runner.actions_ran[0]) == 2
+
+    def test_timing_blocked_propagates_if_tap_does(self) -> None:
+        stap = tap([["a"]], result=ListenerResult.PROPAGATE)
+        stap.throttle = 10
+        self.root.add(tap([["a"]]), stap)
+
+        for _ in range(2):
+            assert self.processor.on_signal(down("a")) == ListenerResult.PROPAGATE
+        assert len(self.runner.actions_ran[0]) == 1
+
+    def test_timing_after_conditions(self) -> None:
+        calls = []
+        stap = tap([["a"]])
+        stap.throttle = 10
+        stap.trigger_conditions = [lambda: calls.append(1) or True]
+        group = SGroup().add(stap)
+        group.trigger_conditions = [lambda: calls.append(2) or True]
+        self.root.add(group)
+
+        self.processor.on_signal(down("a"))
+        self.processor.on_signal(down("a"))
+        assert calls == [2, 1, 2, 1]
+        assert len(self.runner.actions_ran[0]) == 1
+
+    def test_repeat_reuses_press_result(self) -> None:
+        self.root.add(tap([["a"]]), tap([["b"]], result=ListenerResult.PROPAGATE))
+
+        assert self.processor.on_repeat("a") == ListenerResult.PROPAGATE
+        assert self.processor.on_signal(down("a")) == ListenerResult.SUPPRESS
+        assert self.processor.on_signal(down("b")) == ListenerResult.PROPAGATE
+        for _ in range(3):
+            assert self.processor.on_repeat("a") == ListenerResult.SUPPRESS
+            assert self.processor.on_repeat("b") == ListenerResult.PROPAGATE
+        assert len(self.runner.actions_ran[0]) == 2
+
+    def test_trigger_on_repeat(self) -> None:
+        repeating = tap([["a"]], action=lambda: "repeating")
+        repeating.trigger_on_repeat = True
+        repeating.trigger_conditions = [lambda: self.state_keeper.is_pressed("b")]
+        self.root.add(tap([["a"]], result=ListenerResult.PROPAGATE), repeating)
+
+        self.processor.on_signal(down("a"))
+        assert self.processor.on_repeat("a") == ListenerResult.PROPAGATE
+        self.press("b")
+        assert self.processor.on_repeat("a") == ListenerResult.SUPPRESS
+        assert self.runner.actions_ran[0] == [generic_action, repeating.action]
+
+    def test_held_triggers_on_repeat(self) -> None:
+        self.root.add(tap([["a"]], time_main=0.05))
+
+        self.press("a")
+        assert self.processor.on_signal(down("a")) == ListenerResult.PROPAGATE
+        assert self.processor.on_repeat("a") == ListenerResult.PROPAGATE
+        self.press({"a": 0.06})
+        assert self.processor.on_repeat("a") == ListenerResult.SUPPRESS
+        assert len(self.runner.actions_ran[0]) == 1
+
     """UTIL"""
 
     def press(self, keys: str | list[str] | dict[str, float]) -> None:
@@ -225,4 +396,66 @@ class TestSignalProcessor:
         if isinstance(keys, dict):
             now = time.perf_counter()
             for symbol, offset in keys.items():
-                self.state_keeper.pressed_keys[symbol] = now - offset
+                self.state_keeper.key_released(symbol)
+                self.state_keeper.key_pressed(symbol, at=now - offset)
+
+
+class TestDispatchIndex:
+    symbols = ["a", "b", left_control, right_control, left_alt, "f1"]
+
+    def random_tree(self, rnd: random.Random, depth: int, flags: list[bool]) -> SGroup:
+        group = SGroup()
+        group.trigger_conditions = self.random_conditions(rnd, flags)
+        for _ in range(rnd.randint(0, 5)):
+            if depth and rnd.random() < 0.3:
+                group.add(self.random_tree(rnd, depth - 1, flags))
+            else:
+                keys = [
+                    rnd.sample(self.symbols, rnd.randint(1, 2))
+                    for _ in range(rnd.randint(1, 3))
+                ]
+                direction = rnd.choice([KeyDirBool.DOWN, KeyDirBool.UP])
+                stap = tap(keys, action=lambda: None, direction=direction)
+                stap.trigger_conditions = self.random_conditions(rnd, flags)
+                group.add(stap)
+        return group
+
+    @staticmethod
+    def random_conditions(rnd: random.Random, flags: list[bool]) -> list[Callable]:
+        return [
+            partial(flags.__getitem__, rnd.randrange(len(flags)))
+            for _ in range(rnd.randint(0, 2))
+        ]
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_same_as_recursive_walk(self, seed: int) -> None:
+        rnd = random.Random(seed)
+        flags = [True] * 4
+        root = self.random_tree(rnd, 3, flags)
+        state_keeper = initializer.default_keeper_pressed()
+        processor = SignalProcessor(root, SGroup(), state_keeper, DummyActionRunner())
+        processor.compile()
+        index = processor.root_index
+        now = time.perf_counter()
+
+        for _ in range(50):
+            flags[:] = [rnd.random() < 0.7 for _ in flags]
+            state_keeper.pressed_mask = 0
+            for symbol in rnd.sample(self.symbols, rnd.randint(0, 3)):
+                state_keeper.key_pressed(symbol, at=now)
+            for symbol in self.symbols:
+                for direction in [KeyDirBool.DOWN, KeyDirBool.UP]:
+                    expected = processor.match(root, symbol, direction, now, {})
+                    actual = processor.match_index(index, symbol, direction, now, {})  # type: ignore
+                    assert actual is expected
+
+    def test_candidates_in_priority_order(self) -> None:
+        first, second, nested = tap([["a"]]), tap([ctrl, ["a"]]), tap([["a"]])
+        group = SGroup().add(nested)
+        root = SGroup().add(first, group, second, tap([["b"]]))
+        index = DispatchIndex.compile(root)
+
+        candidates = index.get("a", KeyDirBool.DOWN)
+        assert [c.tap for c in candidates] == [second, nested, first]
+        assert candidates[1].ancestors[1] is group
+        assert not index.get("a", KeyDirBool.UP)
@@ -0,0 +1,171 @@
+import os
+from pathlib import Path
+
+import pytest
+from tapper.boot import initializer
+from tapper.model.constants import KeyDirBool
+from tapper.model.constants import ListenerResult
+from tapper.model.types_ import Signal
+from tapper.signal import trace
+from tapper.signal.trace import read_trace
+from tapper.signal.trace import replay
+from tapper.signal.trace import TracedSignal
+from tapper.signal.trace import TraceWriter
+from tapper.signal.wrapper import ListenerWrapper
+from tapper.state import keeper
+from testutil_model import Dummy
+
+DOWN = KeyDirBool.DOWN
+UP = KeyDirBool.UP
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> str:
+    return str(tmp_path / "trace.bin")
+
+
+def test_round_trip(path: str) -> None:
+    with TraceWriter(path) as writer:
+        writer.record(("a", DOWN), at=1.0)
+        writer.record(("left_control", DOWN), at=1.5)
+        writer.record(("left_control", DOWN), at=1.7, repeat=True)
+        writer.record(("a", UP), at=2.0, emulated=True)
+    assert list(read_trace(path)) == [
+        TracedSignal("a", DOWN, 1.0),
+        TracedSignal("left_control", DOWN, 1.5),
+        TracedSignal("left_control", DOWN, 1.7, repeat=True),
+        TracedSignal("a", UP, 2.0, emulated=True),
+    ]
+
+
+def test_compact(path: str) -> None:
+    with TraceWriter(path) as writer:
+        for i in range(100):
+            writer.record(("a", DOWN), at=i)
+    symbol_record = trace.symbol_struct.size + 1
+    assert os.path.getsize(path) == (
+        len(trace.MAGIC) + symbol_record + 100 * trace.signal_struct.size
+    )
+
+
+def test_append(path: str) -> None:
+    with TraceWriter(path) as writer:
+        writer.record(("a", DOWN), at=1.0)
+    with TraceWriter(path) as writer:
+        writer.record(("b", DOWN), at=2.0)
+        writer.record(("a", UP), at=3.0)
+    assert [s.signal for s in read_trace(path)] == [("a", DOWN), ("b", DOWN), ("a", UP)]
+
+
+def test_truncated_last_record(path: str) -> None:
+    with TraceWriter(path) as writer:
+        writer.record(("a", DOWN), at=1.0)
+        writer.record(("a", UP), at=2.0)
+    with open(path, "r+b") as file:
+        file.truncate(os.path.getsize(path) - 3)
+    assert [s.signal for s in read_trace(path)] == [("a", DOWN)]
+
+
+def test_not_a_trace(path: str) -> None:
+    with open(path, "wb") as file:
+        file.write(b"{}")
+    with pytest.raises(ValueError):
+        list(read_trace(path))
+
+
+def test_wrapper_records(path: str) -> None:
+    emul = keeper.Emul()
+    wrapper = ListenerWrapper(
+        lambda s: ListenerResult.PROPAGATE, emul, initializer.default_keeper_pressed()
+    )
+    wrapper.trace = TraceWriter(path)
+    emul.will_emulate(("b", DOWN))
+    wrapper._on_signal_wrap(("a", DOWN), "dummy")
+    wrapper._on_signal_wrap(("b", DOWN), "dummy")
+    wrapper.trace.close()
+    assert [(s.signal, s.emulated) for s in read_trace(path)] == [
+        (("a", DOWN), False),
+        (("b", DOWN), True),
+    ]
+
+
+def test_wrapper_records_repeats(path: str) -> None:
+    repeated: list[str] = []
+    wrapper = ListenerWrapper(
+        lambda s: ListenerResult.PROPAGATE,
+        None,
+        initializer.default_keeper_pressed(),
+        lambda symbol: repeated.append(symbol),  # type: ignore
+    )
+    listener = wrapper.wrap(Dummy.Listener.get_for_os(""))
+    wrapper.trace = TraceWriter(path)
+    listener.on_signal(("a", DOWN))
+    listener.on_repeat("a")
+    wrapper.trace.close()
+    assert repeated == ["a"]
+    assert [(s.signal, s.repeat) for s in read_trace(path)] == [
+        (("a", DOWN), False),
+        (("a", DOWN), True),
+    ]
+
+
+class TestReplay:
+    signals = [
+        TracedSignal("a", DOWN, 10.0),
+        TracedSignal("q", DOWN, 10.0, emulated=True),
+        TracedSignal("a", UP, 10.5),
+        TracedSignal("b", DOWN, 12.0),
+    ]
+
+    def test_fast(self) -> None:
+        received: list[Signal] = []
+        state_keeper = initializer.default_keeper_pressed()
+        slept: list[float] = []
+
+        report = replay(
+            self.signals, received.append, state_keeper, sleep=slept.append  # type: ignore
+        )
+        assert received == [("a", DOWN), ("a", UP), ("b", DOWN)]
+        assert state_keeper.is_pressed("b")
+        assert not state_keeper.is_pressed("a")
+        assert (report.signals, report.emulated) == (3, 1)
+        assert report.latency.count == 3
+        assert report.throughput > 0
+        assert not slept
+
+    def test_repeats(self) -> None:
+        signals = [
+            TracedSignal("a", DOWN, 10.0),
+            TracedSignal("a", DOWN, 10.5, repeat=True),
+            TracedSignal("a", UP, 11.0),
+        ]
+        received: list[Signal] = []
+        repeated: list[str] = []
+        state_keeper = initializer.default_keeper_pressed()
+
+        report = replay(
+            signals,
+            received.append,  # type: ignore
+            state_keeper,
+            on_repeat=repeated.append,  # type: ignore
+        )
+        assert received == [("a", DOWN), ("a", UP)]
+        assert repeated == ["a"]
+        assert (report.signals, report.repeats) == (2, 1)
+        assert report.latency.count == 3
+        assert not state_keeper.is_pressed("a")
+
+    @pytest.mark.parametrize("speed", [1, 100])
+    def test_paced(self, speed: float) -> None:
+        slept: list[float] = []
+        report = replay(
+            self.signals,
+            lambda s: None,  # type: ignore
+            initializer.default_keeper_pressed(),
+            speed=speed,
+            sleep=slept.append,
+        )
+        assert report.signals == 3
+        assert len(slept) == 2
+        assert slept[0] == pytest.approx(0.5 / speed, abs=0.01)
+        assert slept[1] == pytest.approx(2 / speed, abs=0.01)
@@ -104,3 +104,23 @@ def test_suppress(wrap_fixture: WrapFixture) -> None:
     expected[8] = constants.ListenerResult.SUPPRESS
 
     assert signals_propagated == expected
+
+
+def test_repeat(wrap_fixture: WrapFixture, dummy) -> None:
+    _, listener, _, pressed = wrap_fixture
+    published: list[Signal] = []
+    publish = published.append
+    event.subscribe(listener.name, publish)
+
+    listener.on_repeat("a")  # without on_repeat in wrapper, same as key press
+    assert published == [down("a")]
+    assert pressed.is_pressed("a")
+
+    repeats: list[str] = []
+    fast = dummy.Listener()
+    ListenerWrapper(noop, None, pressed, repeats.append).wrap(fast)  # type: ignore
+    fast.on_repeat("b")
+    assert repeats == ["b"]
+    assert published == [down("a")]
+    assert not pressed.is_pressed("b")
+    event.unsubscribe(listener.name, publish)
@@ -3,6 +3,7 @@ import time
 import pytest
 from tapper.boot import initializer
 from tapper.model import constants
+from tapper.model.trigger import AuxiliaryKey
 from tapper.state.keeper import Emul
 from tapper.state.keeper import Pressed
 
@@ -79,3 +80,53 @@ class TestPressed:
         state = pressed_keeper.get_state(time.perf_counter())
         assert state["left_alt"]
         assert state["left_shift"]
+
+    def test_is_pressed(self, pressed_keeper: Pressed) -> None:
+        pressed_keeper.key_pressed("a")
+        assert pressed_keeper.is_pressed("a")
+        assert not pressed_keeper.is_pressed("b")
+        assert not pressed_keeper.is_pressed("no_such_symbol")
+        pressed_keeper.key_released("a")
+        assert not pressed_keeper.is_pressed("a")
+
+    def test_held_for(self, pressed_keeper: Pressed) -> None:
+        pressed_keeper.key_pressed("a", at=10)
+        assert pressed_keeper.held_for("a", 12.5) == 2.5
+        assert pressed_keeper.held_for("b", 12.5) is None
+
+
+class TestAuxMasks:
+    @pytest.fixture
+    def pressed_keeper(self) -> Pressed:
+        return initializer.default_keeper_pressed()
+
+    def test_single_symbols(self, pressed_keeper: Pressed) -> None:
+        aux = pressed_keeper.compile_aux(
+            [AuxiliaryKey(["left_alt"]), AuxiliaryKey(["q"])]
+        )
+        assert not aux.any_of and not aux.timed
+        assert not pressed_keeper.aux_pressed(aux, 0)
+        pressed_keeper.key_pressed("left_alt")
+        assert not pressed_keeper.aux_pressed(aux, 0)
+        pressed_keeper.key_pressed("q")
+        assert pressed_keeper.aux_pressed(aux, 0)
+
+    def test_any_of_symbols(self, pressed_keeper: Pressed) -> None:
+        aux = pressed_keeper.compile_aux(
+            [AuxiliaryKey(["left_control", "right_control"])]
+        )
+        assert not pressed_keeper.aux_pressed(aux, 0)
+        pressed_keeper.key_pressed("right_control")
+        assert pressed_keeper.aux_pressed(aux, 0)
+
+    def test_timed(self, pressed_keeper: Pressed) -> None:
+        aux = pressed_keeper.compile_aux([AuxiliaryKey(["left_alt", "right_alt"], 1)])
+        pressed_keeper.key_pressed("left_alt", at=10)
+        pressed_keeper.key_pressed("right_alt", at=10.5)
+        assert not pressed_keeper.aux_pressed(aux, 10.9)
+        assert pressed_keeper.aux_pressed(aux, 11)
+
+    def test_unregistered_never_pressed(self, pressed_keeper: Pressed) -> None:
+        aux = pressed_keeper.compile_aux([AuxiliaryKey(["scroll_wheel_up"])])
+        pressed_keeper.key_pressed("scroll_wheel_up")
+        assert not pressed_keeper.aux_pressed(aux, 0)
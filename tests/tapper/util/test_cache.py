@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+from tapper.util.cache import LruCache
+
+
+def test_hit_miss() -> None:
+    cache: LruCache[str, int] = LruCache()
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("a", lambda: 2) == 1
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: LruCache[str, int] = LruCache(max_entries=2)
+    cache.get("a", lambda: 1)
+    cache.get("b", lambda: 2)
+    cache.get("a", lambda: 0)
+    cache.get("c", lambda: 3)
+
+    assert cache.get("a", lambda: 0) == 1
+    assert cache.get("b", lambda: 0) == 0
+    assert len(cache) == 2
+    assert cache.stats.evictions == 2
+
+
+def test_weight() -> None:
+    cache: LruCache[str, str] = LruCache(max_weight=10, weight_fn=len)
+    cache.get("a", lambda: "a" * 6)
+    cache.get("b", lambda: "b" * 4)
+    assert cache.weight == 10
+    cache.get("c", lambda: "c")
+    assert cache.weight == 5
+    assert cache.get("a", lambda: "") == ""
+
+    assert cache.get("big", lambda: "x" * 11) == "x" * 11
+    assert cache.get("big", lambda: "") == ""
+    assert cache.weight <= 10
+
+
+def test_clear() -> None:
+    cache: LruCache[str, str] = LruCache(weight_fn=len)
+    cache.get("a", lambda: "aaa")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.weight == 0
+
+
+def test_threads() -> None:
+    cache: LruCache[int, int] = LruCache(max_entries=50)
+
+    def use() -> None:
+        for i in range(2000):
+            assert cache.get(i % 100, lambda: i % 100) == i % 100
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    assert len(cache) == 50
+    assert cache.stats.hits + cache.stats.misses == 8000
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError):
+        LruCache(max_entries=0)
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+from functools import partial
+
+from tapper.controller import flow_control
+from tapper.controller.sleep_processor import SleepCommandProcessor
+from tapper.util.clock import SimulatedClock
+
+
+class TestSimulatedClock:
+    def test_sleep_moves_time(self) -> None:
+        clock = SimulatedClock(start=10)
+        time_start = time.perf_counter()
+        for _ in range(1000):
+            clock.sleep(3600)
+        assert time.perf_counter() - time_start < 0.5
+        assert clock.now() == 10 + 3600 * 1000
+
+    def test_zero_sleep_ends_spin(self) -> None:
+        clock = SimulatedClock(resolution=0.001)
+        while clock.now() < 0.01:
+            clock.sleep(0)
+        assert clock.now() < 0.0111
+
+    def test_wait_for(self) -> None:
+        clock = SimulatedClock()
+        condition = threading.Condition()
+        with condition:
+            assert not clock.wait_for(condition, lambda: False, 5)
+            assert clock.wait_for(condition, lambda: True, 5)
+        assert clock.now() == 5
+
+    def test_wait_change(self) -> None:
+        clock = SimulatedClock()
+        flow_control.wait_change_blocking(flow_control.changes, 60, clock)
+        assert clock.now() == 60
+        flow_control.wait_change_blocking(flow_control.changes - 1, 60, clock)
+        assert clock.now() == 60
+
+    def test_sleep_async(self) -> None:
+        clock = SimulatedClock()
+        processor = SleepCommandProcessor(
+            check_interval=10,
+            kill_check_fn=lambda: False,
+            pause_check_fn=lambda: False,
+            get_time_fn=clock.now,
+            wait_change_async_fn=partial(flow_control.wait_change, clock=clock),
+        )
+        time_start = time.perf_counter()
+        asyncio.run(processor.sleep_async(3600))
+        assert time.perf_counter() - time_start < 0.5
+        assert clock.now() == 3600
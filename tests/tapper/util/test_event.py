@@ -1,3 +1,5 @@
+import threading
+import time
 from typing import Any
 
 import pytest
@@ -47,3 +49,110 @@ def test_auto_unsub() -> None:
     ]
 
     assert subscriber.received_messages == [("a", True), ("a", False), ("b", True)]
+
+
+def test_unsub_while_publishing() -> None:
+    received: list[Any] = []
+
+    def first(message: Any) -> None:
+        received.append(("first", message))
+        event.unsubscribe(topic_name, second)
+
+    def second(message: Any) -> None:
+        received.append(("second", message))
+
+    event.subscribe(topic_name, first)
+    event.subscribe(topic_name, second)
+    event.publish(topic_name, 1)
+    event.publish(topic_name, 2)
+    event.unsubscribe(topic_name, first)
+
+    assert received == [("first", 1), ("second", 1), ("first", 2)]
+
+
+def test_subscribe_while_publishing_in_threads() -> None:
+    received: list[Any] = []
+    stop = threading.Event()
+
+    def publish() -> None:
+        while not stop.is_set():
+            event.publish(topic_name, 1)
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    subscribers = [lambda m, i=i: received.append(i) for i in range(200)]
+    for subscriber in subscribers:
+        event.subscribe(topic_name, subscriber)
+    for subscriber in subscribers:
+        event.unsubscribe(topic_name, subscriber)
+    stop.set()
+    publisher.join()
+    received.clear()
+    event.publish(topic_name, 1)
+
+    assert received == []
+
+
+class TestQueued:
+    def test_delivered_in_other_thread(self) -> None:
+        threads: list[threading.Thread] = []
+        sub_fn = lambda message: threads.append(threading.current_thread())
+        subscribed = event.subscribe(topic_name, sub_fn, queue_size=10)
+        assert isinstance(subscribed, event.QueuedSubscriber)
+        [event.publish(topic_name, m) for m in range(5)]
+        event.unsubscribe(topic_name, sub_fn)  # waits for queued messages
+
+        assert len(threads) == 5
+        assert threading.current_thread() not in threads
+        assert subscribed.dropped == 0
+
+    def test_dropped(self) -> None:
+        gate = threading.Event()
+        received: list[Any] = []
+
+        def slow(message: Any) -> None:
+            gate.wait()
+            received.append(message)
+
+        subscribed = event.subscribe(topic_name, slow, queue_size=2)
+        assert isinstance(subscribed, event.QueuedSubscriber)
+        event.publish(topic_name, 0)
+        while not subscribed._queue.empty():  # first message taken, and waits
+            time.sleep(0.001)
+        [event.publish(topic_name, m) for m in range(1, 6)]
+        gate.set()
+        event.unsubscribe(topic_name, slow)
+
+        assert received == [0, 1, 2]
+        assert subscribed.dropped == 3
+
+    def test_auto_unsub(self) -> None:
+        subscriber = Subscriber()
+        subscriber.is_unsub = lambda message: message != "b"
+        subscribed = event.subscribe(
+            topic_name, subscriber.receive_message, queue_size=10
+        )
+        assert isinstance(subscribed, event.QueuedSubscriber)
+        [event.publish(topic_name, m) for m in ["a", "b", "c"]]
+        subscribed._thread.join(timeout=2)
+
+        assert subscriber.received_messages == ["a", "b"]
+        assert event._subscribers[topic_name] == ()
+
+    def test_exception_does_not_stop_delivery(self) -> None:
+        received: list[Any] = []
+
+        def fail_on_1(message: Any) -> None:
+            if message == 1:
+                raise ValueError(message)
+            received.append(message)
+
+        event.subscribe(topic_name, fail_on_1, queue_size=10)
+        [event.publish(topic_name, m) for m in range(3)]
+        event.unsubscribe(topic_name, fail_on_1)
+
+        assert received == [0, 2]
+
+    def test_invalid_size(self) -> None:
+        with pytest.raises(ValueError):
+            event.subscribe(topic_name, lambda message: None, queue_size=0)
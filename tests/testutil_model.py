@@ -297,7 +297,9 @@ class DummyActionRunner(ActionRunner):
         self.actions_ran = defaultdict(list)
         self.control_actions_ran = []
 
-    def run(self, fn: types_.Action, executor_ordinal: int = 0) -> None:
+    def run(
+        self, fn: types_.Action, executor_ordinal: int = 0, source: Any = None
+    ) -> None:
         self.actions_ran[executor_ordinal].append(fn)
 
     def run_control(self, fn: types_.Action) -> None: